@@ -0,0 +1,304 @@
+"""
+PageVision OCR - Tesseract configuration autotuner
+Sweeps recognition and preprocessing settings over a labelled sample corpus
+
+Every page image needs its ground truth next to it with the same stem
+(page01.png + page01.gt.txt, or page01.txt). For every combination of
+binarization, input scale, OEM, PSM, dictionary use and character whitelist
+the corpus is recognized exactly as in the live pipeline, and the mean latency
+per page and the character error rate (CER) are measured. The Pareto front of
+latency vs. CER is printed and the chosen configuration is saved as a tuning
+file that OCREngine.load_tuning() / PAGEVISION_TUNING / batch_ocr.py --tuning load.
+
+Examples:
+    python autotune.py samples/invoices --name invoices
+    python autotune.py samples/labels --name labels --psm 6 7 11 --whitelist 0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ-
+    python autotune.py samples/books --name books --max-cer 0.02   # fastest config within 2% CER
+"""
+
+import argparse
+import glob
+import itertools
+import json
+import os
+import time
+from datetime import datetime
+
+import cv2
+import numpy as np
+
+from preprocess.preprocess import ImagePreprocessor
+from ocr.ocr_engine import OCREngine
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.tif', '.tiff', '.bmp')
+
+# Binarization variants swept by default (block_size/c_value are the 'gaussian' window/c)
+DEFAULT_BINARIZATIONS = [
+    'gaussian:window=11,c=2',
+    'gaussian:window=21,c=5',
+    'sauvola:window=31,k=0.2',
+    'sauvola:window=51,k=0.34',
+    'wolf:window=31,k=0.5',
+    'otsu_tiles:tile=64',
+]
+
+
+def character_error_rate(hypothesis, reference):
+    """
+    Levenshtein distance between the texts divided by the reference length
+    
+    Whitespace runs are collapsed first. Rows of the dynamic program are
+    computed with NumPy; insertions within a row are resolved with a running
+    minimum, so a page takes milliseconds instead of seconds.
+    
+    Args:
+        hypothesis (str): Recognized text
+        reference (str): Ground truth
+    
+    Returns:
+        float: CER (0.0 is perfect; can exceed 1.0 for very noisy output)
+    """
+    hyp = np.frombuffer(' '.join(hypothesis.split()).encode('utf-32-le'), dtype=np.uint32)
+    ref = np.frombuffer(' '.join(reference.split()).encode('utf-32-le'), dtype=np.uint32)
+    if len(ref) == 0:
+        return float(len(hyp) > 0)
+    if len(hyp) == 0:
+        return 1.0
+    
+    offsets = np.arange(len(hyp) + 1)
+    previous = offsets.copy()
+    for i, char in enumerate(ref, start=1):
+        current = np.empty_like(previous)
+        current[0] = i
+        # Substitution/match and deletion
+        current[1:] = np.minimum(previous[:-1] + (hyp != char), previous[1:] + 1)
+        # Insertion: current[j] = min(current[j], current[j - 1] + 1)
+        current = np.minimum.accumulate(current - offsets) + offsets
+        previous = current
+    return float(previous[-1]) / len(ref)
+
+
+def load_corpus(directory, limit=None):
+    """
+    Find page images with ground truth
+    
+    Args:
+        directory (str): Corpus directory
+        limit (int): Use at most this many pages
+    
+    Returns:
+        list: (image path, ground truth text) pairs
+    """
+    pages = []
+    for path in sorted(glob.glob(os.path.join(directory, '**', '*'), recursive=True)):
+        if not path.lower().endswith(IMAGE_EXTENSIONS):
+            continue
+        stem = os.path.splitext(path)[0]
+        for truth_path in (stem + '.gt.txt', stem + '.txt'):
+            if os.path.exists(truth_path):
+                with open(truth_path, 'r', encoding='utf-8') as f:
+                    pages.append((path, f.read()))
+                break
+    return pages[:limit] if limit else pages
+
+
+def parse_binarization(spec):
+    """
+    Parse 'method:key=value,key=value' into (method, params)
+    
+    Args:
+        spec (str): Binarization spec, e.g. 'sauvola:window=31,k=0.2'
+    
+    Returns:
+        tuple: (method, params dict)
+    """
+    method, _, arguments = spec.partition(':')
+    params = {}
+    for argument in filter(None, arguments.split(',')):
+        key, _, value = argument.partition('=')
+        params[key] = float(value) if '.' in value else int(value)
+    return method, params
+
+
+def pareto_front(results):
+    """
+    Configurations that no other configuration beats on both latency and CER
+    
+    Args:
+        results (list): Result dicts with 'latency_ms' and 'cer'
+    
+    Returns:
+        list: Non-dominated results, fastest first
+    """
+    front = []
+    for result in sorted(results, key=lambda r: (r['latency_ms'], r['cer'])):
+        if not front or result['cer'] < front[-1]['cer']:
+            front.append(result)
+    return front
+
+
+def choose(front, max_cer=None, cer_tolerance=0.005):
+    """
+    Pick a configuration from the Pareto front
+    
+    Args:
+        front (list): Pareto front, fastest first
+        max_cer (float): Choose the fastest configuration within this CER
+        cer_tolerance (float): Without max_cer, choose the fastest configuration
+                               within this margin of the best CER
+    
+    Returns:
+        dict: Chosen result
+    """
+    best_cer = min(result['cer'] for result in front)
+    limit = max_cer if max_cer is not None else best_cer + cer_tolerance
+    within = [result for result in front if result['cer'] <= limit]
+    if not within:
+        print(f"⚠ No configuration reaches CER {limit:.3f}, using the most accurate one")
+        return min(front, key=lambda r: r['cer'])
+    return within[0]
+
+
+def describe(result):
+    """One-line summary of a configuration"""
+    ocr = result['ocr']
+    preprocess = result['preprocess']
+    params = ','.join(f"{k}={v}" for k, v in preprocess['binarization_params'].items())
+    variables = ' '.join(f"{k}={v}" for k, v in ocr['variables'].items() if k != 'tessedit_char_whitelist')
+    whitelist = ' whitelist' if 'tessedit_char_whitelist' in ocr['variables'] else ''
+    return (f"{preprocess['binarization']}:{params} scale={ocr['input_scale']} oem={ocr['oem']} "
+            f"psm={ocr['psm']} {variables or 'dict=on'}{whitelist}")
+
+
+def sweep(pages, args):
+    """
+    Recognize the corpus with every configuration
+    
+    Args:
+        pages (list): (image path, ground truth) pairs
+        args (argparse.Namespace): Sweep grid and engine options
+    
+    Returns:
+        list: Result dicts with ocr/preprocess settings, cer and latency_ms
+    """
+    images = []
+    for path, truth in pages:
+        image = cv2.imread(path)
+        if image is None:
+            print(f"⚠ Skipping unreadable image: {path}")
+            continue
+        images.append((image, truth))
+    
+    preprocessor = ImagePreprocessor()
+    ocr_engine = OCREngine(language=args.language, lazy=True)
+    ocr_engine.ocr_timeout = args.timeout
+    ocr_engine.warm_up()
+    
+    variable_options = [{}]
+    if 'off' in args.dictionary:
+        variable_options = [{}, {'load_system_dawg': '0', 'load_freq_dawg': '0'}]
+        if 'on' not in args.dictionary:
+            variable_options = variable_options[1:]
+    if args.whitelist:
+        variable_options += [dict(v, tessedit_char_whitelist=args.whitelist) for v in variable_options]
+    
+    grid = list(itertools.product(args.scale, args.oem, args.psm, variable_options))
+    total = len(args.binarization) * len(grid)
+    print(f"🔧 Sweeping {total} configurations over {len(images)} pages\n")
+    
+    results = []
+    for spec in args.binarization:
+        method, params = parse_binarization(spec)
+        preprocessor.set_binarization(method, **params)
+        
+        # Preprocess once per binarization variant; its cost is part of every config's latency
+        started = time.perf_counter()
+        processed = []
+        for image, truth in images:
+            binary = preprocessor.preprocess(image)
+            binary, _ = preprocessor.auto_deskew(binary)
+            processed.append((binary, truth))
+        preprocess_ms = (time.perf_counter() - started) / len(images) * 1000
+        
+        for scale, oem, psm, variables in grid:
+            ocr_settings = {'oem': oem, 'psm': psm, 'input_scale': scale, 'variables': variables}
+            ocr_engine.apply_tuning(ocr_settings)
+            
+            errors = []
+            started = time.perf_counter()
+            for binary, truth in processed:
+                errors.append(character_error_rate(ocr_engine.extract_text(binary), truth))
+            ocr_ms = (time.perf_counter() - started) / len(processed) * 1000
+            
+            result = {
+                'ocr': ocr_settings,
+                'preprocess': {'binarization': method, 'binarization_params': params},
+                'cer': round(float(np.mean(errors)), 4),
+                'latency_ms': round(preprocess_ms + ocr_ms, 1),
+            }
+            results.append(result)
+            print(f"  [{len(results):3d}/{total}] CER {result['cer']:.3f} | {result['latency_ms']:7.1f} ms | "
+                  f"{describe(result)}")
+    return results
+
+
+def main():
+    """Entry point for the autotuner"""
+    parser = argparse.ArgumentParser(description="Tune Tesseract and preprocessing settings on a labelled corpus")
+    parser.add_argument('corpus', help="Directory of page images with .gt.txt/.txt ground truth")
+    parser.add_argument('--name', default='default', help="Document type the settings are tuned for")
+    parser.add_argument('--output', help="Tuning file to write (default: tuning/<name>.json)")
+    parser.add_argument('--language', default='eng')
+    parser.add_argument('--limit', type=int, help="Use at most this many pages")
+    parser.add_argument('--oem', type=int, nargs='+', default=[1, 3])
+    parser.add_argument('--psm', type=int, nargs='+', default=[3, 4, 6, 11])
+    parser.add_argument('--scale', type=float, nargs='+', default=[1.0, 1.5])
+    parser.add_argument('--dictionary', nargs='+', choices=['on', 'off'], default=['on', 'off'],
+                        help="Sweep with and/or without Tesseract's word lists")
+    parser.add_argument('--whitelist', help="Also sweep with this character whitelist")
+    parser.add_argument('--binarization', nargs='+', default=DEFAULT_BINARIZATIONS,
+                        help="Variants as method:key=value,... (default: %(default)s)")
+    parser.add_argument('--max-cer', type=float, help="Choose the fastest configuration within this CER")
+    parser.add_argument('--cer-tolerance', type=float, default=0.005,
+                        help="Without --max-cer: fastest configuration within this margin of the best CER")
+    parser.add_argument('--timeout', type=float, default=30.0, help="Deadline per page in seconds")
+    args = parser.parse_args()
+    
+    pages = load_corpus(args.corpus, args.limit)
+    if not pages:
+        print(f"✗ No images with ground truth found in {args.corpus}")
+        return
+    
+    results = sweep(pages, args)
+    front = pareto_front(results)
+    chosen = choose(front, args.max_cer, args.cer_tolerance)
+    
+    print("\n" + "=" * 60)
+    print("📈 Pareto front (latency vs. CER)")
+    print("=" * 60)
+    for result in front:
+        marker = '→' if result is chosen else ' '
+        print(f"{marker} CER {result['cer']:.3f} | {result['latency_ms']:7.1f} ms | {describe(result)}")
+    
+    output = args.output or os.path.join('tuning', f'{args.name}.json')
+    if os.path.dirname(output) and not os.path.exists(os.path.dirname(output)):
+        os.makedirs(os.path.dirname(output))
+    profile = {
+        'name': args.name,
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'corpus': os.path.abspath(args.corpus),
+        'pages': len(pages),
+        'language': args.language,
+        'ocr': chosen['ocr'],
+        'preprocess': chosen['preprocess'],
+        'cer': chosen['cer'],
+        'latency_ms': chosen['latency_ms'],
+        'pareto_front': front,
+    }
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(profile, f, indent=2)
+    print(f"\n✓ Tuning saved to {output} (CER {chosen['cer']:.3f}, {chosen['latency_ms']:.1f} ms/page)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,296 @@
+"""
+PageVision OCR - Batch OCR for archive backfills
+Coordinator / Worker Entry Point
+
+A coordinator shards page images into a durable job queue; workers on any
+number of machines lease pages, run preprocessing + OCR and post the results.
+Jobs are delivered at least once (expired leases are handed out again, failed
+pages are retried) and result writes are idempotent.
+
+Examples:
+    python batch_ocr.py submit scans/ --queue jobs.db --batch archive-2024
+    python batch_ocr.py worker --queue jobs.db --processes 4          # same machine
+    python batch_ocr.py serve --queue jobs.db --host 0.0.0.0 --port 8765  # coordinator
+    python batch_ocr.py worker --broker coordinator:8765 --processes 8  # other machines
+    python batch_ocr.py status --queue jobs.db
+    python batch_ocr.py export --queue jobs.db --batch archive-2024 --output ocr_output/archive-2024
+"""
+
+import argparse
+import glob
+import multiprocessing
+import os
+import socket
+import time
+
+import cv2
+
+from preprocess.preprocess import ImagePreprocessor
+from ocr.ocr_engine import OCREngine
+from ocr.recognizer import DEFAULT_TESSERACT_CMD
+from utils.job_queue import JobQueue, JobBroker, RemoteJobQueue
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.tif', '.tiff', '.bmp')
+
+
+class PageProcessor:
+    """Preprocessing + OCR of one page image, one instance per worker process"""
+    
+    def __init__(self, language='eng', tesseract_cmd=None, tuning=None):
+        """
+        Args:
+            language (str): Tesseract language code
+            tesseract_cmd (str): Path of the tesseract binary (default: OCREngine's setting)
+            tuning (str): Tuning file written by autotune.py
+        """
+        self.preprocessor = ImagePreprocessor()
+        self.ocr_engine = OCREngine(language=language, lazy=True,
+                                    tesseract_cmd=tesseract_cmd or DEFAULT_TESSERACT_CMD)
+        if tuning:
+            preprocess = self.ocr_engine.load_tuning(tuning).get('preprocess')
+            if preprocess:
+                self.preprocessor.set_binarization(preprocess['binarization'], **preprocess['binarization_params'])
+        # Fails fast (and visibly) when Tesseract is missing on this node
+        self.ocr_engine.warm_up()
+    
+    def __call__(self, source):
+        """
+        Recognize one page
+        
+        Args:
+            source (str): Image path as seen by this worker
+        
+        Returns:
+            dict: text, word boxes, page size and timing
+        """
+        start = time.perf_counter()
+        image = cv2.imread(source)
+        if image is None:
+            raise FileNotFoundError(f"Cannot read image: {source}")
+        
+        processed = self.preprocessor.preprocess(image)
+        processed, skew_angle = self.preprocessor.auto_deskew(processed)
+        boxes = self.ocr_engine.extract_text_with_boxes(processed)
+        text = self.ocr_engine.extract_text(processed)
+        
+        return {
+            'text': text,
+            'boxes': [list(box) for box in boxes],
+            'width': int(processed.shape[1]),
+            'height': int(processed.shape[0]),
+            'skew_angle': float(skew_angle),
+            'seconds': round(time.perf_counter() - start, 3),
+        }
+
+
+def open_queue(args):
+    """Local SQLite queue or a broker connection, depending on the arguments"""
+    if args.broker:
+        host, _, port = args.broker.partition(':')
+        return RemoteJobQueue(host, int(port or 8765))
+    return JobQueue(args.queue)
+
+
+def run_worker(queue, worker_name, process_page, exit_when_idle=True, poll_interval=1.0):
+    """
+    Lease, process and report jobs until the queue is drained
+    
+    Args:
+        queue (JobQueue or RemoteJobQueue): Job source
+        worker_name (str): Name recorded with leases and results
+        process_page (callable): source -> JSON-serializable result
+        exit_when_idle (bool): Stop when no job is pending or leased; otherwise keep polling
+        poll_interval (float): Seconds to wait when no job is available
+    
+    Returns:
+        int: Number of pages completed by this worker
+    """
+    completed = 0
+    while True:
+        job = queue.lease(worker_name)
+        if job is None:
+            if exit_when_idle:
+                counts = queue.stats()
+                if counts['pending'] == 0 and counts['leased'] == 0:
+                    return completed
+            time.sleep(poll_interval)
+            continue
+        
+        try:
+            result = process_page(job['source'])
+        except Exception as e:
+            print(f"✗ [{worker_name}] {job['source']} failed (attempt {job['attempts']}): {e}")
+            queue.fail(job['id'], worker_name, str(e))
+            continue
+        
+        queue.complete(job['id'], worker_name, result)
+        completed += 1
+
+
+def _worker_process(args):
+    """Entry point of one worker process"""
+    worker_name = f"{socket.gethostname()}-{os.getpid()}"
+    try:
+        process_page = PageProcessor(language=args.language, tesseract_cmd=args.tesseract_cmd, tuning=args.tuning)
+    except Exception as e:
+        print(f"✗ [{worker_name}] OCR engine unavailable: {e}")
+        return
+    queue = open_queue(args)
+    start = time.time()
+    completed = run_worker(queue, worker_name, process_page, exit_when_idle=not args.follow)
+    elapsed = time.time() - start
+    print(f"✓ [{worker_name}] {completed} pages in {elapsed:.1f}s ({completed / max(elapsed, 1e-6):.2f} pages/s)")
+
+
+def collect_sources(paths):
+    """Expand files, directories and glob patterns into image paths"""
+    sources = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, files in os.walk(path):
+                sources.extend(os.path.join(root, name) for name in files
+                               if name.lower().endswith(IMAGE_EXTENSIONS))
+        else:
+            sources.extend(glob.glob(path) or [path])
+    return sorted(os.path.abspath(source) for source in sources)
+
+
+def cmd_submit(args):
+    queue = open_queue(args)
+    sources = collect_sources(args.paths)
+    added = queue.submit(args.batch, sources)
+    print(f"✓ Batch '{args.batch}': {added} new jobs ({len(sources) - added} already queued)")
+
+
+def cmd_worker(args):
+    processes = args.processes or multiprocessing.cpu_count()
+    print(f"🚀 Starting {processes} worker process(es) on {socket.gethostname()}")
+    if processes == 1:
+        _worker_process(args)
+        return
+    workers = [multiprocessing.Process(target=_worker_process, args=(args,)) for _ in range(processes)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+
+def cmd_serve(args):
+    broker = JobBroker(JobQueue(args.queue), host=args.host, port=args.port)
+    print(f"✓ Job broker for {args.queue} listening on {args.host}:{broker.port}")
+    try:
+        broker.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 Broker stopped")
+    finally:
+        broker.server_close()
+
+
+def cmd_status(args):
+    counts = open_queue(args).stats(args.batch)
+    total = sum(counts.values())
+    print(f"Jobs: {total} | " + " | ".join(f"{status}: {count}" for status, count in counts.items()))
+
+
+def export_names(sources):
+    """
+    Text file names for exported pages, mirroring the source directory tree
+    
+    Pages in different directories never collide; images that only differ in
+    their extension (scan.png, scan.jpg) keep it in the name (scan.jpg.txt).
+    
+    Args:
+        sources (list): Page image paths, sorted
+    
+    Returns:
+        dict: Source path -> relative .txt path
+    """
+    sources = [os.path.abspath(source) for source in sources]
+    try:
+        root = os.path.commonpath([os.path.dirname(source) for source in sources]) if sources else ''
+    except ValueError:
+        root = ''  # Different drives
+    names, used = {}, set()
+    for source in sources:
+        relative = os.path.relpath(source, root) if root else os.path.splitdrive(source)[1].lstrip('\\/')
+        name = os.path.splitext(relative)[0] + '.txt'
+        if name in used:
+            name = relative + '.txt'
+        used.add(name)
+        names[source] = name
+    return names
+
+
+def cmd_export(args):
+    from utils.exporters import HOCRExporter
+    
+    if not os.path.exists(args.output):
+        os.makedirs(args.output)
+    results = open_queue(args).results(args.batch)
+    names = export_names([source for source, _ in results])
+    hocr = HOCRExporter(os.path.join(args.output, f"{args.batch or 'results'}.hocr"))
+    try:
+        for source, result in results:
+            path = os.path.join(args.output, names[os.path.abspath(source)])
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(result['text'])
+            hocr.add_page((result['width'], result['height']), [tuple(box) for box in result['boxes']])
+    finally:
+        hocr.close()
+    print(f"✓ Exported {len(results)} pages to {args.output}")
+
+
+def main():
+    """Entry point for batch mode"""
+    # --queue/--broker are accepted before or after the subcommand; SUPPRESS keeps a
+    # subcommand from overwriting a value given before it with the default
+    connection = argparse.ArgumentParser(add_help=False)
+    connection.add_argument('--queue', default=argparse.SUPPRESS,
+                            help="SQLite job database (coordinator side, default: ocr_jobs.db)")
+    connection.add_argument('--broker', default=argparse.SUPPRESS,
+                            help="host:port of a job broker (workers on other machines)")
+    
+    parser = argparse.ArgumentParser(description="PageVision OCR batch coordinator / worker", parents=[connection])
+    commands = parser.add_subparsers(dest='command', required=True)
+    
+    submit = commands.add_parser('submit', parents=[connection], help="Shard page images into jobs")
+    submit.add_argument('paths', nargs='+', help="Image files, directories or glob patterns")
+    submit.add_argument('--batch', default='default')
+    submit.set_defaults(func=cmd_submit)
+    
+    worker = commands.add_parser('worker', parents=[connection], help="Process jobs")
+    worker.add_argument('--processes', type=int, default=0, help="Worker processes (default: CPU count)")
+    worker.add_argument('--language', default='eng')
+    worker.add_argument('--tesseract-cmd', help="Path of the tesseract binary on this node")
+    worker.add_argument('--tuning', help="Tuning file written by autotune.py")
+    worker.add_argument('--follow', action='store_true', help="Keep polling for new jobs instead of exiting")
+    worker.set_defaults(func=cmd_worker)
+    
+    serve = commands.add_parser('serve', parents=[connection], help="Serve the queue to workers on other machines")
+    serve.add_argument('--host', default='127.0.0.1',
+                       help="Interface to listen on; the broker has no authentication, so pass "
+                            "e.g. 0.0.0.0 only on a trusted network")
+    serve.add_argument('--port', type=int, default=8765)
+    serve.set_defaults(func=cmd_serve)
+    
+    status = commands.add_parser('status', parents=[connection], help="Show job counts")
+    status.add_argument('--batch')
+    status.set_defaults(func=cmd_status)
+    
+    export = commands.add_parser('export', parents=[connection], help="Write results as text files and hOCR")
+    export.add_argument('--batch')
+    export.add_argument('--output', default='ocr_output')
+    export.set_defaults(func=cmd_export)
+    
+    args = parser.parse_args()
+    args.queue = getattr(args, 'queue', 'ocr_jobs.db')
+    args.broker = getattr(args, 'broker', None)
+    # Checked here so a wrong path fails once instead of in every worker process
+    if getattr(args, 'tuning', None) and not os.path.isfile(args.tuning):
+        parser.error(f"tuning file not found: {args.tuning}")
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,6 @@
 """Camera module for webcam capture"""
 from .camera import Camera
+from .synthetic import SyntheticCamera
+from .controls import CameraControls, FocusExposureLock
 
-__all__ = ['Camera']
+__all__ = ['Camera', 'SyntheticCamera', 'CameraControls', 'FocusExposureLock']
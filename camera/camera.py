@@ -1,14 +1,24 @@
 """
 Camera Module - Handles webcam capture and video streaming
+
+Frames are captured in two steps: grab() takes the next frame from the
+driver without decoding it and retrieve() decodes the grabbed frame. Frames
+that are only skipped (e.g. stale frames queued during a slow OCR tick) are
+never decoded. With gray=True the camera delivers raw YUYV/MJPEG buffers and
+the luma (Y) plane is used directly, without a BGR conversion.
 """
 import cv2
 import numpy as np
 
+# Pixel formats tried in order with fourcc='auto': MJPEG keeps full frame rates
+# at 720p over USB 2, YUYV needs no decoding at all (and its Y plane is free)
+AUTO_FOURCC = ('MJPG', 'YUYV')
+
 
 class Camera:
     """Manages webcam capture and frame processing"""
     
-    def __init__(self, camera_index=0, width=1280, height=720):
+    def __init__(self, camera_index=0, width=1280, height=720, fps=30, fourcc=None, gray=False):
         """
         Initialize camera with specified parameters
         
@@ -16,10 +26,20 @@ class Camera:
             camera_index (int): Index of the camera device (default: 0)
             width (int): Frame width in pixels
             height (int): Frame height in pixels
+            fps (int): Requested capture frame rate
+            fourcc (str or tuple): Pixel format to negotiate ('MJPG', 'YUYV', a tuple
+                in order of preference, or 'auto'); None keeps the driver default
+            gray (bool): Deliver single-channel luma frames instead of BGR
         """
         self.camera_index = camera_index
         self.width = width
         self.height = height
+        self.fps = fps
+        self.requested_fourcc = AUTO_FOURCC if fourcc == 'auto' else fourcc
+        self.fourcc = None       # Negotiated pixel format
+        self.gray = gray
+        self.raw = False         # Buffers are delivered undecoded (CONVERT_RGB off)
+        self.buffer_size = 4     # Frames the driver queues (V4L2 default)
         self.cap = None
         
     def start(self):
@@ -29,25 +49,166 @@ class Camera:
         if not self.cap.isOpened():
             raise Exception(f"Cannot open camera with index {self.camera_index}")
         
+        # The pixel format has to be chosen before the frame size
+        if self.requested_fourcc:
+            self.negotiate_fourcc(self.requested_fourcc)
+        
         # Set camera properties for better quality
         self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, self.width)
         self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, self.height)
-        self.cap.set(cv2.CAP_PROP_FPS, 30)
+        self.cap.set(cv2.CAP_PROP_FPS, self.fps)
+        self.fourcc = self._get_fourcc()
+        
+        buffer_size = int(self.cap.get(cv2.CAP_PROP_BUFFERSIZE))
+        if buffer_size > 0:
+            self.buffer_size = buffer_size
+        
+        # Luma straight from the capture buffer: ask the backend not to convert to BGR
+        if self.gray:
+            self.raw = self.cap.set(cv2.CAP_PROP_CONVERT_RGB, 0) and not self.cap.get(cv2.CAP_PROP_CONVERT_RGB)
+            if not self.raw:
+                print("⚠ Backend cannot deliver raw frames, converting BGR to grayscale instead")
+        
+        print(f"✓ Camera started successfully (Resolution: {self.width}x{self.height}, "
+              f"format: {self.fourcc or 'unknown'}{', grayscale' if self.gray else ''})")
+    
+    def _get_fourcc(self):
+        """Current pixel format as a four-character string (None if unknown)"""
+        code = int(self.cap.get(cv2.CAP_PROP_FOURCC))
+        if code <= 0:
+            return None
+        return ''.join(chr((code >> 8 * i) & 0xFF) for i in range(4))
+    
+    def negotiate_fourcc(self, preferred):
+        """
+        Select the first pixel format the camera accepts
         
-        print(f"✓ Camera started successfully (Resolution: {self.width}x{self.height})")
+        Args:
+            preferred (str or tuple): FourCC code(s) in order of preference
         
+        Returns:
+            str: Negotiated FourCC (the driver default if none was accepted)
+        """
+        if isinstance(preferred, str):
+            preferred = (preferred,)
+        for code in preferred:
+            self.cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*code))
+            if self._get_fourcc() == code:
+                self.fourcc = code
+                return code
+        self.fourcc = self._get_fourcc()
+        print(f"⚠ Camera does not support {'/'.join(preferred)}, using {self.fourcc or 'driver default'}")
+        return self.fourcc
+        
+    def configure(self, width=None, height=None, fps=None):
+        """
+        Change resolution and/or frame rate while the camera is running
+        
+        Args:
+            width (int): New frame width in pixels (unchanged if None)
+            height (int): New frame height in pixels (unchanged if None)
+            fps (int): New frame rate (unchanged if None)
+        """
+        if width is not None:
+            self.width = width
+        if height is not None:
+            self.height = height
+        if fps is not None:
+            self.fps = fps
+        
+        if self.cap is None:
+            return
+        
+        if width is not None or height is not None:
+            self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, self.width)
+            self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, self.height)
+        if fps is not None:
+            self.cap.set(cv2.CAP_PROP_FPS, self.fps)
+    
     def read_frame(self):
         """
         Capture a single frame from the camera
         
         Returns:
-            tuple: (success: bool, frame: numpy.ndarray)
+            tuple: (success: bool, frame: numpy.ndarray) - BGR, or luma with gray=True
         """
         if self.cap is None:
             raise Exception("Camera not started. Call start() first.")
         
-        ret, frame = self.cap.read()
-        return ret, frame
+        if not self.cap.grab():
+            return False, None
+        return self.retrieve()
+    
+    def grab(self):
+        """
+        Take the next frame from the driver without decoding it
+        
+        Returns:
+            bool: True if a frame was grabbed
+        """
+        if self.cap is None:
+            raise Exception("Camera not started. Call start() first.")
+        return self.cap.grab()
+    
+    def retrieve(self, gray=None):
+        """
+        Decode the most recently grabbed frame
+        
+        Args:
+            gray (bool): Return the luma plane instead of BGR (default: the camera setting)
+        
+        Returns:
+            tuple: (success: bool, frame: numpy.ndarray)
+        """
+        gray = self.gray if gray is None else gray
+        ret, frame = self.cap.retrieve()
+        if not ret or frame is None:
+            return False, None
+        
+        if not self.raw:
+            if gray:
+                frame = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+            return True, frame
+        
+        # Raw buffers: packed YUYV (H x W x 2) or a compressed MJPEG byte stream
+        if frame.ndim == 3 and frame.shape[2] == 2:
+            if gray:
+                return True, frame[:, :, 0]  # Y is every other byte: no conversion at all
+            return True, cv2.cvtColor(frame, cv2.COLOR_YUV2BGR_YUYV)
+        if frame.ndim == 3 and frame.shape[2] == 3:
+            return True, cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) if gray else frame
+        # JPEG decoding to grayscale skips the chroma upsampling and color conversion
+        decoded = cv2.imdecode(frame.reshape(-1), cv2.IMREAD_GRAYSCALE if gray else cv2.IMREAD_COLOR)
+        return decoded is not None, decoded
+    
+    def skip(self, count):
+        """
+        Discard frames without decoding them
+        
+        Args:
+            count (int): Number of frames to skip
+        
+        Returns:
+            int: Number of frames actually skipped
+        """
+        skipped = 0
+        while skipped < count and self.grab():
+            skipped += 1
+        return skipped
+    
+    def drain(self, seconds_behind):
+        """
+        Skip the stale frames that queued up while the caller was busy
+        
+        Args:
+            seconds_behind (float): Time spent beyond one frame period
+        
+        Returns:
+            int: Number of frames skipped
+        """
+        if seconds_behind <= 0:
+            return 0
+        return self.skip(min(int(seconds_behind * self.fps), self.buffer_size))
     
     def release(self):
         """Release camera resources"""
@@ -0,0 +1,217 @@
+"""
+Camera Controls Module - Focus/exposure lock driven by the OCR pipeline
+
+Continuous autofocus and auto-exposure keep hunting while a page is held
+still, which produces blurry or flickering frames. CameraControls probes
+which CAP_PROP_* controls the device supports and switches them between
+automatic and locked. FocusExposureLock locks them once the tracked page has
+been still and sharp for a while, and releases them (so the camera refocuses)
+when the page changes, disappears or the locked image gets blurry.
+"""
+import cv2
+
+# Controls probed on the device: name -> OpenCV property
+CONTROLS = {
+    'autofocus': cv2.CAP_PROP_AUTOFOCUS,
+    'focus': cv2.CAP_PROP_FOCUS,
+    'auto_exposure': cv2.CAP_PROP_AUTO_EXPOSURE,
+    'exposure': cv2.CAP_PROP_EXPOSURE,
+    'auto_white_balance': cv2.CAP_PROP_AUTO_WB,
+}
+
+# CAP_PROP_AUTO_EXPOSURE values differ by backend: automatic -> manual
+MANUAL_EXPOSURE = {
+    3.0: 1.0,    # V4L2 aperture priority -> manual
+    0.75: 0.25,  # DirectShow auto -> manual
+}
+
+
+class CameraControls:
+    """Probes and switches focus/exposure/white-balance controls of a Camera"""
+    
+    def __init__(self, camera):
+        """
+        Initialize camera controls
+        
+        Args:
+            camera (Camera): Started camera (sources without a VideoCapture support no controls)
+        """
+        self.camera = camera
+        self.supported = {}
+        self.automatic = {}  # Values of the auto controls when probed (restored on unlock)
+        self.locked = False
+    
+    def _capture(self):
+        """The camera's VideoCapture, or None"""
+        cap = getattr(self.camera, 'cap', None)
+        return cap if isinstance(cap, cv2.VideoCapture) and cap.isOpened() else None
+    
+    def probe(self):
+        """
+        Find out which controls the device supports
+        
+        A control counts as supported when it can be read and writing its
+        current value back is accepted.
+        
+        Returns:
+            dict: name -> bool
+        """
+        cap = self._capture()
+        self.supported = {}
+        for name, prop in CONTROLS.items():
+            value = cap.get(prop) if cap is not None else -1
+            self.supported[name] = value != -1 and bool(cap.set(prop, value))
+            if self.supported[name] and name.startswith('auto'):
+                self.automatic[name] = value
+        return self.supported
+    
+    def report(self):
+        """Print which controls are available"""
+        if not self.supported:
+            self.probe()
+        available = [name for name, ok in self.supported.items() if ok]
+        missing = [name for name, ok in self.supported.items() if not ok]
+        if available:
+            print(f"✓ Camera controls: {', '.join(available)}")
+        if missing:
+            print(f"⚠ Camera controls not supported: {', '.join(missing)}")
+    
+    def lock(self):
+        """
+        Freeze focus, exposure and white balance at their current values
+        
+        Returns:
+            bool: True if at least one control was locked
+        """
+        cap = self._capture()
+        if cap is None or self.locked:
+            return False
+        
+        changed = False
+        if self.supported.get('autofocus'):
+            # Turning autofocus off keeps the lens where autofocus left it
+            changed |= bool(cap.set(cv2.CAP_PROP_AUTOFOCUS, 0))
+        if self.supported.get('auto_exposure'):
+            exposure = cap.get(cv2.CAP_PROP_EXPOSURE)
+            manual = MANUAL_EXPOSURE.get(self.automatic['auto_exposure'])
+            if manual is not None and cap.set(cv2.CAP_PROP_AUTO_EXPOSURE, manual):
+                changed = True
+                if self.supported.get('exposure'):
+                    cap.set(cv2.CAP_PROP_EXPOSURE, exposure)
+        if self.supported.get('auto_white_balance'):
+            changed |= bool(cap.set(cv2.CAP_PROP_AUTO_WB, 0))
+        
+        self.locked = changed
+        return changed
+    
+    def unlock(self):
+        """Hand focus, exposure and white balance back to the camera"""
+        cap = self._capture()
+        if cap is None or not self.locked:
+            return
+        if self.supported.get('autofocus'):
+            cap.set(cv2.CAP_PROP_AUTOFOCUS, self.automatic['autofocus'])
+        if self.supported.get('auto_exposure'):
+            cap.set(cv2.CAP_PROP_AUTO_EXPOSURE, self.automatic['auto_exposure'])
+        if self.supported.get('auto_white_balance'):
+            cap.set(cv2.CAP_PROP_AUTO_WB, self.automatic['auto_white_balance'])
+        self.locked = False
+
+
+class FocusExposureLock:
+    """Locks the camera controls while a page is held still and sharp"""
+    
+    def __init__(self, controls, settle_frames=15, max_motion=4.0, sharpness_drop=0.6, blurry_frames=5):
+        """
+        Initialize the control loop
+        
+        Args:
+            controls (CameraControls): Controls of the capturing camera
+            settle_frames (int): Still frames of the same page required before locking
+            max_motion (float): Thumbnail motion (FrameQualityScorer) that counts as still
+            sharpness_drop (float): Fraction of the sharpness at lock time below which
+                the image counts as blurry
+            blurry_frames (int): Consecutive blurry frames that release the lock
+        """
+        self.controls = controls
+        self.settle_frames = settle_frames
+        self.max_motion = max_motion
+        self.sharpness_drop = sharpness_drop
+        self.blurry_frames = blurry_frames
+        
+        self.page_id = None
+        self.still_frames = 0
+        self.blurry_count = 0
+        self.locked_sharpness = 0.0
+        self.settle_peak = 0.0
+        self.locks = 0
+        self.releases = {'page_changed': 0, 'no_document': 0, 'blurry': 0}
+    
+    def update(self, has_document, page_id, quality):
+        """
+        Advance the control loop by one frame
+        
+        Args:
+            has_document (bool): A page is tracked in this frame
+            page_id (int): DocumentTracker.page_id of the tracked page
+            quality (dict): Result of FrameQualityScorer.score() for this frame
+        
+        Returns:
+            bool: True while the controls are locked
+        """
+        if not has_document:
+            self._release('no_document')
+            self.page_id = None
+            self.still_frames = 0
+            return False
+        
+        if page_id != self.page_id:
+            self._release('page_changed')
+            self.page_id = page_id
+            self.still_frames = 0
+            self.settle_peak = 0.0
+        
+        if self.controls.locked:
+            # Re-trigger autofocus when the locked image gets blurry
+            if quality['sharpness'] < self.locked_sharpness * self.sharpness_drop:
+                self.blurry_count += 1
+                if self.blurry_count >= self.blurry_frames:
+                    self._release('blurry')
+            else:
+                self.blurry_count = 0
+            return self.controls.locked
+        
+        # Lock once the page has been still for settle_frames and autofocus has converged
+        # (sharpness close to the best seen while settling)
+        if quality['motion'] > self.max_motion:
+            self.still_frames = 0
+            self.settle_peak = 0.0
+            return False
+        self.still_frames += 1
+        self.settle_peak = max(self.settle_peak, quality['sharpness'])
+        if self.still_frames >= self.settle_frames and quality['sharpness'] >= 0.8 * self.settle_peak:
+            if self.controls.lock():
+                self.locks += 1
+                self.locked_sharpness = quality['sharpness']
+                self.blurry_count = 0
+                print(f"🔒 Focus/exposure locked (sharpness {quality['sharpness']:.0f})")
+        return self.controls.locked
+    
+    def _release(self, reason):
+        """Unlock the controls and count why"""
+        if not self.controls.locked:
+            return
+        self.controls.unlock()
+        self.releases[reason] += 1
+        self.still_frames = 0
+        self.settle_peak = 0.0
+        print(f"🔓 Focus/exposure released ({reason.replace('_', ' ')})")
+    
+    def stats(self):
+        """
+        Lock statistics
+        
+        Returns:
+            dict: locks and releases per reason
+        """
+        return {'locks': self.locks, **{f"released_{reason}": count for reason, count in self.releases.items()}}
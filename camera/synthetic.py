@@ -0,0 +1,227 @@
+"""
+Synthetic Camera Module - Scripted frame source for soak tests and benchmarks
+
+Drop-in replacement for Camera that renders an endless scripted scene
+instead of reading a device: an empty desk (long enough for idle mode to
+kick in), a page of text being held with hand jitter and sensor noise, and
+the same page scrolling so new lines come into view; every cycle shows the
+next page. Frames follow configure() like a real driver would, and with
+realtime=False they are produced as fast as the pipeline consumes them.
+grab() only advances the scene; frames are rendered by retrieve().
+"""
+import time
+
+import cv2
+import numpy as np
+
+SAMPLE_TEXT = (
+    "Reading printed pages aloud helps everyone who cannot read small print. "
+    "The camera looks at the page, the text is recognized line by line and "
+    "spoken as soon as it is stable. Pages may be held at an angle, moved "
+    "slowly or scrolled while reading, and the reader continues where it "
+    "stopped. Long sessions in a kiosk must not slow down over time."
+).split()
+
+
+class SyntheticCamera:
+    """Renders a scripted desk/page/scroll scene with the Camera interface"""
+    
+    def __init__(self, width=1280, height=720, fps=30, pages=5, realtime=False,
+                 empty_seconds=15.0, page_seconds=20.0, scroll_seconds=10.0, seed=0, gray=False):
+        """
+        Initialize the synthetic source
+        
+        Args:
+            width (int): Frame width in pixels
+            height (int): Frame height in pixels
+            fps (int): Nominal frame rate (scene timing is in nominal frames)
+            pages (int): Number of distinct pages cycled through
+            realtime (bool): Sleep to the nominal frame rate instead of running flat out
+            empty_seconds (float): Duration of the empty-desk phase of each cycle
+            page_seconds (float): Duration of the still-page phase
+            scroll_seconds (float): Duration of the scrolling phase
+            seed (int): Random seed for page text and noise
+            gray (bool): Deliver single-channel frames instead of BGR
+        """
+        self.width = width
+        self.height = height
+        self.fps = fps
+        self.realtime = realtime
+        self.gray = gray
+        self.cap = None
+        self.frame_index = 0
+        self.grabbed_index = None
+        self.phase = 'empty'
+        
+        self.rng = np.random.default_rng(seed)
+        self.phases = [('empty', empty_seconds), ('page', page_seconds), ('scroll', scroll_seconds)]
+        self.cycle_seconds = sum(seconds for _, seconds in self.phases)
+        
+        # Everything expensive is rendered once at the native resolution
+        self.background = self._render_desk(1280, 720)
+        self.pages = [self._render_page(index) for index in range(pages)]
+        self.noise = [self.rng.normal(0, 4, (720, 1280, 1)).astype(np.int16) for _ in range(4)]
+        self.last_read = 0.0
+    
+    def _render_desk(self, width, height):
+        """Dark wooden-ish desk texture"""
+        texture = self.rng.normal(0, 1, (height // 8, width // 8)).astype(np.float32)
+        texture = cv2.resize(cv2.GaussianBlur(texture, (0, 0), 3), (width, height))
+        desk = np.clip(70 + 25 * texture, 0, 255).astype(np.uint8)
+        return cv2.merge([desk, (desk * 0.8).astype(np.uint8), (desk * 0.6).astype(np.uint8)])
+    
+    def _render_page(self, index, width=560, height=1100):
+        """A tall page of text (taller than the view so that it can scroll)"""
+        page = np.full((height, width, 3), 245, dtype=np.uint8)
+        words = list(SAMPLE_TEXT)
+        self.rng.shuffle(words)
+        words = [f"Page {index + 1}:"] + words * 3
+        y, line = 50, []
+        for word in words:
+            candidate = ' '.join(line + [word])
+            if cv2.getTextSize(candidate, cv2.FONT_HERSHEY_SIMPLEX, 0.7, 2)[0][0] > width - 60:
+                cv2.putText(page, ' '.join(line), (30, y), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (20, 20, 20), 2, cv2.LINE_AA)
+                y += 36
+                line = [word]
+                if y > height - 30:
+                    break
+            else:
+                line.append(word)
+        return page
+    
+    def start(self):
+        """Start producing frames"""
+        self.cap = True
+        print(f"✓ Synthetic camera started (Resolution: {self.width}x{self.height})")
+    
+    def configure(self, width=None, height=None, fps=None):
+        """
+        Change resolution and/or frame rate (applied to the next frame)
+        
+        Args:
+            width (int): New frame width in pixels (unchanged if None)
+            height (int): New frame height in pixels (unchanged if None)
+            fps (int): New frame rate (unchanged if None)
+        """
+        if width is not None:
+            self.width = width
+        if height is not None:
+            self.height = height
+        if fps is not None:
+            self.fps = fps
+    
+    def _scene(self, index):
+        """Render scene frame index at the native resolution"""
+        nominal_fps = 30.0
+        t = (index / nominal_fps) % self.cycle_seconds
+        cycle = int(index / nominal_fps // self.cycle_seconds)
+        
+        for phase, seconds in self.phases:
+            if t < seconds:
+                break
+            t -= seconds
+        self.phase = phase
+        
+        frame = self.background.copy()
+        if phase != 'empty':
+            page = self.pages[cycle % len(self.pages)]
+            visible = 600
+            scroll = 0
+            if phase == 'scroll':
+                scroll = int((page.shape[0] - visible) * min(1.0, t / seconds))
+            # Hand jitter of a few pixels
+            jx, jy = (int(v) for v in self.rng.integers(-3, 4, size=2))
+            x, y = 360 + jx, 60 + jy
+            frame[y:y + visible, x:x + page.shape[1]] = page[scroll:scroll + visible]
+        
+        noisy = frame.astype(np.int16) + self.noise[index % len(self.noise)]
+        return np.clip(noisy, 0, 255).astype(np.uint8)
+    
+    def read_frame(self):
+        """
+        Produce the next frame
+        
+        Returns:
+            tuple: (success: bool, frame: numpy.ndarray) - BGR, or grayscale with gray=True
+        """
+        self.grab()
+        return self.retrieve()
+    
+    def grab(self):
+        """
+        Advance to the next frame without rendering it
+        
+        Returns:
+            bool: Always True once started
+        """
+        if self.cap is None:
+            raise Exception("Camera not started. Call start() first.")
+        
+        if self.realtime:
+            wait = 1.0 / self.fps - (time.monotonic() - self.last_read)
+            if wait > 0:
+                time.sleep(wait)
+            self.last_read = time.monotonic()
+        
+        self.grabbed_index = self.frame_index
+        # Idle mode runs at a lower frame rate: fewer scene frames pass per read
+        self.frame_index += max(1, int(round(30.0 / max(self.fps, 1))))
+        return True
+    
+    def retrieve(self, gray=None):
+        """
+        Render the most recently grabbed frame
+        
+        Args:
+            gray (bool): Return a single-channel frame (default: the camera setting)
+        
+        Returns:
+            tuple: (success: bool, frame: numpy.ndarray)
+        """
+        if self.grabbed_index is None:
+            return False, None
+        frame = self._scene(self.grabbed_index)
+        if (self.width, self.height) != (frame.shape[1], frame.shape[0]):
+            frame = cv2.resize(frame, (self.width, self.height), interpolation=cv2.INTER_AREA)
+        if self.gray if gray is None else gray:
+            frame = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        return True, frame
+    
+    def skip(self, count):
+        """
+        Discard frames without rendering them
+        
+        Args:
+            count (int): Number of frames to skip
+        
+        Returns:
+            int: Number of frames skipped
+        """
+        for _ in range(count):
+            self.grab()
+        return count
+    
+    def drain(self, seconds_behind):
+        """
+        Skip the frames a real camera would have queued while the caller was busy
+        (nothing queues up when frames are produced on demand)
+        
+        Args:
+            seconds_behind (float): Time spent beyond one frame period
+        
+        Returns:
+            int: Number of frames skipped
+        """
+        if not self.realtime or seconds_behind <= 0:
+            return 0
+        return self.skip(min(int(seconds_behind * self.fps), 4))
+    
+    def release(self):
+        """Stop producing frames"""
+        if self.cap is not None:
+            self.cap = None
+            print("✓ Synthetic camera released")
+    
+    def is_opened(self):
+        """Check if the source is currently active"""
+        return self.cap is not None
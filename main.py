@@ -6,46 +6,195 @@ This application captures live video from a webcam, performs OCR on printed text
 and automatically speaks the detected text aloud.
 """
 
+import argparse
 import cv2
+import os
 import sys
 import time
 from camera.camera import Camera
+from camera.controls import CameraControls, FocusExposureLock
 from preprocess.preprocess import ImagePreprocessor
+from preprocess.frame_quality import FrameQualityScorer, BestFrameSelector
+from preprocess.presence import PresenceDetector
+from preprocess.document_tracker import DocumentTracker
 from ocr.ocr_engine import OCREngine
+from ocr.cancellation import CancelToken
+from ocr.text_detector import TextDetector, rotate_rects
+from ocr.page_orientation import PageOrientation, rotate_quadrant, rotate_rect_quadrant
 from speech.text_to_speech import TextToSpeech
+from speech.reading_tracker import ReadingTracker
 from utils.file_handler import FileHandler
+from utils.near_duplicates import NearDuplicateIndex
+from utils.startup import StartupProfiler
+from utils.profiler import SamplingProfiler
+from utils.idle_mode import IdleController
+from utils.performance_profiles import PerformanceProfiles, check_section
 
 
 class PageVisionOCR:
     """Main application class for real-time OCR with TTS"""
     
-    def __init__(self):
-        """Initialize all components"""
+    def __init__(self, camera=None, profiles=None, profile=None, fourcc=None, gray=False):
+        """
+        Initialize all components
+        
+        Args:
+            camera: Frame source with the Camera interface (default: webcam 0),
+                    e.g. a SyntheticCamera for soak tests
+            profiles (PerformanceProfiles): Named performance profiles ('M' cycles them)
+            profile (str): Profile applied at start (default: the profiles' default)
+            fourcc (str): Pixel format of the default webcam ('MJPG', 'YUYV' or 'auto')
+            gray (bool): Capture single-channel frames with the default webcam
+        
+        Raises:
+            ValueError: A profile (or an override) sets an unknown parameter
+        """
         print("=" * 60)
         print("🚀 Initializing PageVision OCR System...")
         print("=" * 60)
         
+        # Startup timing; heavy engines are only constructed here and warmed up
+        # in the background once the camera preview is running
+        self.startup = StartupProfiler()
+        self.startup_reported = False
+        self.ocr_warmup_thread = None
+        
         # Initialize components
-        self.camera = Camera(camera_index=0, width=1280, height=720)
-        self.preprocessor = ImagePreprocessor()
-        self.ocr_engine = OCREngine(language='eng', confidence_threshold=30)
-        self.tts = TextToSpeech(rate=150, volume=1.0)
-        self.file_handler = FileHandler(output_dir='ocr_output')
+        with self.startup.measure('camera'):
+            self.camera = camera or Camera(camera_index=0, width=1280, height=720, fourcc=fourcc, gray=gray)
+            # Focus/exposure are locked while a page is held still (see camera/controls.py)
+            self.camera_controls = CameraControls(self.camera)
+            self.focus_lock = FocusExposureLock(self.camera_controls)
+        with self.startup.measure('preprocessor'):
+            self.preprocessor = ImagePreprocessor()
+            self.frame_scorer = FrameQualityScorer()
+            self.frame_selector = BestFrameSelector()
+            self.document_tracker = DocumentTracker(self.preprocessor)
+        with self.startup.measure('ocr_engine'):
+            self.ocr_engine = OCREngine(language='eng', confidence_threshold=30, lazy=True)
+            self.page_orientation = PageOrientation(self.ocr_engine)  # OSD once per tracked page
+        with self.startup.measure('tts'):
+            self.tts = TextToSpeech(rate=150, volume=1.0, lazy=True)
+            self.reader = ReadingTracker()
+            self.read_pages = NearDuplicateIndex()  # Every page read aloud this session
+        with self.startup.measure('file_handler'):
+            self.file_handler = FileHandler(output_dir='ocr_output', lazy=True)
         
         # Application state
         self.current_text = ""
         self.auto_speak = True  # Auto-speak when new text is detected
         self.show_processed = False  # Toggle to show preprocessed view
+        self.session_export = None   # Streaming hOCR/ALTO/PDF export, toggled with 'E'
+        self.exported_pages = None   # Pages already in the running session export
         self.frame_count = 0
         self.ocr_interval = 10  # Perform OCR every N frames for performance (faster processing)
+        self.ocr_deadline = 3.0  # Seconds all OCR calls of one frame may take before they are aborted
         
         # Document detection state
         self.document_detected = False
         self.frames_without_document = 0
-        self.max_frames_without_document = 10  # Reset buffer if no document for N frames
+        self.max_frames_without_document = 10  # Reset buffer and go idle if no document for N OCR ticks
+        
+        # Low-power idle mode (reduced capture, thumbnail presence check only)
+        self.idle = IdleController(self.camera, PresenceDetector(), idle_width=320, idle_height=240, idle_fps=5)
+        self.wake_ocr_delay = 3  # Frames collected for best-frame selection before the first OCR after waking
+        
+        # Optional CNN text detector (ONNX Runtime): only proposed regions are recognized
+        self.text_detector = None
+        if os.environ.get('PAGEVISION_DETECTOR'):
+            self.text_detector = TextDetector(os.environ['PAGEVISION_DETECTOR'],
+                                              kind=os.environ.get('PAGEVISION_DETECTOR_KIND', 'db'),
+                                              quantized=os.environ.get('PAGEVISION_DETECTOR_INT8') == '1')
+        
+        # Named performance profile; a document-type tuning below takes precedence.
+        # Every profile is checked now ('M' cycles through them and the overrides
+        # apply to all), so a typo fails here instead of halfway through a switch.
+        self.profiles = profiles
+        if self.profiles is not None:
+            for name in self.profiles.names:
+                try:
+                    self.check_profile(self.profiles.settings(name))
+                except ValueError as e:
+                    raise ValueError(f"Profile '{name}': {e}") from None
+            self.apply_profile(profile or self.profiles.default)
+        
+        # Settings tuned for a document type by autotune.py (optional)
+        if os.environ.get('PAGEVISION_TUNING'):
+            self.load_tuning(os.environ['PAGEVISION_TUNING'])
+        
+        # Opt-in sampling profiler (PAGEVISION_PROFILE=1, 'R' key or SIGUSR1)
+        self.profiler = SamplingProfiler(interval=0.02, history_seconds=30)
+        if os.environ.get('PAGEVISION_PROFILE') == '1':
+            self.profiler.start()
         
         print("✓ All components initialized successfully!\n")
     
+    def load_tuning(self, path):
+        """
+        Apply a tuning file written by autotune.py to the OCR engine and preprocessor
+        
+        Args:
+            path (str): Tuning JSON file
+        """
+        try:
+            profile = self.ocr_engine.load_tuning(path)
+            preprocess = profile.get('preprocess')
+            if preprocess:
+                self.preprocessor.set_binarization(preprocess['binarization'], **preprocess['binarization_params'])
+        except (OSError, ValueError, KeyError) as e:
+            print(f"✗ Tuning Error: {e}")
+    
+    def check_profile(self, settings):
+        """
+        Check every parameter of resolved profile settings against the tunable
+        keys, types and ranges in performance_profiles.SETTINGS, without applying any
+        
+        Args:
+            settings (dict): Result of PerformanceProfiles.settings()
+        
+        Raises:
+            ValueError: Unknown parameter or invalid value
+        """
+        for section in ('camera', 'pipeline', 'speech'):
+            check_section(section, settings[section])
+        self.preprocessor.check_settings(**settings['preprocess'])
+        self.ocr_engine.check_settings(**settings['ocr'])
+    
+    def apply_profile(self, name):
+        """
+        Apply a performance profile to camera, pipeline, preprocessor, OCR and speech
+        (safe while running). All settings are checked first, so a bad profile
+        changes nothing.
+        
+        Args:
+            name (str): Profile name
+        
+        Returns:
+            bool: True if the profile was applied
+        """
+        try:
+            settings = self.profiles.settings(name)
+            self.check_profile(settings)
+            camera = settings['camera']
+            if self.idle.is_idle() and self.idle.active_settings:
+                # The idle controller restores these when a page shows up
+                width, height, fps = self.idle.active_settings
+                self.idle.active_settings = (camera.get('width', width), camera.get('height', height),
+                                             camera.get('fps', fps))
+            elif camera:
+                self.camera.configure(**camera)
+            for key, value in settings['pipeline'].items():
+                setattr(self, key, value)
+            self.preprocessor.configure(**settings['preprocess'])
+            self.ocr_engine.configure(**settings['ocr'])
+            self.tts.configure(**settings['speech'])
+        except (ValueError, TypeError) as e:
+            print(f"✗ Profile Error: {e}")
+            return False
+        self.profiles.current = name
+        print(f"✓ Performance profile: {name}")
+        return True
+    
     def display_instructions(self):
         """Display keyboard controls and instructions"""
         print("=" * 60)
@@ -56,6 +205,9 @@ class PageVisionOCR:
         print("  A  →  Toggle auto-speak mode")
         print("  P  →  Toggle preprocessed view")
         print("  V  →  List available TTS voices")
+        print("  R  →  Start profiler / dump last 30s profile")
+        print("  E  →  Start/stop hOCR + ALTO + PDF session export")
+        print("  M  →  Switch to the next performance profile")
         print("  Q  →  Quit application")
         print("=" * 60)
         print()
@@ -113,7 +265,8 @@ class PageVisionOCR:
                             (20, y_offset), 0.5, color, 1)
         y_offset += line_height
         
-        self.add_overlay_text(frame, f"Language: {self.ocr_engine.language.upper()}", 
+        profile = f" | Profile: {self.profiles.current}" if self.profiles is not None else ""
+        self.add_overlay_text(frame, f"Language: {self.ocr_engine.language.upper()}{profile}", 
                             (20, y_offset), 0.5, (255, 255, 0), 1)
         y_offset += line_height
         
@@ -139,43 +292,103 @@ class PageVisionOCR:
         Returns:
             Processed frame with annotations
         """
-        # Create a copy for display
-        display_frame = frame.copy()
+        # While idle only the thumbnail presence check runs
+        if self.idle.is_idle():
+            if self.idle.update(frame):
+                self.resume_from_idle()
+            return self.create_idle_view(frame)
+        
+        # Create a copy for display (in color, so annotations keep their colors)
+        display_frame = cv2.cvtColor(frame, cv2.COLOR_GRAY2BGR) if frame.ndim == 2 else frame.copy()
+        
+        # LAYER 1: Document Detection - the page is tracked every frame (cheap KLT flow);
+        # full contour detection only runs on track loss or periodically
+        has_document, document_contour = self.document_tracker.update(frame)
+        self.document_detected = has_document
+        if has_document:
+            cv2.drawContours(display_frame, [document_contour], -1, (0, 255, 0), 3)
+        
+        # Score every frame cheaply; only the best frame of each OCR window is recognized
+        quality = self.frame_scorer.score(frame)
+        self.frame_selector.offer(frame, quality)
+        
+        # Stop autofocus/auto-exposure from hunting while the page is held still
+        self.focus_lock.update(has_document, self.document_tracker.page_id, quality)
         
         # Perform OCR at intervals for better performance
-        if self.frame_count % self.ocr_interval == 0:
-            # LAYER 1: Document Detection - Check if a page/document is present
-            has_document, document_contour = self.preprocessor.detect_document(frame)
-            self.document_detected = has_document
+        # (skipped while the OCR engine is still warming up in the background)
+        if self.frame_count % self.ocr_interval == 0 and not self.is_ocr_warming_up():
+            ocr_frame, ocr_quality = self.frame_selector.take()
             
-            # Draw document boundary if detected
-            if has_document and document_contour is not None:
-                cv2.drawContours(display_frame, [document_contour], -1, (0, 255, 0), 3)
+            if has_document:
                 self.frames_without_document = 0
             else:
                 self.frames_without_document += 1
-                # Reset OCR buffer if no document detected for too long
+                # Reset OCR buffer and drop to low-power idle if no document detected for too long
                 if self.frames_without_document > self.max_frames_without_document:
                     self.ocr_engine.text_buffer = []
-                    # Don't print reset message every time
+                    self.idle.enter_idle(frame)
+                    self.document_tracker.reset()
+                    self.frames_without_document = 0
+                    self.document_detected = False
+                    return self.create_info_panel(display_frame)
             
-            # Proceed with OCR even if document detection is uncertain (more lenient)
-            if True:  # Changed from 'if has_document:' to allow OCR even without perfect document detection
-                # Preprocess the frame
-                processed = self.preprocessor.preprocess(frame)
+            # Proceed with OCR even if document detection is uncertain (more lenient),
+            # but not on blurred, moving or badly exposed frames
+            if self.frame_scorer.is_acceptable(ocr_quality):
+                # Preprocess the frame (heavy denoising, if needed, is limited to the page region)
+                roi = cv2.boundingRect(document_contour) if has_document else None
+                processed = self.preprocessor.preprocess(ocr_frame, roi=roi)
                 
-                # LAYER 2: Text Density Check - Verify there's meaningful content
-                text_density = self.preprocessor.get_text_density(processed)
+                # Turn sideways/upside-down pages upright and pick the language of their script
+                # (OSD runs once per page; the result is cached while the tracker keeps the page)
+                rotation = 0
+                if has_document:
+                    rotation = self.page_orientation.update(self.document_tracker.page_id, processed, roi)
+                if rotation:
+                    roi = rotate_rect_quadrant(roi, rotation, ocr_frame.shape)
+                    ocr_frame = rotate_quadrant(ocr_frame, rotation)
+                    processed = rotate_quadrant(processed, rotation)
                 
-                if 0.01 < text_density < 0.7:  # Wider text density range for better detection
-                    # Extract text with bounding boxes
-                    boxes = self.ocr_engine.extract_text_with_boxes(processed)
+                # Straighten tilted pages (cheap estimate; rotates only when significant)
+                processed, skew_angle = self.preprocessor.auto_deskew(processed)
+                
+                # LAYER 2: Text Check - the detector localizes text regions when available,
+                # otherwise the density of dark pixels must look like text
+                text_regions = None
+                if self.text_detector is not None:
+                    try:
+                        text_regions = self.text_detector.detect(ocr_frame, roi=roi)
+                        if skew_angle != 0.0:
+                            text_regions = rotate_rects(text_regions, skew_angle, processed.shape)
+                    except Exception as e:
+                        print(f"✗ Text detector failed, using the density check instead: {e}")
+                        self.text_detector = None
+                if text_regions is not None:
+                    has_text = bool(text_regions)
+                else:
+                    text_density = self.preprocessor.get_text_density(processed)
+                    has_text = 0.01 < text_density < 0.7  # Wider text density range for better detection
+                
+                if has_text:
+                    # Both OCR calls of this frame share one deadline (OCR runs on the
+                    # capture thread, so no newer frame can arrive while they run)
+                    token = CancelToken(self.ocr_deadline)
+                    
+                    if text_regions is not None:
+                        # Only the proposed regions are recognized (one call per montage)
+                        full_text, boxes = self.ocr_engine.extract_regions(processed, text_regions, token=token)
+                    else:
+                        # Extract text with bounding boxes
+                        boxes = self.ocr_engine.extract_text_with_boxes(processed, token=token)
+                        full_text = self.ocr_engine.extract_text(processed, token=token)
                     
-                    # Draw bounding boxes
-                    display_frame = self.ocr_engine.draw_boxes(display_frame, boxes)
+                    # Draw bounding boxes (box coordinates only match the live frame when not rotated)
+                    if skew_angle == 0.0 and not rotation:
+                        display_frame = self.ocr_engine.draw_boxes(display_frame, boxes)
                     
-                    # Extract full text
-                    full_text = self.ocr_engine.extract_text(processed)
+                    # Fix low-confidence words against the lexicon
+                    full_text = self.ocr_engine.correct_text(full_text, boxes)
                     
                     # LAYER 3: Meaningful Text Validation
                     if full_text and self.ocr_engine.is_meaningful_text(full_text):
@@ -185,29 +398,124 @@ class PageVisionOCR:
                             self.current_text = full_text
                             print(f"\n📄 Detected STABLE text: {full_text}")
                             
-                            # LAYER 5: New Text Check - Only speak if text is new
-                            if self.auto_speak and self.ocr_engine.is_new_text(full_text):
-                                print("🔊 Auto-speaking detected text...")
-                                self.tts.speak(full_text, blocking=False)
+                            # Archive each new page with its word boxes
+                            if self.session_export is not None:
+                                self.export_page(ocr_frame, skew_angle, boxes, full_text)
+                            
+                            # LAYER 5: New Text Check - Only speak the part that was not read yet
+                            # (continues after scrolling or when a new paragraph comes into view);
+                            # a whole page shown again later in the session is not re-read
+                            if self.auto_speak:
+                                unread = self.reader.unread_part(full_text)
+                                new_page = unread == ' '.join(full_text.split())
+                                if unread and new_page and self.read_pages.contains(full_text):
+                                    print("⏭ Page was already read in this session, not repeating it")
+                                elif unread:
+                                    print(f"🔊 Auto-speaking new text ({len(unread.split())} words)...")
+                                    self.tts.enqueue(unread)
+                                    self.read_pages.add_if_new(full_text)
                         else:
                             if full_text:  # Show what text was detected but not stable
                                 print(f"⚠ Text not stable enough: '{full_text}' (needs {self.ocr_engine.stability_threshold}/{self.ocr_engine.buffer_size} frames)")
                     else:
                         if full_text:
                             print(f"⚠ Text rejected as noise: '{full_text}'")
+                elif text_regions is not None:
+                    print("⚠ No text regions detected")
                 else:
                     print(f"⚠ Invalid text density: {text_density:.3f} (likely noise or no text)")
+            else:
+                print(f"⚠ Skipping OCR, best frame too blurry or moving "
+                      f"(sharpness {ocr_quality['sharpness']:.0f}, motion {ocr_quality['motion']:.1f})")
         
         # Add info panel
         display_frame = self.create_info_panel(display_frame)
         
         return display_frame
     
+    def export_page(self, frame, skew_angle, boxes, text):
+        """
+        Append a page to the running session export unless it repeats the last page
+        
+        Args:
+            frame (numpy.ndarray): Frame the text was recognized from
+            skew_angle (float): Rotation applied before OCR (box coordinates refer to the rotated image)
+            boxes (list): Word boxes from extract_text_with_boxes
+            text (str): Recognized text
+        """
+        if not self.exported_pages.add_if_new(text):
+            return
+        page_image = frame
+        if skew_angle != 0.0:
+            gray = frame if frame.ndim == 2 else cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+            page_image = self.preprocessor.rotate(gray, skew_angle)
+        self.session_export.add_page(page_image, boxes)
+        print(f"💾 Exported page {self.session_export.page_count}")
+    
+    def toggle_session_export(self):
+        """Start a new session export or finish the running one"""
+        if self.session_export is None:
+            self.session_export = self.file_handler.start_session_export()
+            self.exported_pages = NearDuplicateIndex()
+        else:
+            paths = self.session_export.close()
+            print(f"✓ Session export finished ({self.session_export.page_count} pages): {', '.join(paths)}")
+            self.session_export = None
+    
+    def resume_from_idle(self):
+        """Reset per-stream state so the full pipeline ramps up within a few frames"""
+        self.frames_without_document = 0
+        self.frame_selector.take()
+        # Schedule the next OCR tick wake_ocr_delay frames from now
+        self.frame_count = self.ocr_interval - self.wake_ocr_delay
+    
+    def create_idle_view(self, frame):
+        """
+        Build the display frame shown while idling
+        
+        Args:
+            frame (numpy.ndarray): Low-resolution idle frame
+        
+        Returns:
+            Frame scaled to the normal display size with an idle notice
+        """
+        width, height = self.idle.active_settings[:2] if self.idle.active_settings else (frame.shape[1], frame.shape[0])
+        display_frame = cv2.resize(frame, (width, height), interpolation=cv2.INTER_NEAREST)
+        if display_frame.ndim == 2:
+            display_frame = cv2.cvtColor(display_frame, cv2.COLOR_GRAY2BGR)
+        self.add_overlay_text(display_frame, "IDLE - low-power mode, show a page to resume",
+                              (20, 40), 0.8, (0, 200, 255), 2)
+        return display_frame
+    
+    def is_ocr_warming_up(self):
+        """Check whether the background OCR warm-up is still running"""
+        return self.ocr_warmup_thread is not None and self.ocr_warmup_thread.is_alive()
+    
+    def start_background_warmup(self):
+        """Warm up the OCR and TTS engines while the preview is already running"""
+        self.ocr_warmup_thread = self.startup.run_in_background('ocr_engine', self.ocr_engine.warm_up)
+        self.startup.run_in_background('tts', self.tts.warm_up)
+        if self.text_detector is not None:
+            self.startup.run_in_background('text_detector', self.text_detector.warm_up)
+    
+    def report_startup(self):
+        """Print the startup report once the first frame is shown and warm-up has finished"""
+        if self.startup_reported or self.startup.time_to_first_frame() is None:
+            return
+        if self.startup.background_done():
+            self.startup.report()
+            self.startup_reported = True
+    
     def run(self):
         """Main application loop"""
         try:
             # Start camera
-            self.camera.start()
+            with self.startup.measure('camera start'):
+                self.camera.start()
+            self.camera_controls.report()
+            
+            self.start_background_warmup()
+            self.profiler.install_signal_handler()
             
             # Display instructions
             self.display_instructions()
@@ -224,10 +532,20 @@ class PageVisionOCR:
                 
                 # Process frame
                 self.frame_count += 1
+                started = time.perf_counter()
                 processed_frame = self.process_frame(frame)
                 
+                # Frames queued by the driver during a slow OCR tick are stale:
+                # skip them without decoding so tracking continues on a current frame
+                if not self.idle.is_idle():
+                    self.camera.drain(time.perf_counter() - started - 1.0 / self.camera.fps)
+                
                 # Display the frame
                 cv2.imshow('PageVision OCR - Live Feed', processed_frame)
+                if self.idle.is_idle():
+                    self.idle.throttle()
+                self.startup.mark_first_frame()
+                self.report_startup()
                 
                 # Handle keyboard input
                 key = cv2.waitKey(1) & 0xFF
@@ -249,7 +567,8 @@ class PageVisionOCR:
                     # Save text to file
                     if self.current_text:
                         filepath = self.file_handler.save_text(self.current_text)
-                        print(f"\n💾 Text saved successfully!")
+                        if filepath:
+                            print(f"\n💾 Text saved successfully!")
                     else:
                         print("\n⚠ No text to save")
                 
@@ -268,6 +587,24 @@ class PageVisionOCR:
                     # List available voices
                     print()
                     self.tts.list_voices()
+                
+                elif key == ord('r') or key == ord('R'):
+                    # Start sampling, or dump what the app was doing recently
+                    print()
+                    if self.profiler.running:
+                        self.profiler.dump()
+                    else:
+                        self.profiler.start()
+                
+                elif key == ord('e') or key == ord('E'):
+                    # Start or finish streaming the session to hOCR / ALTO / PDF
+                    print()
+                    self.toggle_session_export()
+                
+                elif (key == ord('m') or key == ord('M')) and self.profiles is not None:
+                    # Cycle performance profiles without restarting
+                    print()
+                    self.apply_profile(self.profiles.next_name())
         
         except KeyboardInterrupt:
             print("\n\n⚠ Interrupted by user")
@@ -287,6 +624,19 @@ class PageVisionOCR:
         print("🧹 Cleaning up resources...")
         print("=" * 60)
         
+        self.profiler.stop()
+        ocr_stats = self.ocr_engine.metrics.snapshot()
+        print(f"📊 OCR calls: {ocr_stats['completed']} completed, {ocr_stats['timed_out']} timed out, "
+              f"{ocr_stats['cancelled']} cancelled ({ocr_stats['wasted_seconds']:.1f}s spent on aborted calls)")
+        lock_stats = self.focus_lock.stats()
+        print(f"📊 Focus/exposure locks: {lock_stats['locks']} (released: {lock_stats['released_page_changed']} "
+              f"page changes, {lock_stats['released_blurry']} blurry, {lock_stats['released_no_document']} no page)")
+        osd_stats = self.page_orientation.stats()
+        print(f"📊 Orientation detection: {osd_stats['osd_runs']} OSD runs, {osd_stats['cache_hits']} cached")
+        if self.session_export is not None:
+            self.toggle_session_export()
+        # Controls persist on the device: hand them back before releasing it
+        self.camera_controls.unlock()
         self.camera.release()
         cv2.destroyAllWindows()
         self.tts.stop()
@@ -299,10 +649,41 @@ class PageVisionOCR:
 
 def main():
     """Entry point for the application"""
-    # Create and run the application
-    app = PageVisionOCR()
+    parser = argparse.ArgumentParser(description="PageVision OCR - real-time OCR with text-to-speech")
+    parser.add_argument('--profile', help="Performance profile, e.g. low-power, balanced, max-throughput, max-accuracy")
+    parser.add_argument('--profiles', help="Profiles file (default: performance_profiles.json)")
+    parser.add_argument('--set', action='append', default=[], metavar='SECTION.KEY=VALUE',
+                        help="Override a profile setting, e.g. --set ocr.confidence_threshold=40 (repeatable)")
+    parser.add_argument('--list-profiles', action='store_true', help="Show the available profiles and exit")
+    parser.add_argument('--fourcc', metavar='CODE',
+                        help="Camera pixel format: MJPG, YUYV or auto (MJPG, then YUYV); default: driver's choice")
+    parser.add_argument('--gray', action='store_true',
+                        help="Capture single-channel frames straight from the camera buffer")
+    args = parser.parse_args()
+    
+    try:
+        profiles = PerformanceProfiles(args.profiles, args.set)
+        profiles.settings(args.profile)  # Validate the name before starting the camera
+    except (OSError, ValueError) as e:
+        print(f"✗ Profile Error: {e}")
+        if args.profile or args.profiles or args.set or args.list_profiles:
+            return 1
+        profiles = None  # Run with the built-in defaults
+    
+    if args.list_profiles:
+        for name in profiles.names:
+            print(f"  {name}{' (default)' if name == profiles.default else ''}")
+        return 0
+    
+    # Create and run the application (profiles are checked before the camera starts)
+    try:
+        app = PageVisionOCR(profiles=profiles, profile=args.profile, fourcc=args.fourcc, gray=args.gray)
+    except ValueError as e:
+        print(f"✗ Profile Error: {e}")
+        return 1
     app.run()
+    return 0
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
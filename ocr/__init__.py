@@ -1,4 +1,16 @@
 """OCR module for text extraction"""
 from .ocr_engine import OCREngine
+from .lexicon import Lexicon
+from .recognizer import TesseractRecognizer, EnginePool
+from .cancellation import CancelToken, LatestFrameScheduler, OCRCancelled, OCRTimeout
+from .montage import MontageBatcher, crop_regions
+from .layout import group_lines
+from .async_recognizer import AsyncRecognizer, Recognition, StableText
+from .text_detector import TextDetector, quantize_model, rotate_rects
+from .page_orientation import PageOrientation, SCRIPT_LANGUAGES, rotate_quadrant, rotate_rect_quadrant
 
-__all__ = ['OCREngine']
+__all__ = ['OCREngine', 'Lexicon', 'TesseractRecognizer', 'EnginePool',
+           'CancelToken', 'LatestFrameScheduler', 'OCRCancelled', 'OCRTimeout',
+           'MontageBatcher', 'crop_regions', 'group_lines', 'AsyncRecognizer', 'Recognition', 'StableText',
+           'TextDetector', 'quantize_model', 'rotate_rects',
+           'PageOrientation', 'SCRIPT_LANGUAGES', 'rotate_quadrant', 'rotate_rect_quadrant']
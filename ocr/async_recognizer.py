@@ -0,0 +1,197 @@
+"""
+Async Recognizer Module - asyncio-native preprocessing + OCR
+
+All CPU work (preprocessing, deskewing, Tesseract) runs on a managed thread
+pool, so the event loop never blocks. A semaphore bounds the number of
+recognitions in flight: when it is exhausted, recognize() waits, which gives
+callers natural backpressure. Cancelling an awaiting task cancels its token,
+which kills the running Tesseract process (see ocr/cancellation.py).
+stream() keeps reading frames while a frame is recognized; a newer sampled
+frame of the same source supersedes the one still in recognition.
+
+Usage:
+    async with AsyncRecognizer(max_concurrency=4) as recognizer:
+        result = await recognizer.recognize(frame)
+        async for stable in recognizer.stream(SyntheticCamera()):
+            print(stable.text)
+"""
+import asyncio
+import os
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from preprocess.preprocess import ImagePreprocessor
+from .cancellation import CancelToken, LatestFrameScheduler, OCRCancelled
+from .ocr_engine import OCREngine
+from .recognizer import EnginePool
+from utils.near_duplicates import NearDuplicateIndex
+
+Recognition = namedtuple('Recognition', ['text', 'boxes', 'skew_angle', 'seconds'])
+StableText = namedtuple('StableText', ['text', 'boxes', 'frame_index'])
+
+
+class AsyncRecognizer:
+    """Runs recognition for many concurrent streams from one event loop"""
+    
+    def __init__(self, max_concurrency=None, language='eng', timeout=10.0, pool=None):
+        """
+        Initialize the recognizer
+        
+        Args:
+            max_concurrency (int): Recognitions in flight at once (default: CPU count)
+            language (str): Tesseract language code
+            timeout (float): Deadline per recognition in seconds
+            pool (EnginePool): Shared engine pool (default: one sized to max_concurrency)
+        """
+        self.max_concurrency = max_concurrency or os.cpu_count() or 1
+        self.language = language
+        self.timeout = timeout
+        self.pool = pool or EnginePool(size=self.max_concurrency)
+        self.ocr_engine = OCREngine(language=language, lazy=True, pool=self.pool)
+        self.executor = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix='ocr')
+        self.scheduler = LatestFrameScheduler()  # One live frame per stream
+        self._semaphore = None  # Created on the running loop
+        self._local = threading.local()
+    
+    async def __aenter__(self):
+        await self.warm_up()
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        self.close()
+    
+    def _slots(self):
+        """Semaphore bounding recognitions in flight (bound to the running loop)"""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+    
+    def _preprocessor(self):
+        """Per-thread preprocessor (it keeps running statistics between calls)"""
+        preprocessor = getattr(self._local, 'preprocessor', None)
+        if preprocessor is None:
+            preprocessor = self._local.preprocessor = ImagePreprocessor()
+        return preprocessor
+    
+    async def warm_up(self):
+        """Load Tesseract and the language data on every pooled engine"""
+        await asyncio.get_running_loop().run_in_executor(self.executor, self.pool.warm_up, self.ocr_engine.config)
+    
+    def _recognize_sync(self, frame, roi, token):
+        """Preprocess and recognize one frame (runs on the thread pool)"""
+        started = time.perf_counter()
+        token.check()
+        preprocessor = self._preprocessor()
+        processed = preprocessor.preprocess(frame, roi=roi)
+        processed, skew_angle = preprocessor.auto_deskew(processed)
+        boxes = self.ocr_engine.extract_text_with_boxes(processed, token=token)
+        text = self.ocr_engine.extract_text(processed, token=token)
+        token.check()
+        return Recognition(text, boxes, skew_angle, time.perf_counter() - started)
+    
+    async def recognize(self, frame, roi=None, timeout=None, token=None):
+        """
+        Preprocess and recognize a frame without blocking the event loop
+        
+        Args:
+            frame (numpy.ndarray): BGR frame
+            roi (tuple): Optional (x, y, w, h) text region
+            timeout (float): Deadline in seconds (default: self.timeout)
+            token (CancelToken): Token to run under instead of a new one (timeout is ignored)
+        
+        Returns:
+            Recognition: text, boxes, skew_angle and seconds
+        
+        Raises:
+            OCRCancelled / OCRTimeout: The frame was cancelled or missed its deadline
+            asyncio.CancelledError: The awaiting task was cancelled (Tesseract is killed)
+        """
+        async with self._slots():
+            token = token or CancelToken(timeout or self.timeout)
+            future = asyncio.get_running_loop().run_in_executor(
+                self.executor, self._recognize_sync, frame, roi, token)
+            try:
+                return await future
+            except asyncio.CancelledError:
+                token.cancel('task cancelled')
+                raise
+    
+    async def stream(self, source, ocr_interval=10, max_frames=None):
+        """
+        Read a frame source and yield each new stable text
+        
+        Every stream keeps its own stability and new-text state (including a
+        session index, so pages shown again are not yielded twice); recognition
+        is shared through the pool. Blocking reads run on their own thread and
+        continue while a frame is recognized. Each sampled frame is scheduled
+        on self.scheduler, so a newer one kills the Tesseract process of the
+        older one, which then yields nothing; ocr_interval should leave more
+        time between sampled frames than a recognition takes. Frames that miss
+        their deadline are skipped as well.
+        
+        Args:
+            source: Object with read_frame() -> (ok, frame), e.g. Camera or SyntheticCamera
+            ocr_interval (int): Recognize every Nth frame
+            max_frames (int): Stop after this many frames (None: until the source ends)
+        
+        Yields:
+            StableText: text, boxes and index of the frame it was read from
+        """
+        loop = asyncio.get_running_loop()
+        tracker = OCREngine(language=self.language, lazy=True, pool=self.pool)
+        tracker.seen_texts = NearDuplicateIndex()
+        reader = ThreadPoolExecutor(max_workers=1, thread_name_prefix='capture')
+        frame_index = 0
+        reading = None   # Future of the pending read_frame()
+        running = None   # (task, token, frame_index) of the frame in recognition
+        exhausted = False
+        try:
+            while True:
+                if reading is None and not exhausted and (max_frames is None or frame_index < max_frames):
+                    reading = loop.run_in_executor(reader, source.read_frame)
+                waiting = [future for future in (reading, running and running[0]) if future is not None]
+                if not waiting:
+                    return
+                done, _ = await asyncio.wait(waiting, return_when=asyncio.FIRST_COMPLETED)
+                
+                if running is not None and running[0] in done:
+                    task, token, index = running
+                    running = None
+                    self.scheduler.finish(source, token)
+                    try:
+                        result = task.result()
+                    except OCRCancelled:
+                        result = None
+                    if result is not None:
+                        text = tracker.correct_text(result.text, result.boxes)
+                        if (tracker.is_meaningful_text(text) and tracker.is_stable_text(text)
+                                and tracker.is_new_text(text)):
+                            yield StableText(text, result.boxes, index)
+                
+                if reading is not None and reading in done:
+                    ok, frame = reading.result()
+                    reading = None
+                    if not ok:
+                        exhausted = True
+                        continue
+                    frame_index += 1
+                    if frame_index % ocr_interval:
+                        continue
+                    # Cancels the token of the frame still in recognition (if any)
+                    token = self.scheduler.schedule(source, timeout=self.timeout)
+                    if running is not None:
+                        running[0].cancel()
+                    running = (asyncio.ensure_future(self.recognize(frame, token=token)), token, frame_index)
+        finally:
+            if running is not None:
+                running[0].cancel()
+                self.scheduler.finish(source, running[1])
+                running[1].cancel('stream closed')
+            reader.shutdown(wait=False)
+    
+    def close(self):
+        """Cancel the frames of all streams and shut the thread pool down"""
+        self.scheduler.cancel_all()
+        self.executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,208 @@
+"""
+Cancellation Module - Deadlines and cancellation tokens for OCR calls
+
+Every recognition runs under a CancelToken. The token carries an optional
+deadline and can be cancelled from any thread; a running Tesseract process
+attached to it is killed immediately, so no CPU is spent on a frame whose
+result is no longer wanted.
+
+LatestFrameScheduler hands out one token per source (camera, stream, ...)
+and cancels the previous token of that source when a newer frame is
+scheduled:
+
+    token = scheduler.schedule('camera-0', timeout=2.0)
+    text = ocr_engine.extract_text(image, token=token)   # '' if superseded or too slow
+    scheduler.finish('camera-0', token)
+"""
+import threading
+import time
+
+
+class OCRCancelled(Exception):
+    """Recognition was aborted because its result is no longer needed"""
+
+
+class OCRTimeout(OCRCancelled):
+    """Recognition was aborted because its deadline passed"""
+
+
+class CancelToken:
+    """Deadline plus a thread-safe cancel flag for one unit of OCR work"""
+    
+    def __init__(self, timeout=None):
+        """
+        Args:
+            timeout (float): Seconds from now until the deadline (None: no deadline)
+        """
+        self.created = time.perf_counter()
+        self.deadline = self.created + timeout if timeout else None
+        self.reason = None
+        self._lock = threading.Lock()
+        self._processes = set()
+    
+    @property
+    def cancelled(self):
+        """True once cancel() was called"""
+        return self.reason is not None
+    
+    def expired(self):
+        """Check whether the deadline has passed"""
+        return self.deadline is not None and time.perf_counter() >= self.deadline
+    
+    def remaining(self):
+        """
+        Seconds left until the deadline
+        
+        Returns:
+            float: Remaining time (0.0 when expired), or None without a deadline
+        """
+        if self.deadline is None:
+            return None
+        return max(0.0, self.deadline - time.perf_counter())
+    
+    def cancel(self, reason='cancelled'):
+        """
+        Cancel the work and kill any attached Tesseract process
+        
+        Args:
+            reason (str): Why the work was cancelled (e.g. 'superseded')
+        """
+        with self._lock:
+            if self.reason is not None:
+                return
+            self.reason = reason
+            processes = list(self._processes)
+        for process in processes:
+            _kill(process)
+    
+    def check(self):
+        """
+        Raise if the work should not continue
+        
+        Raises:
+            OCRCancelled: The token was cancelled
+            OCRTimeout: The deadline has passed
+        """
+        if self.cancelled:
+            raise OCRCancelled(self.reason)
+        if self.expired():
+            raise OCRTimeout(f"deadline exceeded by {time.perf_counter() - self.deadline:.2f}s")
+    
+    def attach(self, process):
+        """
+        Register a running subprocess to be killed on cancel()
+        
+        Args:
+            process (subprocess.Popen): Tesseract process
+        """
+        with self._lock:
+            if self.reason is None:
+                self._processes.add(process)
+                return
+        _kill(process)  # Cancelled before the process was registered
+    
+    def detach(self, process):
+        """Unregister a finished subprocess"""
+        with self._lock:
+            self._processes.discard(process)
+
+
+def _kill(process):
+    """Kill a subprocess, ignoring processes that already exited"""
+    try:
+        process.kill()
+    except OSError:
+        pass
+
+
+class OCRMetrics:
+    """Thread-safe counters of completed, timed-out and cancelled OCR calls"""
+    
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.completed = 0
+        self.timed_out = 0
+        self.cancelled = 0
+        self.busy_seconds = 0.0    # Time spent in calls that produced a result
+        self.wasted_seconds = 0.0  # Time spent in calls that were aborted
+    
+    def record(self, outcome, seconds):
+        """
+        Count one call
+        
+        Args:
+            outcome (str): 'completed', 'timed_out' or 'cancelled'
+            seconds (float): Time the call took until it returned or was aborted
+        """
+        with self.lock:
+            setattr(self, outcome, getattr(self, outcome) + 1)
+            if outcome == 'completed':
+                self.busy_seconds += seconds
+            else:
+                self.wasted_seconds += seconds
+    
+    def snapshot(self):
+        """
+        Get the current counters
+        
+        Returns:
+            dict: Counts per outcome and busy/wasted seconds
+        """
+        with self.lock:
+            return {
+                'completed': self.completed,
+                'timed_out': self.timed_out,
+                'cancelled': self.cancelled,
+                'busy_seconds': round(self.busy_seconds, 3),
+                'wasted_seconds': round(self.wasted_seconds, 3),
+            }
+
+
+class LatestFrameScheduler:
+    """Keeps one live token per source; scheduling a newer frame cancels the older one"""
+    
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.tokens = {}       # source -> token of the newest frame
+        self.superseded = 0    # Tokens cancelled because a newer frame arrived
+    
+    def schedule(self, source='default', timeout=None):
+        """
+        Create the token for a new frame of a source
+        
+        Args:
+            source: Key of the frame source
+            timeout (float): Deadline in seconds for the new frame's OCR
+        
+        Returns:
+            CancelToken: Token to pass to the OCR calls of this frame
+        """
+        token = CancelToken(timeout)
+        with self.lock:
+            previous = self.tokens.get(source)
+            self.tokens[source] = token
+        if previous is not None and not previous.cancelled:
+            previous.cancel('superseded')
+            with self.lock:
+                self.superseded += 1
+        return token
+    
+    def finish(self, source, token):
+        """
+        Mark a frame's work as done
+        
+        Args:
+            source: Key of the frame source
+            token (CancelToken): Token returned by schedule()
+        """
+        with self.lock:
+            if self.tokens.get(source) is token:
+                del self.tokens[source]
+    
+    def cancel_all(self, reason='shutdown'):
+        """Cancel the in-flight work of every source"""
+        with self.lock:
+            tokens = list(self.tokens.values())
+            self.tokens.clear()
+        for token in tokens:
+            token.cancel(reason)
@@ -0,0 +1,30 @@
+"""
+Layout Module - Reading order of recognized word boxes
+
+Word boxes come back from Tesseract (or a montage) as a flat list. The
+exporters and the montage batcher need them as text lines in reading order.
+"""
+
+
+def group_lines(boxes):
+    """
+    Group word boxes into text lines by vertical overlap, in reading order
+    
+    Args:
+        boxes (list): (text, confidence, x, y, w, h) tuples
+    
+    Returns:
+        list: Lines, each a list of word boxes sorted left to right
+    """
+    lines = []
+    for box in sorted(boxes, key=lambda b: b[3] + b[5] / 2.0):
+        center = box[3] + box[5] / 2.0
+        if lines:
+            line = lines[-1]
+            top = min(b[3] for b in line)
+            bottom = max(b[3] + b[5] for b in line)
+            if top <= center <= bottom:
+                line.append(box)
+                continue
+        lines.append([box])
+    return [sorted(line, key=lambda b: b[2]) for line in lines]
@@ -0,0 +1,593 @@
+"""
+Lexicon Module - Word-frequency dictionary with a SymSpell-style deletion index
+
+The index is compiled once from a plain word-frequency list into a compact
+binary file and memory-mapped at startup, so loading is instant and the data
+is shared between processes. Lookups hash the deletions of the query words
+and binary-search the precomputed tables.
+
+Corrections are computed in batches with NumPy: the deletion variants of all
+words are generated and hashed as arrays, looked up with one searchsorted,
+and the (word, candidate) pairs are verified together with a bit-parallel
+edit distance (Hyyro's OSA variant of Myers' algorithm), one distance round
+at a time so words with a close match skip the large distance-2 candidate
+sets. Correcting the words of a page together is much faster than one word
+at a time (see tests/benchmark_lexicon.py).
+
+Build an index:
+    python -m ocr.lexicon build words_eng.txt lexicons/eng.lex
+"""
+import itertools
+import mmap
+import os
+import struct
+import sys
+from functools import lru_cache
+
+import numpy as np
+
+
+MAGIC = b'PVLX'
+VERSION = 2
+HEADER = struct.Struct('<4sIIIIII')  # magic, version, max_distance, prefix_length, n_words, n_deletes, n_postings
+MAX_WORD_LENGTH = 64  # Longer words are not indexed or corrected (one 64-bit mask per pattern)
+
+_MASK64 = 0xFFFFFFFFFFFFFFFF
+
+
+def _multipliers(count, seed=0x50564C58):
+    """Fixed odd 64-bit multipliers from SplitMix64 (must never change: they define the file format)"""
+    values = []
+    state = seed
+    for _ in range(count):
+        state = (state + 0x9E3779B97F4A7C15) & _MASK64
+        z = state
+        z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+        z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & _MASK64
+        values.append((z ^ (z >> 31)) | 1)
+    return np.array(values, dtype=np.uint64)
+
+
+# One multiplier per character position, the last one weights the length
+_POSITION_MULTIPLIERS = _multipliers(MAX_WORD_LENGTH + 1)
+
+
+def _code_matrix(words):
+    """
+    Zero-padded matrix of (code point + 1) per character
+    
+    Args:
+        words (list): Strings
+    
+    Returns:
+        tuple: (matrix: (n, longest) uint64, lengths: (n,) int64)
+    """
+    lengths = np.fromiter(map(len, words), dtype=np.int64, count=len(words))
+    width = int(lengths.max()) if len(words) else 0
+    flat = np.frombuffer(''.join(words).encode('utf-32-le'), dtype=np.uint32).astype(np.uint64) + np.uint64(1)
+    matrix = np.zeros((len(words), width), dtype=np.uint64)
+    matrix[np.arange(width) < lengths[:, None]] = flat
+    return matrix, lengths
+
+
+def _hash_rows(codes, lengths):
+    """
+    Stable 64-bit hash of each row of a code matrix (independent of PYTHONHASHSEED)
+    
+    Args:
+        codes (numpy.ndarray): (n, width) uint64 code points + 1, zero after the end of a row
+        lengths (numpy.ndarray): Characters per row
+    
+    Returns:
+        numpy.ndarray: (n,) uint64 hashes
+    """
+    hashes = (codes * _POSITION_MULTIPLIERS[:codes.shape[1]]).sum(axis=1, dtype=np.uint64)
+    hashes += np.asarray(lengths, dtype=np.uint64) * _POSITION_MULTIPLIERS[MAX_WORD_LENGTH]
+    # SplitMix64 finalizer spreads the weighted sum over all bits
+    hashes ^= hashes >> np.uint64(30)
+    hashes *= np.uint64(0xBF58476D1CE4E5B9)
+    hashes ^= hashes >> np.uint64(27)
+    hashes *= np.uint64(0x94D049BB133111EB)
+    hashes ^= hashes >> np.uint64(31)
+    return hashes
+
+
+def _char_masks(codes):
+    """
+    64-bit set of the characters of each row (bit = code point mod 64)
+    
+    Every character present in one word but missing from the other needs an
+    edit, so the popcount of the difference of two masks is a lower bound of
+    the edit distance (bit collisions only loosen it).
+    
+    Args:
+        codes (numpy.ndarray): (n, width) code matrix from _code_matrix()
+    
+    Returns:
+        numpy.ndarray: (n,) uint64 masks
+    """
+    bits = np.left_shift(np.uint64(1), (codes - np.uint64(1)) % np.uint64(64))
+    return np.bitwise_or.reduce(np.where(codes > 0, bits, np.uint64(0)), axis=1)
+
+
+_BYTE_POPCOUNT = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+
+def _popcount(values):
+    """Set bits per uint64 (np.bitwise_count needs NumPy 2)"""
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(values)
+    return _BYTE_POPCOUNT[np.ascontiguousarray(values).view(np.uint8)].reshape(-1, 8).sum(axis=1)
+
+
+def _unique(values):
+    """Sorted unique values (sort-based; faster than np.unique for the integer arrays used here)"""
+    values = np.sort(values, axis=None)
+    keep = np.ones(len(values), dtype=bool)
+    keep[1:] = values[1:] != values[:-1]
+    return values[keep]
+
+
+@lru_cache(maxsize=None)
+def _kept_positions(length, deletions):
+    """(variants, length - deletions) indexes of the characters kept by each way to delete characters"""
+    return np.array(list(itertools.combinations(range(length), length - deletions)), dtype=np.intp)
+
+
+def _delete_hashes(words, max_distance):
+    """
+    Hash the strings reachable from each word by deleting up to max_distance characters
+    
+    At least one character is always kept. Variants repeat when a word has
+    repeated letters; callers deduplicate the resulting postings.
+    
+    Args:
+        words (list): Input words (non-empty, at most MAX_WORD_LENGTH characters)
+        max_distance (int): Maximum number of deletions
+    
+    Returns:
+        tuple: (word index per hash, deletions per hash, hashes) as NumPy arrays
+    """
+    matrix, lengths = _code_matrix(words)
+    rows, levels, hashes = [], [], []
+    for length in _unique(lengths).tolist():
+        group = np.flatnonzero(lengths == length)
+        codes = matrix[group, :length]
+        for deletions in range(min(max_distance, length - 1) + 1):
+            kept = _kept_positions(length, deletions)
+            variants = codes[:, kept].reshape(-1, length - deletions)
+            hashes.append(_hash_rows(variants, np.full(len(variants), length - deletions)))
+            rows.append(np.repeat(group, len(kept)))
+            levels.append(np.full(len(variants), deletions, dtype=np.uint8))
+    if not rows:
+        return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.uint8), np.empty(0, dtype=np.uint64)
+    return np.concatenate(rows), np.concatenate(levels), np.concatenate(hashes)
+
+
+def osa_distances(patterns, pattern_lengths, texts, text_lengths, pattern_index=None):
+    """
+    Optimal string alignment distances of many (pattern, text) pairs at once
+    
+    Bit-parallel (one uint64 column state per pair) and vectorized over the
+    pairs; the loop runs once per text position.
+    
+    Args:
+        patterns (numpy.ndarray): (k, m) code matrix, m <= MAX_WORD_LENGTH
+        pattern_lengths (numpy.ndarray): (k,) pattern lengths (at least 1)
+        texts (numpy.ndarray): (p, n) code matrix, one text per pair
+        text_lengths (numpy.ndarray): (p,) text lengths
+        pattern_index (numpy.ndarray): (p,) pattern row of each pair (default: row i for pair i)
+    
+    Returns:
+        numpy.ndarray: (p,) int64 distances
+    """
+    pattern_lengths = np.asarray(pattern_lengths, dtype=np.int64)
+    if pattern_index is None:
+        pattern_index = np.arange(len(texts))
+    pairs = len(texts)
+    distances = pattern_lengths[pattern_index].copy()
+    if not pairs:
+        return distances
+    
+    # Dense alphabet (id 0 is the padding value 0) and the match mask of every pattern character
+    alphabet = _unique(np.concatenate([patterns.ravel(), texts.ravel(), np.zeros(1, dtype=patterns.dtype)]))
+    pattern_ids = np.searchsorted(alphabet, patterns)
+    text_ids = np.searchsorted(alphabet, texts)
+    match = np.zeros((len(patterns), len(alphabet)), dtype=np.uint64)
+    pattern_rows = np.arange(len(patterns))
+    for i in range(patterns.shape[1]):
+        match[pattern_rows, pattern_ids[:, i]] |= np.uint64(1 << i)
+    match[:, 0] = 0
+    
+    one = np.uint64(1)
+    top = np.left_shift(one, pattern_lengths[pattern_index].astype(np.uint64) - one)
+    vp = np.full(pairs, _MASK64, dtype=np.uint64)
+    vn = np.zeros(pairs, dtype=np.uint64)
+    d0 = np.zeros(pairs, dtype=np.uint64)
+    previous = np.zeros(pairs, dtype=np.uint64)
+    for j in range(texts.shape[1]):
+        eq = match[pattern_index, text_ids[:, j]]
+        transposed = ((~d0 & eq) << one) & previous
+        d0 = (((eq & vp) + vp) ^ vp) | eq | vn | transposed
+        hp = vn | ~(d0 | vp)
+        hn = d0 & vp
+        active = j < text_lengths
+        distances += ((hp & top) != 0) & active
+        distances -= ((hn & top) != 0) & active
+        hp = (hp << one) | one
+        vp = (hn << one) | ~(d0 | hp)
+        vn = hp & d0
+        previous = eq
+    return distances
+
+
+def edit_distance(a, b, max_distance):
+    """
+    Optimal string alignment (Damerau-Levenshtein) distance with early exit
+    
+    Args:
+        a (str): First string
+        b (str): Second string
+        max_distance (int): Stop and return max_distance + 1 once exceeded
+    
+    Returns:
+        int: Edit distance, or max_distance + 1 if it is larger than max_distance
+    """
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+    
+    # Common prefixes and suffixes never contribute edits
+    start = 0
+    while start < len(a) and start < len(b) and a[start] == b[start]:
+        start += 1
+    end_a, end_b = len(a), len(b)
+    while end_a > start and end_b > start and a[end_a - 1] == b[end_b - 1]:
+        end_a -= 1
+        end_b -= 1
+    a, b = a[start:end_a], b[start:end_b]
+    if not a or not b:
+        distance = max(len(a), len(b))
+        return distance if distance <= max_distance else max_distance + 1
+    
+    previous2 = None
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        char_a = a[i - 1]
+        current = [i] + [0] * len(b)
+        row_min = i
+        for j in range(1, len(b) + 1):
+            value = previous[j - 1] if char_a == b[j - 1] else previous[j - 1] + 1
+            if previous[j] + 1 < value:
+                value = previous[j] + 1
+            if current[j - 1] + 1 < value:
+                value = current[j - 1] + 1
+            if (previous2 is not None and j > 1 and char_a == b[j - 2]
+                    and a[i - 2] == b[j - 1] and previous2[j - 2] + 1 < value):
+                value = previous2[j - 2] + 1
+            current[j] = value
+            if value < row_min:
+                row_min = value
+        if row_min > max_distance:
+            return max_distance + 1
+        previous2, previous = previous, current
+    return previous[-1] if previous[-1] <= max_distance else max_distance + 1
+
+
+
+def _group_ranks(groups):
+    """Position of each element within its run of equal values in a sorted array"""
+    if not len(groups):
+        return np.empty(0, dtype=np.int64)
+    starts = np.ones(len(groups), dtype=bool)
+    starts[1:] = groups[1:] != groups[:-1]
+    positions = np.arange(len(groups))
+    return positions - np.maximum.accumulate(np.where(starts, positions, 0))
+
+
+def _align(offset, alignment=8):
+    """Round offset up to the next multiple of alignment"""
+    return (offset + alignment - 1) // alignment * alignment
+
+
+class Lexicon:
+    """Memory-mapped word-frequency lexicon with batched spelling correction"""
+    
+    def __init__(self, path, cache_size=65536):
+        """
+        Open a compiled lexicon index
+        
+        Args:
+            path (str): Path to a .lex file produced by Lexicon.build()
+            cache_size (int): Corrections remembered (repeated words are common in OCR output)
+        """
+        self.path = path
+        self._file = open(path, 'rb')
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        
+        magic, version, max_distance, prefix_length, n_words, n_deletes, n_postings = \
+            HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a PageVision lexicon (version {VERSION}); rebuild it with "
+                             f"python -m ocr.lexicon build")
+        
+        self.max_distance = max_distance
+        self.prefix_length = prefix_length
+        self.word_count = n_words
+        
+        # Section layout mirrors build(); every array is a zero-copy view into the map
+        offset = _align(HEADER.size)
+        self._word_hashes, offset = self._view(offset, np.uint64, n_words)
+        self._word_hash_ids, offset = self._view(offset, np.uint32, n_words)
+        self._delete_hashes, offset = self._view(offset, np.uint64, n_deletes)
+        self._delete_starts, offset = self._view(offset, np.uint32, n_deletes + 1)
+        self._postings, offset = self._view(offset, np.uint32, n_postings)
+        self._posting_levels, offset = self._view(offset, np.uint8, n_postings)
+        self._frequencies, offset = self._view(offset, np.uint32, n_words)
+        self._word_offsets, offset = self._view(offset, np.uint32, n_words + 1)
+        self._word_masks, offset = self._view(offset, np.uint64, n_words)
+        self._word_codes, offset = self._view(offset, np.uint32, int(self._word_offsets[-1]))
+        
+        # Word ids by descending frequency (then id), and the rank of every id
+        self._by_frequency = np.lexsort((np.arange(n_words), -self._frequencies.astype(np.int64)))
+        self._frequency_ranks = np.empty(n_words, dtype=np.int64)
+        self._frequency_ranks[self._by_frequency] = np.arange(n_words)
+        
+        self.cache_size = cache_size
+        self._cache = {}  # (word, max_distance) -> (suggestion, distance)
+    
+    def _view(self, offset, dtype, count):
+        """Create a NumPy view of one section and return it with the next aligned offset"""
+        array = np.frombuffer(self._map, dtype=dtype, count=count, offset=offset)
+        return array, _align(offset + array.nbytes)
+    
+    def word(self, word_id):
+        """Get the word stored under an id"""
+        start, end = int(self._word_offsets[word_id]), int(self._word_offsets[word_id + 1])
+        return self._word_codes[start:end].tobytes().decode('utf-32-le')
+    
+    def frequency(self, word_id):
+        """Get the corpus frequency of a word id"""
+        return int(self._frequencies[word_id])
+    
+    def word_id(self, word):
+        """
+        Look up the id of an exact (case-insensitive) word
+        
+        Args:
+            word (str): Word to look up
+        
+        Returns:
+            int: Word id, or -1 if the word is not in the lexicon
+        """
+        word = word.lower()
+        if not word or len(word) > MAX_WORD_LENGTH or not self.word_count:
+            return -1
+        codes, lengths = _code_matrix([word])
+        key = _hash_rows(codes, lengths)[0]
+        index = int(np.searchsorted(self._word_hashes, key))
+        if index >= len(self._word_hashes) or self._word_hashes[index] != key:
+            return -1
+        word_id = int(self._word_hash_ids[index])
+        return word_id if self.word(word_id) == word else -1
+    
+    def __contains__(self, word):
+        return self.word_id(word) >= 0
+    
+    def __len__(self):
+        return self.word_count
+    
+    def correct(self, word, max_distance=None):
+        """
+        Find the most frequent lexicon word within max_distance edits
+        
+        Args:
+            word (str): Possibly misspelled word
+            max_distance (int): Edit distance limit (defaults to the index maximum)
+        
+        Returns:
+            tuple: (suggestion: str or None, distance: int)
+        """
+        return self.correct_many([word], max_distance)[0]
+    
+    def correct_many(self, words, max_distance=None):
+        """
+        Correct a batch of words (e.g. all low-confidence words of a page) at once
+        
+        Args:
+            words (list): Possibly misspelled words
+            max_distance (int): Edit distance limit (defaults to the index maximum)
+        
+        Returns:
+            list: (suggestion: str or None, distance: int) per word, in input order
+        """
+        if max_distance is None or max_distance > self.max_distance:
+            max_distance = self.max_distance
+        words = [word.lower() for word in words]
+        
+        pending = list(dict.fromkeys(word for word in words if (word, max_distance) not in self._cache))
+        if pending:
+            if len(self._cache) + len(pending) > self.cache_size:
+                self._cache.clear()
+            for word, result in zip(pending, self._lookup(pending, max_distance)):
+                self._cache[(word, max_distance)] = result
+        return [self._cache[(word, max_distance)] for word in words]
+    
+    def _lookup(self, words, max_distance):
+        """
+        Uncached batch correction of unique lowercase words
+        
+        A word within k edits of a lexicon word shares a deletion variant with it
+        after at most k deletions on each side. Round k therefore only verifies
+        pairs reached that way, for words without a closer match from an earlier
+        round, so most words never reach the large distance-2 candidate sets. Inside
+        a round every remaining candidate is at least k edits away, and they are
+        verified in descending frequency so the first match settles the word.
+        """
+        results = [(None, max_distance + 1)] * len(words)
+        queries = [i for i, word in enumerate(words) if 0 < len(word) <= MAX_WORD_LENGTH]
+        if not queries or not len(self._delete_hashes):
+            return results
+        query_words = [words[i] for i in queries]
+        patterns, pattern_lengths = _code_matrix(query_words)
+        query_masks = _char_masks(patterns)
+        
+        # All deletion variants of all words, looked up with one binary search
+        # (sorted keys keep the search cache friendly)
+        variant_rows, variant_levels, keys = _delete_hashes(
+            [word[:self.prefix_length] for word in query_words], max_distance)
+        order = np.argsort(keys)
+        index = np.empty(len(keys), dtype=np.int64)
+        index[order] = np.searchsorted(self._delete_hashes, keys[order])
+        index = np.minimum(index, len(self._delete_hashes) - 1)
+        hit = self._delete_hashes[index] == keys
+        variant_rows, variant_levels, index = variant_rows[hit], variant_levels[hit], index[hit]
+        
+        best = np.full(len(query_words), -1, dtype=np.int64)
+        distances = np.full(len(query_words), max_distance + 1, dtype=np.int64)
+        for k in range(max_distance + 1):
+            # Pairs reached with at most k deletions on each side, for unresolved words
+            selected = (variant_levels <= k) & (best[variant_rows] < 0)
+            if not selected.any():
+                continue
+            starts = self._delete_starts[index[selected]].astype(np.int64)
+            counts = self._delete_starts[index[selected] + 1].astype(np.int64) - starts
+            positions = np.repeat(starts - np.cumsum(counts) + counts, counts) + np.arange(int(counts.sum()))
+            reached = self._posting_levels[positions] <= k
+            rows = np.repeat(variant_rows[selected], counts)[reached]
+            candidates = self._postings[positions[reached]].astype(np.int64)
+            
+            # Cheap lower bounds (length and character set differences) on the distance
+            candidate_lengths = self._word_offsets[candidates + 1].astype(np.int64) - self._word_offsets[candidates]
+            keep = np.abs(candidate_lengths - pattern_lengths[rows]) <= k
+            rows, candidates = rows[keep], candidates[keep]
+            masks, candidate_masks = query_masks[rows], self._word_masks[candidates]
+            keep = (_popcount(masks & ~candidate_masks) <= k) & (_popcount(candidate_masks & ~masks) <= k)
+            
+            # Unique pairs ordered by (word, descending frequency, id)
+            pairs = _unique(rows[keep] * self.word_count + self._frequency_ranks[candidates[keep]])
+            rows, candidates = pairs // self.word_count, self._by_frequency[pairs % self.word_count]
+            
+            # Candidates are at least k edits away, so the most frequent one at
+            # distance k wins; try the few most frequent ones of every word first
+            ranks = _group_ranks(rows)
+            for chunk in (np.flatnonzero(ranks < 8), np.flatnonzero(ranks >= 8)):
+                chunk = chunk[best[rows[chunk]] < 0]
+                if not len(chunk):
+                    continue
+                chunk = chunk[self._distances(query_words, patterns, pattern_lengths,
+                                              rows[chunk], candidates[chunk], k) <= k]
+                first = np.ones(len(chunk), dtype=bool)
+                first[1:] = rows[chunk[1:]] != rows[chunk[:-1]]
+                chunk = chunk[first]
+                best[rows[chunk]] = candidates[chunk]
+                distances[rows[chunk]] = k
+        
+        for row in np.flatnonzero(best >= 0).tolist():
+            results[queries[row]] = (self.word(int(best[row])), int(distances[row]))
+        return results
+    
+    def _distances(self, query_words, patterns, pattern_lengths, rows, candidates, max_distance):
+        """Distances between query rows and candidate word ids (exact up to max_distance)"""
+        if len(rows) < 16:
+            # Setting up the vectorized pass costs more than a few scalar comparisons
+            return np.array([edit_distance(query_words[row], self.word(candidate), max_distance)
+                             for row, candidate in zip(rows.tolist(), candidates.tolist())], dtype=np.int64)
+        candidate_starts = self._word_offsets[candidates].astype(np.int64)
+        candidate_lengths = self._word_offsets[candidates + 1].astype(np.int64) - candidate_starts
+        columns = np.arange(int(candidate_lengths.max()))
+        inside = columns < candidate_lengths[:, None]
+        gather = np.where(inside, candidate_starts[:, None] + columns, 0)
+        texts = np.where(inside, self._word_codes[gather].astype(np.uint64) + np.uint64(1), np.uint64(0))
+        return osa_distances(patterns, pattern_lengths, texts, candidate_lengths, pattern_index=rows)
+    
+    def close(self):
+        """Release the memory map"""
+        self._cache.clear()
+        # Drop the views before closing the map they point into
+        self._word_hashes = self._word_hash_ids = self._delete_hashes = None
+        self._delete_starts = self._postings = self._posting_levels = self._frequencies = None
+        self._word_offsets = self._word_masks = self._word_codes = None
+        self._map.close()
+        self._file.close()
+    
+    @staticmethod
+    def build(wordlist_path, index_path, max_distance=2, prefix_length=7, min_frequency=1):
+        """
+        Compile a word-frequency list into a memory-mappable index file
+        
+        Args:
+            wordlist_path (str): Text file with one "word [count]" entry per line
+            index_path (str): Output .lex path
+            max_distance (int): Maximum edit distance supported by lookups
+            prefix_length (int): Only deletions of this many leading characters are indexed
+            min_frequency (int): Skip words rarer than this
+        
+        Returns:
+            int: Number of words in the index
+        """
+        frequencies = {}
+        with open(wordlist_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                parts = line.split()
+                if not parts or len(parts[0]) > MAX_WORD_LENGTH:
+                    continue
+                word = parts[0].lower()
+                count = int(parts[1]) if len(parts) > 1 and parts[1].isdigit() else 1
+                if count >= min_frequency:
+                    frequencies[word] = frequencies.get(word, 0) + count
+        
+        words = sorted(frequencies)
+        codes, lengths = _code_matrix(words)
+        word_hashes = _hash_rows(codes, lengths)
+        word_order = np.argsort(word_hashes, kind='stable')
+        
+        # Posting lists: word ids per deletion hash, without repeats, each with the
+        # fewest deletions that reach the hash
+        word_ids, levels, delete_hashes = _delete_hashes([word[:prefix_length] for word in words], max_distance)
+        order = np.lexsort((levels, word_ids, delete_hashes))
+        word_ids, levels, delete_hashes = word_ids[order], levels[order], delete_hashes[order]
+        unique = np.ones(len(order), dtype=bool)
+        unique[1:] = (delete_hashes[1:] != delete_hashes[:-1]) | (word_ids[1:] != word_ids[:-1])
+        word_ids, levels, delete_hashes = word_ids[unique], levels[unique], delete_hashes[unique]
+        first = np.ones(len(delete_hashes), dtype=bool)
+        first[1:] = delete_hashes[1:] != delete_hashes[:-1]
+        delete_keys = delete_hashes[first]
+        delete_starts = np.append(np.flatnonzero(first), len(delete_hashes)).astype(np.uint32)
+        
+        word_offsets = np.zeros(len(words) + 1, dtype=np.uint32)
+        word_offsets[1:] = np.cumsum(lengths)
+        
+        sections = [
+            word_hashes[word_order],
+            word_order.astype(np.uint32),
+            delete_keys,
+            delete_starts,
+            word_ids.astype(np.uint32),
+            levels,
+            np.array([min(frequencies[w], 0xFFFFFFFF) for w in words], dtype=np.uint32),
+            word_offsets,
+            _char_masks(codes),
+            np.frombuffer(''.join(words).encode('utf-32-le'), dtype=np.uint32),
+        ]
+        
+        directory = os.path.dirname(index_path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        
+        with open(index_path, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, VERSION, max_distance, prefix_length,
+                                len(words), len(delete_keys), len(word_ids)))
+            for section in sections:
+                f.write(b'\0' * (_align(f.tell()) - f.tell()))
+                f.write(section.tobytes())
+            f.write(b'\0' * (_align(f.tell()) - f.tell()))
+        
+        print(f"✓ Lexicon built: {len(words)} words, {len(delete_keys)} deletes -> {index_path}")
+        return len(words)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) >= 4 and sys.argv[1] == 'build':
+        Lexicon.build(sys.argv[2], sys.argv[3])
+    else:
+        print("Usage: python -m ocr.lexicon build <wordlist.txt> <output.lex>")
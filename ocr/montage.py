@@ -0,0 +1,192 @@
+"""
+Montage Module - Recognize many small text regions with one Tesseract call
+
+Every Tesseract call pays a fixed cost (process start, model load, layout
+analysis) that dominates when the regions are small, e.g. labels or several
+cards in view. MontageBatcher packs the regions into one image, separated by
+blank gutters wide enough that Tesseract never joins words of neighbouring
+regions, recognizes it once in sparse-text mode and maps every word box back
+to its source region (and frame) by its position in the montage. A region
+that does not fit into max_width x max_height with its gutters is not shrunk
+(its text would get too small to read) but recognized alone, in a montage of
+its own size.
+
+Usage:
+    batcher = MontageBatcher(ocr_engine)
+    regions = crop_regions(binary, text_rects, key_prefix=frame_id)
+    for key, (text, boxes) in batcher.recognize(regions).items():
+        ...   # key = (frame_id, index); boxes are in frame coordinates
+"""
+import cv2
+import numpy as np
+
+from .layout import group_lines
+
+
+def crop_regions(image, rects, key_prefix=None):
+    """
+    Cut text regions out of an image
+    
+    Args:
+        image (numpy.ndarray): Preprocessed (binary) image
+        rects (list): (x, y, w, h) rectangles
+        key_prefix: Identifies the image, e.g. a frame number; keys become (key_prefix, index)
+    
+    Returns:
+        list: (key, region image, (x, y) offset) tuples for MontageBatcher.recognize
+    """
+    regions = []
+    for index, (x, y, w, h) in enumerate(rects):
+        crop = image[y:y + h, x:x + w]
+        if crop.size:
+            regions.append(((key_prefix, index), crop, (x, y)))
+    return regions
+
+
+class MontageBatcher:
+    """Packs small regions into montage images and recognizes them in one call each"""
+    
+    def __init__(self, ocr_engine, max_width=2400, max_height=2400, gutter=24, min_height=32, psm=11):
+        """
+        Initialize the batcher
+        
+        Args:
+            ocr_engine (OCREngine): Engine used for recognition (its language and variables apply)
+            max_width (int): Montage width limit in pixels
+            max_height (int): Montage height limit; more regions start another montage
+            gutter (int): Blank space around every region; keeps words of different regions apart
+            min_height (int): Regions lower than this are upscaled (tiny text recognizes badly)
+            psm (int): Page segmentation mode for montages (11: sparse text, no reading order assumed)
+        """
+        self.ocr_engine = ocr_engine
+        self.max_width = max_width
+        self.max_height = max_height
+        self.gutter = gutter
+        self.min_height = min_height
+        self.psm = psm
+        
+        # Statistics
+        self.montages = 0
+        self.regions = 0
+        self.words = 0
+    
+    def _config(self):
+        """The engine's configuration with the montage page segmentation mode"""
+        return self.ocr_engine.build_config(psm=self.psm)
+    
+    def _normalize(self, image):
+        """Grayscale region scaled to at least min_height; returns (image, scale)"""
+        if image.ndim == 3:
+            image = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        scale = 1.0
+        if image.shape[0] < self.min_height:
+            scale = self.min_height / image.shape[0]
+            image = cv2.resize(image, None, fx=scale, fy=scale, interpolation=cv2.INTER_CUBIC)
+        return image, scale
+    
+    def pack(self, regions):
+        """
+        Lay regions out on shelves (rows), tallest first
+        
+        Regions larger than max_width x max_height (gutters included) each get
+        a montage of their own, which exceeds the limits.
+        
+        Args:
+            regions (list): (key, region image, offset) tuples
+        
+        Returns:
+            list: Montages, each a (image, placements) pair; placements are
+                  (key, x, y, w, h, scale, offset) with x/y/w/h in montage pixels
+        """
+        items = []
+        for key, image, offset in regions:
+            normalized, scale = self._normalize(image)
+            items.append((key, normalized, scale, offset))
+        items.sort(key=lambda item: item[1].shape[0], reverse=True)
+        
+        montages = []
+        alone = []            # Montages of single oversize regions
+        layout = []           # Placements of the montage being filled
+        x = y = shelf_height = 0
+        width = 0
+        for key, image, scale, offset in items:
+            h, w = image.shape[:2]
+            cell_w, cell_h = w + 2 * self.gutter, h + 2 * self.gutter
+            if cell_w > self.max_width or cell_h > self.max_height:
+                alone.append(self._render([(key, image, self.gutter, self.gutter, scale, offset)], cell_w, cell_h))
+                continue
+            if x and x + cell_w > self.max_width:
+                # Next shelf
+                y += shelf_height
+                x = shelf_height = 0
+            if layout and y + cell_h > self.max_height:
+                montages.append(self._render(layout, width, y + shelf_height))
+                layout = []
+                x = y = shelf_height = width = 0
+            layout.append((key, image, x + self.gutter, y + self.gutter, scale, offset))
+            x += cell_w
+            width = max(width, x)
+            shelf_height = max(shelf_height, cell_h)
+        if layout:
+            montages.append(self._render(layout, width, y + shelf_height))
+        return montages + alone
+    
+    def _render(self, layout, width, height):
+        """Paint the placed regions onto a white canvas"""
+        canvas = np.full((height, width), 255, dtype=np.uint8)
+        placements = []
+        for key, image, x, y, scale, offset in layout:
+            h, w = image.shape[:2]
+            canvas[y:y + h, x:x + w] = image
+            placements.append((key, x, y, w, h, scale, offset))
+        return canvas, placements
+    
+    def recognize(self, regions, token=None):
+        """
+        Recognize all regions with one OCR call per montage
+        
+        Args:
+            regions (list): (key, region image, (x, y) offset) tuples, e.g. from crop_regions()
+            token (CancelToken): Deadline/cancellation shared by all montages
+        
+        Returns:
+            dict: key -> (text, boxes); boxes are (text, confidence, x, y, w, h) in the
+                  coordinates of the image the region was cut from (region + offset)
+        """
+        results = {key: ("", []) for key, _, _ in regions}
+        config = self._config()
+        for montage, placements in self.pack(regions):
+            boxes = self.ocr_engine.extract_text_with_boxes(montage, token=token, config=config)
+            self.montages += 1
+            self.regions += len(placements)
+            self.words += len(boxes)
+            
+            assigned = {placement[0]: [] for placement in placements}
+            for box in boxes:
+                placement = self._locate(box, placements)
+                if placement is not None:
+                    assigned[placement[0]].append(self._to_source(box, placement))
+            
+            for key, region_boxes in assigned.items():
+                lines = group_lines(region_boxes)
+                text = '\n'.join(' '.join(box[0] for box in line) for line in lines)
+                results[key] = (self.ocr_engine.clean_text(text), region_boxes)
+        return results
+    
+    def _locate(self, box, placements):
+        """Placement whose area contains the centre of a montage word box"""
+        _, _, x, y, w, h = box
+        cx, cy = x + w / 2.0, y + h / 2.0
+        for placement in placements:
+            _, px, py, pw, ph, _, _ = placement
+            if px <= cx < px + pw and py <= cy < py + ph:
+                return placement
+        return None
+    
+    def _to_source(self, box, placement):
+        """Map a montage word box to the coordinates of the region's source image"""
+        text, confidence, x, y, w, h = box
+        _, px, py, _, _, scale, (ox, oy) = placement
+        return (text, confidence,
+                int(round((x - px) / scale)) + ox, int(round((y - py) / scale)) + oy,
+                max(1, int(round(w / scale))), max(1, int(round(h / scale))))
@@ -1,27 +1,44 @@
 """
 OCR Engine Module - Text extraction using Tesseract OCR
 """
-import pytesseract
+import json
+import os
+import time
 import cv2
-import numpy as np
+from contextlib import contextmanager
 from datetime import datetime
+from .lexicon import Lexicon
+from .recognizer import TesseractRecognizer, load_tesseract, DEFAULT_TESSERACT_CMD
+from .cancellation import CancelToken, OCRCancelled, OCRTimeout, OCRMetrics
+from .montage import MontageBatcher, crop_regions
+from utils.performance_profiles import check_section
+
+# Punctuation stripped from word edges before dictionary lookups
+WORD_PUNCTUATION = '.,!?;:-()[]"\''
 
 
 class OCREngine:
     """Handles OCR operations using Tesseract"""
     
-    def __init__(self, language='eng', confidence_threshold=30):
+    def __init__(self, language='eng', confidence_threshold=30, lazy=False, pool=None,
+                 tesseract_cmd=DEFAULT_TESSERACT_CMD):
         """
         Initialize OCR engine
         
         Args:
             language (str): Language code for OCR ('eng' for English, 'nep' for Nepali)
             confidence_threshold (int): Minimum confidence score to accept text (0-100)
+            lazy (bool): Defer importing and configuring pytesseract until
+                warm_up() is called or the first recognition happens
+            pool (EnginePool): Shared pool of recognizers; when given, every recognition
+                borrows an engine from the pool and this instance only keeps stream state
+            tesseract_cmd (str): Path of the tesseract binary (without a pool)
         """
         self.language = language
         self.confidence_threshold = confidence_threshold
         self.last_text = ""
         self.last_detection_time = None
+        self.seen_texts = None  # Optional NearDuplicateIndex: also reject texts seen earlier in the session
         
         # Stability tracking - text must appear in multiple consecutive frames
         self.text_buffer = []  # Store recent text detections
@@ -33,65 +50,217 @@ class OCREngine:
         self.min_word_length = 2  # Minimum length for a word to be valid
         self.min_words = 1  # Minimum number of words required
         
-        # Configure Tesseract path (uncomment and modify if needed)
-        pytesseract.pytesseract.tesseract_cmd = r'C:\Program Files\Tesseract-OCR\tesseract.exe'
+        # Dictionary-backed post-correction (optional, see ocr/lexicon.py)
+        self.lexicon = None
+        self.lexicon_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'lexicons')
+        self.correction_confidence = 60  # Words recognized below this confidence get corrected
+        self.min_lexicon_ratio = 0.3     # Share of words that must be dictionary words
+        self.load_lexicon()
+        
+        # Recognition backend: stateless, so it may be shared (see ocr/recognizer.py)
+        self.pool = pool
+        self.recognizer = None if pool is not None else TesseractRecognizer(tesseract_cmd)
+        
+        # Deadline per recognition call when the caller passes no token, so a
+        # pathological frame cannot block the loop; outcomes are counted in metrics
+        self.ocr_timeout = 5.0
+        self.metrics = OCRMetrics()
+        
+        # Tesseract configuration for better accuracy (per stream, passed on every call);
+        # a tuning file written by autotune.py can replace these settings (see load_tuning)
+        self.oem = 3                  # OCR engine mode (1: LSTM only, 3: default)
+        self.psm = 6                  # Page segmentation mode (6: single uniform block of text)
+        self.tesseract_variables = {}  # Extra -c variables, e.g. {'load_system_dawg': '0'}
+        self.input_scale = 1.0        # Resize factor applied to images before recognition
+        self.config = self.build_config()
+        self.montage = None           # Batches detected regions (see extract_regions)
+        
+        if not lazy:
+            load_tesseract(tesseract_cmd)  # Configured once per process, not per instance
+    
+    @contextmanager
+    def _engine(self, token):
+        """Borrow a recognizer from the pool, or use this engine's own one"""
+        if self.pool is None:
+            yield self.recognizer
+            return
+        try:
+            engine = self.pool.checkout(token.remaining())
+        except TimeoutError:
+            raise OCRTimeout("no OCR engine free before the deadline") from None
+        try:
+            yield engine
+        finally:
+            self.pool.checkin(engine)
+    
+    def _recognize(self, call, token):
+        """
+        Run one recognition under a deadline/cancellation token and record its outcome
         
-        # Tesseract configuration for better accuracy
-        self.config = f'--oem 3 --psm 6 -l {self.language}'
+        Args:
+            call (callable): (engine, token) -> result
+            token (CancelToken): Caller's token, or None for a fresh one with ocr_timeout
         
-    def extract_text(self, image):
+        Returns:
+            Result of call
+        
+        Raises:
+            OCRCancelled: The token was cancelled (e.g. a newer frame was scheduled)
+            OCRTimeout: The deadline passed
+        """
+        token = token or CancelToken(self.ocr_timeout)
+        started = time.perf_counter()
+        try:
+            token.check()
+            with self._engine(token) as engine:
+                result = call(engine, token)
+        except OCRTimeout:
+            self.metrics.record('timed_out', time.perf_counter() - started)
+            raise
+        except OCRCancelled:
+            self.metrics.record('cancelled', time.perf_counter() - started)
+            raise
+        self.metrics.record('completed', time.perf_counter() - started)
+        return result
+    
+    def is_ready(self):
+        """Check whether warm_up() has completed"""
+        if self.pool is not None:
+            return self.pool.is_ready()
+        return self.recognizer.warmed_up
+    
+    def warm_up(self):
+        """
+        Configure Tesseract and run a tiny recognition so that the binary
+        and language data are loaded before the first real frame arrives
+        Safe to call from a background thread
+        """
+        if self.pool is not None:
+            self.pool.warm_up(self.config)
+        else:
+            self.recognizer.warm_up(self.config)
+    
+    def _scale_input(self, image):
+        """Resize the image by input_scale before recognition"""
+        if self.input_scale == 1.0:
+            return image
+        interpolation = cv2.INTER_AREA if self.input_scale < 1.0 else cv2.INTER_CUBIC
+        return cv2.resize(image, None, fx=self.input_scale, fy=self.input_scale, interpolation=interpolation)
+    
+    def extract_text(self, image, token=None):
         """
         Extract text from preprocessed image
         
         Args:
             image (numpy.ndarray): Preprocessed binary image
+            token (CancelToken): Deadline/cancellation of this frame (default: ocr_timeout)
             
         Returns:
-            str: Extracted text (cleaned)
+            str: Extracted text (cleaned), '' when cancelled or timed out
         """
         try:
             # Perform OCR
-            text = pytesseract.image_to_string(image, config=self.config)
+            image = self._scale_input(image)
+            text = self._recognize(lambda engine, token: engine.image_to_string(image, self.config, token), token)
             
             # Clean the extracted text
             text = self.clean_text(text)
             
             return text
+        except OCRTimeout as e:
+            print(f"⚠ OCR timed out: {e}")
+            return ""
+        except OCRCancelled:
+            return ""
         except Exception as e:
             print(f"✗ OCR Error: {e}")
             return ""
     
-    def extract_text_with_boxes(self, image):
+    def extract_text_with_boxes(self, image, token=None, config=None):
         """
         Extract text along with bounding box coordinates
         
         Args:
             image (numpy.ndarray): Preprocessed image
+            token (CancelToken): Deadline/cancellation of this frame (default: ocr_timeout)
+            config (list): Tesseract configuration for this call only (default: self.config)
             
         Returns:
-            list: List of tuples containing (text, confidence, x, y, w, h)
+            list: List of tuples containing (text, confidence, x, y, w, h), [] when cancelled or timed out
         """
         try:
-            # Get detailed OCR data including bounding boxes
-            data = pytesseract.image_to_data(image, config=self.config, output_type=pytesseract.Output.DICT)
-            
-            boxes = []
-            n_boxes = len(data['text'])
-            
-            for i in range(n_boxes):
-                # Filter by confidence threshold
-                confidence = int(data['conf'][i])
-                text = data['text'][i].strip()
-                
-                if confidence > self.confidence_threshold and text:
-                    x, y, w, h = data['left'][i], data['top'][i], data['width'][i], data['height'][i]
-                    boxes.append((text, confidence, x, y, w, h))
-            
-            return boxes
+            scaled = self._scale_input(image)
+            boxes = self._recognize(
+                lambda engine, token: engine.image_to_boxes(scaled, config or self.config,
+                                                            self.confidence_threshold, token),
+                token)
+            if self.input_scale == 1.0:
+                return boxes
+            # Map the boxes back to the coordinates of the given image
+            return [(text, confidence) + tuple(int(round(v / self.input_scale)) for v in (x, y, w, h))
+                    for text, confidence, x, y, w, h in boxes]
+        except OCRTimeout as e:
+            print(f"⚠ OCR box detection timed out: {e}")
+            return []
+        except OCRCancelled:
+            return []
         except Exception as e:
             print(f"✗ OCR Box Detection Error: {e}")
             return []
     
+    def extract_regions(self, image, rects, token=None):
+        """
+        Recognize only the given text regions (e.g. proposed by a TextDetector)
+        
+        Regions are packed into montages, so each montage needs one Tesseract
+        call that returns both words and boxes.
+        
+        Args:
+            image (numpy.ndarray): Preprocessed image
+            rects (list): (x, y, w, h) regions in image coordinates, in reading order
+            token (CancelToken): Deadline/cancellation of this frame (default: ocr_timeout)
+        
+        Returns:
+            tuple: (text: str with one line per region, boxes: list in image coordinates)
+        """
+        if self.montage is None:
+            self.montage = MontageBatcher(self)
+        regions = crop_regions(image, rects)
+        if not regions:
+            return "", []
+        results = self.montage.recognize(regions, token=token)
+        
+        lines, boxes = [], []
+        for key, _, _ in regions:
+            text, region_boxes = results[key]
+            if text:
+                lines.append(text)
+            boxes.extend(region_boxes)
+        return '\n'.join(lines), boxes
+    
+    def detect_orientation(self, image, token=None):
+        """
+        Detect page orientation and script with Tesseract OSD
+        
+        Args:
+            image (numpy.ndarray): Preprocessed image of the page
+            token (CancelToken): Deadline/cancellation (default: ocr_timeout)
+        
+        Returns:
+            dict: Result of TesseractRecognizer.image_to_osd(), or None when
+                detection failed (e.g. too few characters) or was cancelled
+        """
+        try:
+            return self._recognize(lambda engine, token: engine.image_to_osd(image, token), token)
+        except OCRTimeout as e:
+            print(f"⚠ Orientation detection timed out: {e}")
+            return None
+        except OCRCancelled:
+            return None
+        except Exception as e:
+            print(f"⚠ Orientation detection failed: {e}")
+            return None
+    
     def clean_text(self, text):
         """
         Clean and format extracted text
@@ -114,6 +283,7 @@ class OCREngine:
     def is_new_text(self, current_text, similarity_threshold=0.8):
         """
         Check if the detected text is significantly different from the last detection
+        (and, with seen_texts set, from every text accepted earlier in the session)
         This prevents repeated speech of the same content
         
         Args:
@@ -126,20 +296,16 @@ class OCREngine:
         if not current_text:
             return False
         
-        if not self.last_text:
-            self.last_text = current_text
-            self.last_detection_time = datetime.now()
-            return True
-        
         # Simple similarity check
-        similarity = self.calculate_similarity(current_text, self.last_text)
-        
-        if similarity < similarity_threshold:
-            self.last_text = current_text
-            self.last_detection_time = datetime.now()
-            return True
+        if self.last_text and self.calculate_similarity(current_text, self.last_text) >= similarity_threshold:
+            return False
         
-        return False
+        self.last_text = current_text
+        self.last_detection_time = datetime.now()
+        # Returning to a page read earlier in the session
+        if self.seen_texts is not None and not self.seen_texts.add_if_new(current_text):
+            return False
+        return True
     
     def calculate_similarity(self, text1, text2):
         """
@@ -200,9 +366,192 @@ class OCREngine:
             language (str): Language code ('eng', 'nep', etc.)
         """
         self.language = language
-        self.config = f'--oem 3 --psm 6 -l {self.language}'
+        self.config = self.build_config()
+        self.load_lexicon()
         print(f"✓ OCR language changed to: {language}")
     
+    def build_config(self, psm=None):
+        """
+        Build the Tesseract arguments from the current settings
+        
+        Every -c variable is one argument, so values with spaces or quotes reach
+        Tesseract unchanged on every platform.
+        
+        Args:
+            psm (int): Page segmentation mode for this configuration (default: self.psm)
+        
+        Returns:
+            list: Command line arguments passed to Tesseract
+        """
+        options = ['--oem', str(self.oem), '--psm', str(self.psm if psm is None else psm), '-l', self.language]
+        for name, value in sorted(self.tesseract_variables.items()):
+            options += ['-c', f'{name}={value}']
+        return options
+    
+    def apply_tuning(self, settings):
+        """
+        Apply recognition settings (the 'ocr' section of a tuning file)
+        
+        Args:
+            settings (dict): Any of oem, psm, input_scale and variables
+        """
+        self.oem = int(settings.get('oem', self.oem))
+        self.psm = int(settings.get('psm', self.psm))
+        self.input_scale = float(settings.get('input_scale', self.input_scale))
+        if 'variables' in settings:
+            self.tesseract_variables = {name: str(value) for name, value in settings['variables'].items()}
+        self.config = self.build_config()
+    
+    def configure(self, **settings):
+        """
+        Change recognition and validation parameters (e.g. from a performance profile)
+        
+        Args:
+            **settings: oem, psm, input_scale and variables (as in a tuning file) or
+                attribute values, e.g. confidence_threshold=40, buffer_size=3, ocr_timeout=4.0
+        
+        Raises:
+            ValueError: Unknown parameter (nothing is changed)
+        """
+        self.check_settings(**settings)
+        tuning = {name: settings.pop(name) for name in ('oem', 'psm', 'input_scale', 'variables') if name in settings}
+        for name, value in settings.items():
+            setattr(self, name, value)
+        # Keep the stability buffer within its (possibly smaller) size
+        del self.text_buffer[:-self.buffer_size]
+        if tuning:
+            self.apply_tuning(tuning)
+    
+    def check_settings(self, **settings):
+        """
+        Check parameters for configure() without applying them
+        
+        Args:
+            **settings: As for configure()
+        
+        Raises:
+            ValueError: Unknown parameter or invalid value (see performance_profiles.SETTINGS)
+        """
+        check_section('ocr', settings)
+    
+    def load_tuning(self, path):
+        """
+        Load a tuning file written by autotune.py and apply its recognition settings
+        
+        Args:
+            path (str): Tuning JSON file
+        
+        Returns:
+            dict: The whole tuning profile (its 'preprocess' section is for ImagePreprocessor)
+        """
+        with open(path, 'r', encoding='utf-8') as f:
+            profile = json.load(f)
+        self.apply_tuning(profile.get('ocr', {}))
+        print(f"✓ OCR tuning loaded: {profile.get('name', path)} ({' '.join(self.config)}, scale {self.input_scale})")
+        return profile
+    
+    def load_lexicon(self, path=None):
+        """
+        Memory-map the word-frequency lexicon for the current language
+        
+        Args:
+            path (str): Compiled .lex file (default: lexicons/<language>.lex)
+        
+        Returns:
+            bool: True if a lexicon was loaded
+        """
+        if path is None:
+            primary_language = self.language.split('+')[0]
+            path = os.path.join(self.lexicon_dir, f'{primary_language}.lex')
+        
+        if self.lexicon is not None:
+            self.lexicon.close()
+            self.lexicon = None
+        
+        if not os.path.exists(path):
+            return False
+        
+        try:
+            self.lexicon = Lexicon(path)
+            print(f"✓ Lexicon loaded: {len(self.lexicon)} words ({path})")
+            return True
+        except Exception as e:
+            print(f"✗ Lexicon Error: {e}")
+            return False
+    
+    def _split_word(self, token):
+        """Split a token into (leading punctuation, core word, trailing punctuation)"""
+        core = token.strip(WORD_PUNCTUATION)
+        if not core:
+            return token, '', ''
+        start = token.index(core)
+        return token[:start], core, token[start + len(core):]
+    
+    def correct_text(self, text, boxes=None):
+        """
+        Replace low-confidence words with their most likely dictionary spelling
+        
+        Args:
+            text (str): Cleaned OCR text
+            boxes (list): Word boxes from extract_text_with_boxes; words missing from
+                          the boxes fell below confidence_threshold and count as low confidence
+        
+        Returns:
+            str: Corrected text (unchanged when no lexicon is loaded)
+        """
+        if self.lexicon is None or not text:
+            return text
+        
+        # Highest confidence seen per word
+        confidences = {}
+        for word, confidence, *_ in boxes or []:
+            core = word.strip(WORD_PUNCTUATION).lower()
+            confidences[core] = max(confidence, confidences.get(core, -1))
+        
+        tokens = [self._split_word(token) for token in text.split()]
+        
+        # Only plain words are corrected; numbers and codes are left alone.
+        # The words of the page are looked up in one batch.
+        suspects = [core.lower() for _, core, _ in tokens
+                    if core.isalpha() and core not in self.lexicon
+                    and confidences.get(core.lower(), -1) < self.correction_confidence]
+        suggestions = dict(zip(suspects, self.lexicon.correct_many(suspects)))
+        
+        corrected = []
+        for leading, core, trailing in tokens:
+            if core.lower() in suggestions:
+                suggestion, _ = suggestions[core.lower()]
+                if suggestion:
+                    if core.isupper() and len(core) > 1:
+                        suggestion = suggestion.upper()
+                    elif core[0].isupper():
+                        suggestion = suggestion.capitalize()
+                    core = suggestion
+            
+            corrected.append(leading + core + trailing)
+        
+        return ' '.join(corrected)
+    
+    def lexicon_score(self, text):
+        """
+        Fraction of words in the text that are dictionary words
+        
+        Args:
+            text (str): Text to score
+        
+        Returns:
+            float: Ratio 0.0 to 1.0, or None when no lexicon is loaded
+        """
+        if self.lexicon is None:
+            return None
+        
+        words = [self._split_word(token)[1] for token in text.split()]
+        words = [w for w in words if any(c.isalpha() for c in w)]
+        if not words:
+            return 0.0
+        
+        return sum(1 for w in words if w in self.lexicon) / len(words)
+    
     def is_meaningful_text(self, text):
         """
         Validate if extracted text is meaningful and not random noise
@@ -222,12 +571,20 @@ class OCREngine:
         if len(words) < self.min_words:
             return False
         
-        # Check for valid words (at least min_word_length characters)
-        valid_words = [w for w in words if len(w) >= self.min_word_length and w.isalpha()]
+        # Check for valid words (at least min_word_length characters, containing letters;
+        # alphanumeric words such as "A4" or "COVID19" are allowed)
+        cores = [self._split_word(w)[1] for w in words]
+        valid_words = [w for w in cores
+                       if len(w) >= self.min_word_length and w.isalnum() and any(c.isalpha() for c in w)]
         
         if len(valid_words) < self.min_words:
             return False
         
+        # With a dictionary available, require a share of real words
+        score = self.lexicon_score(text)
+        if score is not None and score < self.min_lexicon_ratio:
+            return False
+        
         # Check if text has reasonable character composition
         # Should have more alphanumeric than special characters
         alnum_count = sum(c.isalnum() for c in text)
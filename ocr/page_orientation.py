@@ -0,0 +1,180 @@
+"""
+Page Orientation Module - Orientation and script detection once per page
+
+OCREngine recognizes with one fixed language, and a page held sideways or
+upside-down comes out as noise. Running every frame with several languages
+(e.g. eng+nep) would roughly double the recognition cost instead.
+PageOrientation runs Tesseract OSD (--psm 0) once when the document tracker
+acquires a new page and caches the result while the tracker keeps the same
+page id. The cached rotation is applied to every frame of the page, and the
+detected script selects the OCR language.
+
+Usage:
+    orientation = PageOrientation(ocr_engine)
+    rotation = orientation.update(tracker.page_id, processed, roi)
+    processed = rotate_quadrant(processed, rotation)
+"""
+import cv2
+
+from .recognizer import load_tesseract
+
+# Tesseract OSD script name -> language used to recognize it
+SCRIPT_LANGUAGES = {
+    'Latin': 'eng',
+    'Devanagari': 'nep',
+}
+
+# Clockwise rotation in degrees -> cv2.rotate code
+QUADRANT_ROTATIONS = {
+    90: cv2.ROTATE_90_CLOCKWISE,
+    180: cv2.ROTATE_180,
+    270: cv2.ROTATE_90_COUNTERCLOCKWISE,
+}
+
+
+def rotate_quadrant(image, rotation):
+    """
+    Rotate an image clockwise by a multiple of 90 degrees
+    
+    Args:
+        image (numpy.ndarray): Image to rotate
+        rotation (int): 0, 90, 180 or 270
+    
+    Returns:
+        numpy.ndarray: Rotated image (width and height swap for 90 and 270)
+    """
+    if not rotation:
+        return image
+    return cv2.rotate(image, QUADRANT_ROTATIONS[rotation])
+
+
+def rotate_rect_quadrant(rect, rotation, shape):
+    """
+    Map a rectangle into an image rotated with rotate_quadrant()
+    
+    Args:
+        rect (tuple): (x, y, w, h) in the unrotated image
+        rotation (int): 0, 90, 180 or 270
+        shape (tuple): Shape of the unrotated image
+    
+    Returns:
+        tuple: (x, y, w, h) in the rotated image
+    """
+    h, w = shape[:2]
+    x, y, rw, rh = rect
+    if rotation == 90:
+        return (h - y - rh, x, rh, rw)
+    if rotation == 180:
+        return (w - x - rw, h - y - rh, rw, rh)
+    if rotation == 270:
+        return (y, w - x - rw, rh, rw)
+    return rect
+
+
+class PageOrientation:
+    """Caches the orientation and script of the tracked page"""
+    
+    def __init__(self, ocr_engine, script_languages=None, min_orientation_confidence=2.0,
+                 min_script_confidence=1.0, max_attempts=3):
+        """
+        Initialize orientation detection
+        
+        Args:
+            ocr_engine (OCREngine): Runs OSD and receives the selected language
+            script_languages (dict): Script name -> language (default: SCRIPT_LANGUAGES)
+            min_orientation_confidence (float): OSD orientation confidence needed to rotate
+            min_script_confidence (float): OSD script confidence needed to switch language
+            max_attempts (int): OSD runs per page before giving up (it fails on frames
+                with too few characters)
+        """
+        self.ocr_engine = ocr_engine
+        self.script_languages = dict(script_languages or SCRIPT_LANGUAGES)
+        self.min_orientation_confidence = min_orientation_confidence
+        self.min_script_confidence = min_script_confidence
+        self.max_attempts = max_attempts
+        self.default_language = ocr_engine.language  # Used for unknown or uncertain scripts
+        self.installed_languages = None  # Filled on first use from tesseract --list-langs
+        
+        # Cached result for the current page
+        self.page_id = None
+        self.attempts = 0
+        self.detected = False
+        self.rotation = 0
+        self.script = None
+        
+        # Statistics
+        self.osd_runs = 0
+        self.cache_hits = 0
+    
+    def update(self, page_id, image, roi=None):
+        """
+        Rotation of the tracked page, running OSD only for a new page
+        
+        Args:
+            page_id (int): DocumentTracker.page_id of the tracked page
+            image (numpy.ndarray): Preprocessed frame
+            roi (tuple): Optional (x, y, w, h) page region
+        
+        Returns:
+            int: Clockwise rotation (0, 90, 180 or 270) that makes the page upright
+        """
+        if page_id != self.page_id:
+            self.page_id = page_id
+            self.attempts = 0
+            self.detected = False
+            self.rotation = 0
+            self.script = None
+        
+        if self.detected or self.attempts >= self.max_attempts:
+            self.cache_hits += 1
+            return self.rotation
+        
+        if roi is not None:
+            x, y, w, h = roi
+            image = image[y:y + h, x:x + w]
+        self.attempts += 1
+        self.osd_runs += 1
+        result = self.ocr_engine.detect_orientation(image)
+        if result is None:
+            if self.attempts >= self.max_attempts:
+                self._select_language(None)  # Give up on this page: default language, upright
+            return self.rotation
+        
+        self.detected = True
+        if result['orientation_confidence'] >= self.min_orientation_confidence:
+            self.rotation = result['rotate'] % 360
+        if result['script_confidence'] >= self.min_script_confidence:
+            self.script = result['script']
+        language = self._select_language(self.script)
+        print(f"🧭 Page {page_id}: rotate {self.rotation}°, script {self.script or 'unknown'} ({language})")
+        return self.rotation
+    
+    def _select_language(self, script):
+        """Switch the OCR engine to the language of a script (only when it changes)"""
+        language = self.script_languages.get(script, self.default_language)
+        if language != self.default_language and not self._is_installed(language):
+            print(f"⚠ No Tesseract data for '{language}' ({script} script), keeping '{self.default_language}'")
+            language = self.default_language
+        if language != self.ocr_engine.language:
+            self.ocr_engine.set_language(language)
+        return language
+    
+    def _is_installed(self, language):
+        """Check the language data of every part of a 'lang1+lang2' code"""
+        if self.installed_languages is None:
+            try:
+                self.installed_languages = set(load_tesseract().get_languages(config=''))
+            except Exception:
+                self.installed_languages = set()
+        if not self.installed_languages:
+            return True  # Unknown, let Tesseract report it
+        return all(part in self.installed_languages for part in language.split('+'))
+    
+    def stats(self):
+        """
+        Detection statistics
+        
+        Returns:
+            dict: osd_runs and cache_hits
+        """
+        return {'osd_runs': self.osd_runs, 'cache_hits': self.cache_hits}
@@ -0,0 +1,342 @@
+"""
+Recognizer Module - Stateless Tesseract recognition and a pool of warm engines
+
+A TesseractRecognizer only wraps the backend calls: the configuration
+(argument list or string) and confidence threshold are passed in by the caller on every call, so one
+recognizer can serve any number of streams and threads. Per-stream state
+(stability buffer, last text, language) lives in OCREngine.
+
+EnginePool hands out a fixed number of warm recognizers (one per CPU core by
+default) with checkout/checkin, which bounds the number of Tesseract processes
+running at once no matter how many streams share the pool:
+
+    pool = EnginePool()
+    pool.warm_up()
+    streams = [OCREngine(pool=pool) for _ in range(8)]  # e.g. one per camera
+"""
+import os
+import queue
+import shlex
+import shutil
+import subprocess
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+import numpy as np
+
+from .cancellation import CancelToken, OCRCancelled, OCRTimeout
+
+DEFAULT_TESSERACT_CMD = r'C:\Program Files\Tesseract-OCR\tesseract.exe'
+DEFAULT_CONFIG = '--oem 3 --psm 6 -l eng'
+
+_pytesseract = None
+_load_lock = threading.Lock()
+
+
+def load_tesseract(tesseract_cmd=DEFAULT_TESSERACT_CMD):
+    """
+    Import pytesseract and set the Tesseract binary, once per process
+    
+    The binary path is a module global in pytesseract, so it is configured on
+    first use only and never changed afterwards. A path that does not exist on
+    this machine is skipped and pytesseract keeps looking up 'tesseract' on PATH.
+    
+    Args:
+        tesseract_cmd (str): Path of the tesseract binary
+    
+    Returns:
+        module: The configured pytesseract module
+    """
+    global _pytesseract
+    if _pytesseract is None:
+        with _load_lock:
+            if _pytesseract is None:
+                import pytesseract  # Pulls in PIL, deferred to keep startup fast
+                
+                if tesseract_cmd and (os.path.isfile(tesseract_cmd) or shutil.which(tesseract_cmd)):
+                    pytesseract.pytesseract.tesseract_cmd = tesseract_cmd
+                _pytesseract = pytesseract
+    return _pytesseract
+
+
+def _config_args(config):
+    """Tesseract arguments of a configuration (a list is passed through unchanged)"""
+    if isinstance(config, (list, tuple)):
+        return list(config)
+    return shlex.split(config, posix=sys.platform != 'win32')
+
+
+class TesseractRecognizer:
+    """Stateless Tesseract backend, safe to share between threads"""
+    
+    def __init__(self, tesseract_cmd=DEFAULT_TESSERACT_CMD):
+        """
+        Args:
+            tesseract_cmd (str): Path of the tesseract binary (applied once per process)
+        """
+        self.tesseract_cmd = tesseract_cmd
+        self.warmed_up = False
+    
+    def warm_up(self, config=DEFAULT_CONFIG):
+        """
+        Run a tiny recognition so that the binary and language data are loaded
+        
+        Args:
+            config (list): Tesseract configuration whose language data should be loaded
+        """
+        pytesseract = load_tesseract(self.tesseract_cmd)
+        pytesseract.get_tesseract_version()
+        
+        blank = np.full((32, 64), 255, dtype=np.uint8)
+        self._run(blank, 'txt', config, CancelToken())
+        self.warmed_up = True
+    
+    def _run(self, image, extension, config, token):
+        """
+        Run one Tesseract process that can be killed through the token
+        
+        Mirrors pytesseract's run_and_get_output, but keeps the process handle
+        so that cancel() and the deadline abort it immediately.
+        
+        Args:
+            image (numpy.ndarray): Image to recognize
+            extension (str): Output type ('txt', 'tsv' or 'osd')
+            config (list): Tesseract arguments, e.g. ['--psm', '6', '-c', 'name=value']
+                (a string is split like a command line)
+            token (CancelToken): Cancellation and deadline of this call
+        
+        Returns:
+            str: Contents of the Tesseract output file
+        
+        Raises:
+            OCRCancelled: The token was cancelled
+            OCRTimeout: The deadline passed before Tesseract finished
+        """
+        pytesseract = load_tesseract(self.tesseract_cmd)
+        module = pytesseract.pytesseract
+        token.check()
+        
+        with module.save(image) as (output_base, input_path):
+            args = [module.tesseract_cmd, input_path, output_base]
+            args += _config_args(config)
+            if extension == 'txt':
+                args.append(extension)
+            try:
+                process = subprocess.Popen(args, **module.subprocess_args())
+            except FileNotFoundError:
+                raise module.TesseractNotFoundError() from None
+            
+            token.attach(process)
+            try:
+                _, errors = process.communicate(timeout=token.remaining())
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.communicate()
+                token.check()
+                raise OCRTimeout("deadline exceeded") from None
+            finally:
+                token.detach(process)
+            
+            if token.cancelled:
+                raise OCRCancelled(token.reason)
+            if process.returncode:
+                raise module.TesseractError(process.returncode, module.get_errors(errors))
+            
+            with open(f'{output_base}.{extension}', 'rb') as f:
+                return f.read().decode('utf-8')
+    
+    def image_to_string(self, image, config=DEFAULT_CONFIG, token=None):
+        """
+        Recognize the text of an image
+        
+        Args:
+            image (numpy.ndarray): Preprocessed image
+            config (list): Tesseract configuration
+            token (CancelToken): Cancellation and deadline (default: none)
+        
+        Returns:
+            str: Raw Tesseract output
+        """
+        return self._run(image, 'txt', config, token or CancelToken())
+    
+    def image_to_boxes(self, image, config=DEFAULT_CONFIG, confidence_threshold=30, token=None):
+        """
+        Recognize words with their bounding boxes
+        
+        Args:
+            image (numpy.ndarray): Preprocessed image
+            config (list): Tesseract configuration
+            confidence_threshold (int): Words at or below this confidence are dropped
+            token (CancelToken): Cancellation and deadline (default: none)
+        
+        Returns:
+            list: List of tuples containing (text, confidence, x, y, w, h)
+        """
+        output = self._run(image, 'tsv', ['-c', 'tessedit_create_tsv=1'] + _config_args(config),
+                           token or CancelToken())
+        data = load_tesseract(self.tesseract_cmd).pytesseract.file_to_dict(output, '\t', -1)
+        
+        boxes = []
+        for i in range(len(data.get('text', []))):
+            confidence = int(float(data['conf'][i]))
+            text = data['text'][i].strip()
+            if confidence > confidence_threshold and text:
+                boxes.append((text, confidence, data['left'][i], data['top'][i],
+                              data['width'][i], data['height'][i]))
+        return boxes
+    
+    def image_to_osd(self, image, token=None):
+        """
+        Detect page orientation and script (Tesseract OSD, --psm 0)
+        
+        Needs osd.traineddata; Tesseract fails on images with too few characters.
+        
+        Args:
+            image (numpy.ndarray): Preprocessed image
+            token (CancelToken): Cancellation and deadline (default: none)
+        
+        Returns:
+            dict: orientation and rotate (degrees; rotating the image clockwise by
+                rotate makes it upright), orientation_confidence, script and
+                script_confidence
+        """
+        output = self._run(image, 'osd', '--psm 0', token or CancelToken())
+        fields = {}
+        for line in output.splitlines():
+            name, sep, value = line.partition(':')
+            if sep:
+                fields[name.strip()] = value.strip()
+        return {
+            'orientation': int(fields['Orientation in degrees']),
+            'rotate': int(fields['Rotate']),
+            'orientation_confidence': float(fields['Orientation confidence']),
+            'script': fields['Script'],
+            'script_confidence': float(fields['Script confidence']),
+        }
+
+
+class EnginePool:
+    """Fixed set of warm recognizers shared by many streams and threads"""
+    
+    def __init__(self, size=None, tesseract_cmd=DEFAULT_TESSERACT_CMD, single_threaded=True):
+        """
+        Initialize the pool
+        
+        Args:
+            size (int): Number of recognizers, i.e. concurrent Tesseract calls (default: CPU count)
+            tesseract_cmd (str): Path of the tesseract binary
+            single_threaded (bool): Limit each Tesseract process to one OpenMP thread so that
+                                    size parallel calls do not oversubscribe the cores
+        """
+        self.size = size or os.cpu_count() or 1
+        self.engines = [TesseractRecognizer(tesseract_cmd) for _ in range(self.size)]
+        
+        # LIFO hands out the most recently used (warmest) engine first
+        self._idle = queue.LifoQueue()
+        for engine in self.engines:
+            self._idle.put(engine)
+        
+        if single_threaded and self.size > 1:
+            # Inherited by the tesseract child processes only
+            os.environ.setdefault('OMP_THREAD_LIMIT', '1')
+        
+        # Statistics
+        self.lock = threading.Lock()
+        self.checkouts = 0
+        self.waits = 0          # Checkouts that had to wait for a free engine
+        self.wait_time = 0.0
+    
+    def warm_up(self, config=DEFAULT_CONFIG):
+        """
+        Warm up every engine in parallel
+        
+        Args:
+            config (list): Tesseract configuration whose language data should be loaded
+        """
+        threads = [threading.Thread(target=engine.warm_up, args=(config,), daemon=True)
+                   for engine in self.engines]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    
+    def is_ready(self):
+        """Check whether every engine has been warmed up"""
+        return all(engine.warmed_up for engine in self.engines)
+    
+    def checkout(self, timeout=None):
+        """
+        Take an engine out of the pool, waiting until one is free
+        
+        Args:
+            timeout (float): Maximum seconds to wait (None waits forever)
+        
+        Returns:
+            TesseractRecognizer: Engine that must be returned with checkin()
+        
+        Raises:
+            TimeoutError: No engine became free within timeout
+        """
+        try:
+            engine = self._idle.get_nowait()
+            waited = 0.0
+        except queue.Empty:
+            started = time.perf_counter()
+            try:
+                engine = self._idle.get(timeout=timeout)
+            except queue.Empty:
+                raise TimeoutError(f"No OCR engine free after {timeout}s") from None
+            waited = time.perf_counter() - started
+        
+        with self.lock:
+            self.checkouts += 1
+            if waited:
+                self.waits += 1
+                self.wait_time += waited
+        return engine
+    
+    def checkin(self, engine):
+        """
+        Return an engine to the pool
+        
+        Args:
+            engine (TesseractRecognizer): Engine obtained from checkout()
+        """
+        self._idle.put(engine)
+    
+    @contextmanager
+    def engine(self, timeout=None):
+        """
+        Borrow an engine for the duration of a with block
+        
+        Args:
+            timeout (float): Maximum seconds to wait for a free engine
+        """
+        engine = self.checkout(timeout)
+        try:
+            yield engine
+        finally:
+            self.checkin(engine)
+    
+    def available(self):
+        """Number of engines currently free"""
+        return self._idle.qsize()
+    
+    def stats(self):
+        """
+        Get pool usage statistics
+        
+        Returns:
+            dict: size, free engines, checkouts, waits and mean wait in milliseconds
+        """
+        with self.lock:
+            mean_wait = self.wait_time / self.waits * 1000 if self.waits else 0.0
+            return {
+                'size': self.size,
+                'available': self.available(),
+                'checkouts': self.checkouts,
+                'waits': self.waits,
+                'mean_wait_ms': round(mean_wait, 2),
+            }
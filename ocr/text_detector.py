@@ -0,0 +1,261 @@
+"""
+Text Detector Module - CNN text region proposals on ONNX Runtime (CPU)
+
+Tesseract's layout analysis over the whole frame is the largest fixed cost of
+a recognition. A small detection network (DB or EAST, exported to ONNX) finds
+the text boxes in one fast pass instead; OCREngine.extract_regions() then only
+recognizes those regions (packed into montages, see ocr/montage.py).
+
+onnxruntime is optional: it is imported when the first detector is loaded.
+Models are not shipped, e.g. PaddleOCR's en_PP-OCRv3_det (DB) or EAST
+exported with tf2onnx. quantized=True runs a dynamically quantized (int8)
+copy of the model, created next to it on first use.
+
+Usage:
+    detector = TextDetector('models/en_PP-OCRv3_det.onnx', threads=2)
+    rects = detector.detect(frame)                       # [(x, y, w, h), ...]
+    text, boxes = ocr_engine.extract_regions(binary, rects)
+"""
+import os
+import threading
+import time
+
+import cv2
+import numpy as np
+
+
+def _onnxruntime():
+    """Import onnxruntime (optional dependency)"""
+    try:
+        import onnxruntime
+    except ImportError:
+        raise ImportError("Text detection needs onnxruntime: pip install onnxruntime") from None
+    return onnxruntime
+
+
+def quantize_model(model_path, output_path=None):
+    """
+    Write a dynamically quantized (int8 weights) copy of a model
+    
+    Args:
+        model_path (str): Float ONNX model
+        output_path (str): Output file (default: <model>.int8.onnx)
+    
+    Returns:
+        str: Path of the quantized model
+    """
+    _onnxruntime()
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+    
+    output_path = output_path or os.path.splitext(model_path)[0] + '.int8.onnx'
+    quantize_dynamic(model_path, output_path, weight_type=QuantType.QUInt8)
+    print(f"✓ Quantized text detector written to {output_path}")
+    return output_path
+
+
+def rotate_rects(rects, angle, shape):
+    """
+    Map rectangles into an image rotated with ImagePreprocessor.rotate()
+    
+    Args:
+        rects (list): (x, y, w, h) rectangles in the unrotated image
+        angle (float): Rotation angle in degrees (counter-clockwise)
+        shape (tuple): Image shape
+    
+    Returns:
+        list: Bounding rectangles of the rotated rectangles, clipped to the image
+    """
+    h, w = shape[:2]
+    matrix = cv2.getRotationMatrix2D((w // 2, h // 2), angle, 1.0)
+    rotated = []
+    for x, y, rw, rh in rects:
+        corners = np.array([[x, y, 1], [x + rw, y, 1], [x, y + rh, 1], [x + rw, y + rh, 1]], dtype=np.float64)
+        points = corners @ matrix.T
+        x1, y1 = np.floor(points.min(axis=0)).astype(int)
+        x2, y2 = np.ceil(points.max(axis=0)).astype(int)
+        x1, y1, x2, y2 = max(0, x1), max(0, y1), min(w, x2), min(h, y2)
+        if x2 > x1 and y2 > y1:
+            rotated.append((int(x1), int(y1), int(x2 - x1), int(y2 - y1)))
+    return rotated
+
+
+class TextDetector:
+    """Proposes text regions with a DB or EAST model on ONNX Runtime"""
+    
+    def __init__(self, model_path, kind='db', threads=2, quantized=False, max_side=960,
+                 score_threshold=0.3, box_threshold=0.6, unclip_ratio=1.5, min_size=4):
+        """
+        Initialize the detector (the model is loaded by warm_up() or the first detect())
+        
+        Args:
+            model_path (str): ONNX model file
+            kind (str): 'db' (probability map output) or 'east' (score + geometry outputs)
+            threads (int): ONNX Runtime intra-op threads (Tesseract needs the other cores)
+            quantized (bool): Run the int8 copy of the model (created on first use)
+            max_side (int): Longer side of the network input in pixels
+            score_threshold (float): Pixel probability that counts as text
+            box_threshold (float): Mean probability a region needs to be kept
+            unclip_ratio (float): DB boxes are shrunk text kernels; grow them by this ratio
+            min_size (int): Smaller regions (in network pixels) are dropped
+        """
+        if kind not in ('db', 'east'):
+            raise ValueError(f"Unknown detector kind '{kind}' (choose 'db' or 'east')")
+        self.model_path = model_path
+        self.kind = kind
+        self.threads = threads
+        self.quantized = quantized
+        self.max_side = max_side
+        self.score_threshold = score_threshold
+        self.box_threshold = box_threshold
+        self.unclip_ratio = unclip_ratio
+        self.min_size = min_size
+        self.session = None
+        self.input_name = None
+        self._lock = threading.Lock()  # Warm-up may run in the background
+        
+        # Statistics
+        self.detections = 0
+        self.detect_seconds = 0.0
+    
+    def warm_up(self):
+        """Load the model and run it once"""
+        self._load()
+        self.detect(np.full((64, 64, 3), 255, dtype=np.uint8))
+    
+    def _load(self):
+        """Create the ONNX Runtime session"""
+        with self._lock:
+            if self.session is None:
+                self.session = self._create_session()
+        return self.session
+    
+    def _create_session(self):
+        """Load the (optionally quantized) model on the CPU execution provider"""
+        ort = _onnxruntime()
+        path = self.model_path
+        if self.quantized:
+            path = os.path.splitext(self.model_path)[0] + '.int8.onnx'
+            if not os.path.exists(path):
+                quantize_model(self.model_path, path)
+        
+        options = ort.SessionOptions()
+        options.intra_op_num_threads = self.threads
+        options.inter_op_num_threads = 1
+        options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        session = ort.InferenceSession(path, sess_options=options, providers=['CPUExecutionProvider'])
+        self.input_name = session.get_inputs()[0].name
+        print(f"✓ Text detector loaded ({self.kind.upper()}, {os.path.basename(path)}, {self.threads} threads)")
+        return session
+    
+    def _blob(self, image):
+        """Network input (1x3xHxW float32) and the scale factors back to the image"""
+        h, w = image.shape[:2]
+        scale = min(1.0, self.max_side / max(h, w))
+        # Both architectures downsample by 32
+        net_w = max(32, int(round(w * scale / 32)) * 32)
+        net_h = max(32, int(round(h * scale / 32)) * 32)
+        resized = cv2.resize(image, (net_w, net_h), interpolation=cv2.INTER_AREA)
+        if resized.ndim == 2:
+            resized = cv2.cvtColor(resized, cv2.COLOR_GRAY2BGR)
+        
+        if self.kind == 'db':
+            # PaddleOCR normalization (ImageNet mean/std on BGR input)
+            blob = (resized.astype(np.float32) / 255.0 - (0.485, 0.456, 0.406)) / (0.229, 0.224, 0.225)
+        else:
+            # EAST: RGB mean subtraction
+            blob = cv2.cvtColor(resized, cv2.COLOR_BGR2RGB).astype(np.float32) - (123.68, 116.78, 103.94)
+        blob = blob.astype(np.float32).transpose(2, 0, 1)[None]
+        return blob, (w / net_w, h / net_h)
+    
+    def detect(self, image, roi=None):
+        """
+        Find text regions
+        
+        Args:
+            image (numpy.ndarray): BGR or grayscale frame
+            roi (tuple): Optional (x, y, w, h) region to search (e.g. the tracked page)
+        
+        Returns:
+            list: (x, y, w, h) text rectangles in image coordinates, top to bottom
+        """
+        session = self._load()
+        ox = oy = 0
+        if roi is not None:
+            ox, oy, rw, rh = roi
+            image = image[oy:oy + rh, ox:ox + rw]
+        if image.size == 0:
+            return []
+        
+        started = time.perf_counter()
+        blob, (sx, sy) = self._blob(image)
+        outputs = session.run(None, {self.input_name: blob})
+        if self.kind == 'db':
+            rects = self._decode_db(outputs[0])
+        else:
+            rects = self._decode_east(outputs)
+        self.detections += 1
+        self.detect_seconds += time.perf_counter() - started
+        
+        h, w = image.shape[:2]
+        result = []
+        for x, y, rw, rh in rects:
+            x1, y1 = max(0, int(x * sx)), max(0, int(y * sy))
+            x2, y2 = min(w, int(np.ceil((x + rw) * sx))), min(h, int(np.ceil((y + rh) * sy)))
+            if x2 > x1 and y2 > y1:
+                result.append((x1 + ox, y1 + oy, x2 - x1, y2 - y1))
+        result.sort(key=lambda rect: (rect[1], rect[0]))
+        return result
+    
+    def _decode_db(self, output):
+        """Boxes from a DB probability map (network pixels)"""
+        probability = np.squeeze(output).astype(np.float32)
+        mask = (probability > self.score_threshold).astype(np.uint8)
+        contours, _ = cv2.findContours(mask, cv2.RETR_LIST, cv2.CHAIN_APPROX_SIMPLE)
+        
+        rects = []
+        height, width = probability.shape
+        for contour in contours:
+            x, y, w, h = cv2.boundingRect(contour)
+            if min(w, h) < self.min_size:
+                continue
+            # Mean probability inside the contour
+            region = np.zeros((h, w), dtype=np.uint8)
+            cv2.drawContours(region, [contour - (x, y)], -1, 1, -1)
+            if cv2.mean(probability[y:y + h, x:x + w], region)[0] < self.box_threshold:
+                continue
+            # Unclip: DB predicts shrunk kernels, grow by area * ratio / perimeter
+            area = cv2.contourArea(contour)
+            perimeter = cv2.arcLength(contour, True)
+            grow = int(round(area * self.unclip_ratio / perimeter)) if perimeter else 0
+            x1, y1 = max(0, x - grow), max(0, y - grow)
+            x2, y2 = min(width, x + w + grow), min(height, y + h + grow)
+            rects.append((x1, y1, x2 - x1, y2 - y1))
+        return rects
+    
+    def _decode_east(self, outputs):
+        """Boxes from EAST score and geometry maps (network pixels, axis-aligned)"""
+        score, geometry = (np.asarray(output, dtype=np.float32) for output in outputs[:2])
+        if score.shape[-1] == 1:  # NHWC export
+            score, geometry = score.transpose(0, 3, 1, 2), geometry.transpose(0, 3, 1, 2)
+        score, geometry = score[0, 0], geometry[0]
+        
+        ys, xs = np.nonzero(score > self.box_threshold)
+        if not len(ys):
+            return []
+        top, right, bottom, left = (geometry[i, ys, xs] for i in range(4))
+        cx, cy = xs * 4.0, ys * 4.0  # Score map is a quarter of the input size
+        boxes = np.stack([cx - left, cy - top, left + right, top + bottom], axis=1)
+        keep = cv2.dnn.NMSBoxes(boxes.tolist(), score[ys, xs].tolist(), self.box_threshold, 0.4)
+        return [tuple(int(v) for v in boxes[i]) for i in np.array(keep).reshape(-1)
+                if min(boxes[i][2], boxes[i][3]) >= self.min_size]
+    
+    def stats(self):
+        """
+        Detection statistics
+        
+        Returns:
+            dict: detections and mean milliseconds per detection
+        """
+        mean = self.detect_seconds / self.detections * 1000 if self.detections else 0.0
+        return {'detections': self.detections, 'mean_ms': round(mean, 1)}
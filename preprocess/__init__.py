@@ -1,4 +1,8 @@
 """Preprocessing module for image enhancement"""
 from .preprocess import ImagePreprocessor
+from .frame_quality import FrameQualityScorer, BestFrameSelector
+from .presence import PresenceDetector
+from .document_tracker import DocumentTracker
 
-__all__ = ['ImagePreprocessor']
+__all__ = ['ImagePreprocessor', 'FrameQualityScorer', 'BestFrameSelector', 'PresenceDetector',
+           'DocumentTracker']
@@ -0,0 +1,203 @@
+"""
+Binarization Module - Local thresholding methods for the OCR pipeline
+
+Sauvola and Wolf thresholds need the mean and standard deviation of a window
+around every pixel. Both are read from integral images (summed-area tables),
+so the cost per pixel is constant regardless of the window size. Otsu per
+tile computes all tile histograms in one pass and interpolates the tile
+thresholds into a smooth threshold surface.
+
+Usage:
+    binary = binarize(gray, 'sauvola', window=31, k=0.2)
+"""
+import cv2
+import numpy as np
+
+
+def local_mean_std(gray, window):
+    """
+    Mean and standard deviation of a window around every pixel via integral images
+    
+    Args:
+        gray (numpy.ndarray): Grayscale image
+        window (int): Odd window size in pixels
+    
+    Returns:
+        tuple: (mean, std) as float32 images of the input size
+    """
+    r = window // 2
+    padded = cv2.copyMakeBorder(gray, r, r + 1, r, r + 1, cv2.BORDER_REFLECT)
+    # Integer sums are exact; squared sums need doubles to avoid cancellation
+    total, squared = cv2.integral2(padded, sdepth=cv2.CV_32S, sqdepth=cv2.CV_64F)
+    
+    h, w = gray.shape[:2]
+    
+    def box(table):
+        # Window sums from four contiguous slices of the table, computed in place
+        sums = np.subtract(table[window:window + h, window:window + w], table[:h, window:window + w])
+        sums -= table[window:window + h, :w]
+        sums += table[:h, :w]
+        return sums
+    
+    scale = 1.0 / (window * window)
+    mean = box(total).astype(np.float32)
+    mean *= scale
+    squared_sums = box(squared)
+    squared_sums *= scale
+    variance = squared_sums.astype(np.float32)
+    variance -= cv2.multiply(mean, mean)
+    np.maximum(variance, 0.0, out=variance)  # Rounding can leave tiny negatives
+    return mean, cv2.sqrt(variance)
+
+
+def _above(gray, threshold):
+    """White (255) where the pixel is brighter than its threshold, black elsewhere"""
+    return cv2.compare(gray.astype(np.float32), threshold, cv2.CMP_GT)
+
+
+def _odd(window):
+    """Force a window size to an odd value of at least 3"""
+    window = max(3, int(window))
+    return window if window % 2 else window + 1
+
+
+def gaussian(gray, window=11, c=2):
+    """
+    Gaussian-weighted adaptive threshold (the original pipeline method)
+    
+    Args:
+        gray (numpy.ndarray): Grayscale image
+        window (int): Block size
+        c (float): Constant subtracted from the weighted mean
+    
+    Returns:
+        numpy.ndarray: Binary image (text black on white)
+    """
+    return cv2.adaptiveThreshold(gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
+                                 cv2.THRESH_BINARY, _odd(window), c)
+
+
+def sauvola(gray, window=31, k=0.2, r=128.0):
+    """
+    Sauvola threshold: T = m * (1 + k * (s / R - 1))
+    
+    Args:
+        gray (numpy.ndarray): Grayscale image
+        window (int): Window size, roughly two to three text line heights
+        k (float): Sensitivity; higher values thin the strokes
+        r (float): Dynamic range of the standard deviation
+    
+    Returns:
+        numpy.ndarray: Binary image (text black on white)
+    """
+    mean, std = local_mean_std(gray, _odd(window))
+    # In place: threshold = mean * (1 - k + (k / R) * std)
+    std *= k / r
+    std += 1.0 - k
+    return _above(gray, cv2.multiply(mean, std))
+
+
+def wolf(gray, window=31, k=0.5):
+    """
+    Wolf-Jolion threshold, normalizing contrast by the global minimum and the
+    largest local deviation: T = (1 - k) m + k M + k (s / R) (m - M)
+    Handles low-contrast and unevenly lit pages better than Sauvola
+    
+    Args:
+        gray (numpy.ndarray): Grayscale image
+        window (int): Window size
+        k (float): Sensitivity
+    
+    Returns:
+        numpy.ndarray: Binary image (text black on white)
+    """
+    mean, std = local_mean_std(gray, _odd(window))
+    darkest = float(gray.min())
+    max_std = max(float(std.max()), 1e-6)
+    # In place: threshold = mean - k * (1 - std / R) * (mean - M)
+    contrast = mean - darkest
+    std *= 1.0 / max_std
+    std -= 1.0
+    std *= k
+    return _above(gray, cv2.scaleAdd(cv2.multiply(std, contrast), 1.0, mean))
+
+
+def otsu_tiles(gray, tile=64, min_std=10.0, min_separability=0.75):
+    """
+    Otsu threshold per tile, bilinearly interpolated between tile centers
+    
+    Tiles that are not clearly bimodal (blank paper, where Otsu would split
+    sensor noise) get a threshold just below their own background level, so
+    they stay white under any lighting.
+    
+    Args:
+        gray (numpy.ndarray): Grayscale image
+        tile (int): Tile size in pixels
+        min_std (float): Minimum intensity deviation for a tile's own threshold
+        min_separability (float): Minimum share of the tile variance explained by the
+            split (0.64 for pure Gaussian noise, close to 1 for ink on paper)
+    
+    Returns:
+        numpy.ndarray: Binary image (text black on white)
+    """
+    h, w = gray.shape[:2]
+    rows, cols = max(1, h // tile), max(1, w // tile)
+    
+    # Tile index of every pixel; the last row/column of tiles absorbs the remainder
+    row_ids = np.minimum(np.arange(h) // tile, rows - 1)
+    col_ids = np.minimum(np.arange(w) // tile, cols - 1)
+    tile_ids = row_ids[:, None] * cols + col_ids[None, :]
+    
+    # All tile histograms in one bincount
+    hist = np.bincount((tile_ids * 256 + gray).ravel(), minlength=rows * cols * 256)
+    hist = hist.reshape(rows * cols, 256).astype(np.float64)
+    
+    # Vectorized Otsu: maximize between-class variance for every tile at once
+    levels = np.arange(256, dtype=np.float64)
+    weight = np.cumsum(hist, axis=1)
+    cumulative_mean = np.cumsum(hist * levels, axis=1)
+    total = weight[:, -1:]
+    total_mean = cumulative_mean[:, -1:]
+    background = weight
+    foreground = total - weight
+    with np.errstate(divide='ignore', invalid='ignore'):
+        between = (total_mean * background - cumulative_mean * total) ** 2 / (background * foreground)
+    between = np.nan_to_num(between, nan=0.0, posinf=0.0)
+    thresholds = between.argmax(axis=1).astype(np.float32)
+    best_between = between.max(axis=1) / (total[:, 0] ** 2)
+    
+    # Tiles without ink are treated as background
+    tile_mean = total_mean[:, 0] / total[:, 0]
+    tile_var = (hist * levels ** 2).sum(axis=1) / total[:, 0] - tile_mean ** 2
+    with np.errstate(divide='ignore', invalid='ignore'):
+        separability = np.nan_to_num(best_between / tile_var)
+    blank = (tile_var < min_std ** 2) | (separability < min_separability)
+    thresholds[blank] = (tile_mean - 3.0 * np.sqrt(np.maximum(tile_var, min_std ** 2)))[blank]
+    
+    surface = cv2.resize(thresholds.reshape(rows, cols), (w, h), interpolation=cv2.INTER_LINEAR)
+    return _above(gray, surface)
+
+
+METHODS = {
+    'gaussian': gaussian,
+    'sauvola': sauvola,
+    'wolf': wolf,
+    'otsu_tiles': otsu_tiles,
+}
+
+
+def binarize(gray, method='gaussian', **params):
+    """
+    Binarize a grayscale image with a named method
+    
+    Args:
+        gray (numpy.ndarray): Grayscale image
+        method (str): One of METHODS
+        **params: Method parameters (window, k, tile, ...)
+    
+    Returns:
+        numpy.ndarray: Binary image (text black on white)
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown binarization method '{method}' (choose from {', '.join(METHODS)})")
+    return METHODS[method](gray, **params)
@@ -0,0 +1,204 @@
+"""
+Document Tracker Module - Follows the page quad between full document detections
+
+Once ImagePreprocessor.detect_document finds a page, feature points inside the
+page are tracked with pyramidal Lucas-Kanade optical flow (KLT) on a downscaled
+image. A RANSAC homography between old and new points moves the four page
+corners. Full contour detection only runs again on track loss, low confidence
+or every redetect_interval frames.
+"""
+import cv2
+import numpy as np
+
+
+class DocumentTracker:
+    """Tracks the four corners of a detected page across frames"""
+    
+    def __init__(self, preprocessor, scale=0.5, redetect_interval=30, search_interval=10):
+        """
+        Initialize document tracker
+        
+        Args:
+            preprocessor (ImagePreprocessor): Provides the full detect_document() fallback
+            scale (float): Downscale factor for tracking
+            redetect_interval (int): Frames between confirmation detections while tracking
+            search_interval (int): Frames between detection attempts while no page is tracked
+        """
+        self.preprocessor = preprocessor
+        self.scale = scale
+        self.redetect_interval = redetect_interval
+        self.search_interval = search_interval
+        
+        self.max_features = 80
+        self.min_features = 12          # Fewer tracked points than this means track loss
+        self.min_inlier_ratio = 0.6     # Homography support required to trust the track
+        self.max_fb_error = 1.0         # Forward-backward consistency in pixels (downscaled)
+        self.win_size = (15, 15)
+        self.pyramid_levels = 2         # Enough for hand motion at half resolution
+        self.same_page_overlap = 0.5    # Overlap with the tracked quad to keep the page id
+        
+        self.quad = None                # 4x2 float32 corners in full-resolution coordinates
+        self.points = None              # Tracked features in downscaled coordinates
+        self.prev_gray = None
+        self.confidence = 0.0
+        self.frames_since_detection = search_interval  # Search on the first frame
+        self.page_id = 0                # Incremented whenever a different page is acquired
+        self.full_detections = 0
+    
+    def reset(self):
+        """Forget the tracked page"""
+        self.quad = None
+        self.points = None
+        self.prev_gray = None
+        self.confidence = 0.0
+        self.frames_since_detection = 0
+    
+    def has_document(self):
+        """Check whether a page is currently tracked"""
+        return self.quad is not None
+    
+    def contour(self):
+        """
+        Get the tracked page as an OpenCV contour
+        
+        Returns:
+            numpy.ndarray: 4x1x2 int32 contour, or None
+        """
+        if self.quad is None:
+            return None
+        return np.round(self.quad).astype(np.int32).reshape(-1, 1, 2)
+    
+    def _small_gray(self, frame):
+        """Downscaled grayscale image used for tracking"""
+        gray = frame if frame.ndim == 2 else cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        return cv2.resize(gray, None, fx=self.scale, fy=self.scale, interpolation=cv2.INTER_AREA)
+    
+    def update(self, frame):
+        """
+        Advance the tracker by one frame
+        
+        Args:
+            frame (numpy.ndarray): Current BGR frame
+        
+        Returns:
+            tuple: (has_document: bool, contour: numpy.ndarray or None)
+        """
+        gray = self._small_gray(frame)
+        
+        tracked = False
+        if self.quad is not None and self.frames_since_detection < self.redetect_interval:
+            tracked = self._track(gray)
+        
+        if tracked:
+            self.frames_since_detection += 1
+        elif self.quad is not None or self.frames_since_detection >= self.search_interval:
+            # Track lost, confirmation due, or periodic search while no page is visible
+            self._detect(frame, gray)
+        else:
+            self.frames_since_detection += 1
+        
+        self.prev_gray = gray
+        return self.has_document(), self.contour()
+    
+    def _track(self, gray):
+        """
+        Move the quad with KLT flow and a RANSAC homography
+        
+        Args:
+            gray (numpy.ndarray): Downscaled grayscale frame
+        
+        Returns:
+            bool: True if the track is still reliable
+        """
+        if self.prev_gray is None or self.points is None or len(self.points) < self.min_features:
+            return False
+        if self.prev_gray.shape != gray.shape:
+            return False
+        
+        lk_params = dict(winSize=self.win_size, maxLevel=self.pyramid_levels,
+                         criteria=(cv2.TERM_CRITERIA_EPS | cv2.TERM_CRITERIA_COUNT, 20, 0.03))
+        new_points, status, _ = cv2.calcOpticalFlowPyrLK(self.prev_gray, gray, self.points, None, **lk_params)
+        back_points, back_status, _ = cv2.calcOpticalFlowPyrLK(gray, self.prev_gray, new_points, None, **lk_params)
+        
+        fb_error = np.linalg.norm((self.points - back_points).reshape(-1, 2), axis=1)
+        good = (status.ravel() == 1) & (back_status.ravel() == 1) & (fb_error < self.max_fb_error)
+        if np.count_nonzero(good) < self.min_features:
+            return False
+        
+        old_good, new_good = self.points[good], new_points[good]
+        H, inliers = cv2.findHomography(old_good, new_good, cv2.RANSAC, 3.0)
+        if H is None:
+            return False
+        
+        inliers = inliers.ravel().astype(bool)
+        self.confidence = float(np.count_nonzero(inliers)) / len(self.points)
+        if self.confidence < self.min_inlier_ratio:
+            return False
+        
+        small_quad = (self.quad * self.scale).reshape(-1, 1, 2).astype(np.float32)
+        moved = cv2.perspectiveTransform(small_quad, H).reshape(-1, 2) / self.scale
+        if not self._plausible(moved, gray.shape):
+            return False
+        
+        self.quad = moved.astype(np.float32)
+        self.points = new_good[inliers].reshape(-1, 1, 2)
+        return True
+    
+    def _plausible(self, quad, small_shape):
+        """Reject degenerate quads (self-intersecting, tiny or mostly off-screen)"""
+        contour = quad.reshape(-1, 1, 2).astype(np.float32)
+        if not cv2.isContourConvex(contour):
+            return False
+        area = cv2.contourArea(contour)
+        frame_area = small_shape[0] * small_shape[1] / (self.scale ** 2)
+        return self.preprocessor.min_contour_area <= area <= frame_area * 1.2
+    
+    def _detect(self, frame, gray):
+        """Run full contour detection and (re)initialize the track"""
+        self.full_detections += 1
+        self.frames_since_detection = 0
+        has_document, contour = self.preprocessor.detect_document(frame)
+        
+        if not has_document or contour is None:
+            self.reset()
+            return
+        
+        quad = self.contour_to_quad(contour)
+        if self.quad is None or self._overlap(quad, self.quad) < self.same_page_overlap:
+            self.page_id += 1
+        self.quad = quad
+        self.confidence = 1.0
+        
+        # Seed trackable features inside the page
+        mask = np.zeros(gray.shape, dtype=np.uint8)
+        cv2.fillConvexPoly(mask, np.round(quad * self.scale).astype(np.int32), 255)
+        self.points = cv2.goodFeaturesToTrack(gray, maxCorners=self.max_features, qualityLevel=0.01,
+                                              minDistance=7, mask=mask)
+        if self.points is not None:
+            self.points = self.points.astype(np.float32)
+    
+    def contour_to_quad(self, contour):
+        """
+        Reduce a document contour to its four corners
+        
+        Args:
+            contour (numpy.ndarray): Contour from detect_document()
+        
+        Returns:
+            numpy.ndarray: 4x2 float32 corners
+        """
+        peri = cv2.arcLength(contour, True)
+        approx = cv2.approxPolyDP(contour, 0.02 * peri, True)
+        if len(approx) == 4 and cv2.isContourConvex(approx):
+            return approx.reshape(4, 2).astype(np.float32)
+        return cv2.boxPoints(cv2.minAreaRect(contour)).astype(np.float32)
+    
+    def _overlap(self, quad_a, quad_b):
+        """Intersection over union of the bounding boxes of two quads"""
+        ax, ay, aw, ah = cv2.boundingRect(quad_a.astype(np.float32))
+        bx, by, bw, bh = cv2.boundingRect(quad_b.astype(np.float32))
+        ix = max(0, min(ax + aw, bx + bw) - max(ax, bx))
+        iy = max(0, min(ay + ah, by + bh) - max(ay, by))
+        intersection = ix * iy
+        union = aw * ah + bw * bh - intersection
+        return intersection / union if union > 0 else 0.0
@@ -0,0 +1,134 @@
+"""
+Frame Quality Module - Cheap per-frame sharpness/exposure/motion scoring
+and best-frame selection for OCR
+"""
+import cv2
+import numpy as np
+
+
+class FrameQualityScorer:
+    """Scores frames on a small thumbnail so every captured frame can be rated"""
+    
+    def __init__(self, thumbnail_width=320):
+        """
+        Initialize the scorer
+        
+        Args:
+            thumbnail_width (int): Width of the thumbnail used for scoring
+        """
+        self.thumbnail_width = thumbnail_width
+        self.previous_thumbnail = None
+        self.peak_sharpness = 0.0  # Decaying peak, makes the blur test relative to the scene
+        
+        # Acceptance thresholds for sending a frame to OCR
+        self.min_sharpness = 30.0   # Laplacian variance on the thumbnail
+        self.relative_sharpness = 0.35  # Fraction of the recent peak sharpness required
+        self.peak_decay = 0.98      # Per-frame decay of the peak (~1 s half-life at 30 FPS)
+        self.max_motion = 12.0      # Mean absolute difference to the previous thumbnail
+        self.max_clipped = 0.25     # Fraction of under/over-exposed pixels
+    
+    def thumbnail(self, frame):
+        """
+        Create a grayscale thumbnail of a frame
+        
+        Args:
+            frame (numpy.ndarray): BGR or grayscale frame
+        
+        Returns:
+            numpy.ndarray: Grayscale thumbnail
+        """
+        h, w = frame.shape[:2]
+        size = (self.thumbnail_width, max(1, int(h * self.thumbnail_width / w)))
+        small = cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+        if small.ndim == 3:
+            small = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+        return small
+    
+    def score(self, frame):
+        """
+        Score a frame for OCR suitability
+        
+        Args:
+            frame (numpy.ndarray): BGR or grayscale frame
+        
+        Returns:
+            dict: sharpness, brightness, clipped, motion and combined score
+        """
+        thumb = self.thumbnail(frame)
+        
+        # Sharpness: variance of the Laplacian (blur removes high frequencies)
+        sharpness = float(cv2.Laplacian(thumb, cv2.CV_16S).var())
+        self.peak_sharpness = max(sharpness, self.peak_sharpness * self.peak_decay)
+        
+        # Exposure: mean level and share of crushed/blown pixels
+        brightness = float(thumb.mean())
+        clipped = float(np.count_nonzero((thumb < 8) | (thumb > 247))) / thumb.size
+        
+        # Motion: change against the previous thumbnail
+        if self.previous_thumbnail is not None and self.previous_thumbnail.shape == thumb.shape:
+            motion = float(cv2.absdiff(thumb, self.previous_thumbnail).mean())
+        else:
+            motion = 0.0
+        self.previous_thumbnail = thumb
+        
+        exposure_factor = (1.0 - clipped) * (1.0 - 0.5 * abs(brightness - 128.0) / 128.0)
+        combined = sharpness * exposure_factor / (1.0 + motion / 4.0)
+        
+        return {
+            'sharpness': sharpness,
+            'brightness': brightness,
+            'clipped': clipped,
+            'motion': motion,
+            'score': combined,
+        }
+    
+    def is_acceptable(self, quality):
+        """
+        Check whether a scored frame is worth running OCR on
+        
+        Args:
+            quality (dict): Result of score()
+        
+        Returns:
+            bool: True if the frame is sharp, still and reasonably exposed
+        """
+        required_sharpness = max(self.min_sharpness, self.relative_sharpness * self.peak_sharpness)
+        return (quality['sharpness'] >= required_sharpness
+                and quality['motion'] <= self.max_motion
+                and quality['clipped'] <= self.max_clipped)
+
+
+class BestFrameSelector:
+    """Keeps the highest-scoring frame seen since the last OCR pass"""
+    
+    def __init__(self):
+        """Initialize an empty selection window"""
+        self.best_frame = None
+        self.best_quality = None
+        self.frames_seen = 0
+    
+    def offer(self, frame, quality):
+        """
+        Offer a scored frame to the current window
+        
+        Args:
+            frame (numpy.ndarray): Captured frame
+            quality (dict): Result of FrameQualityScorer.score()
+        """
+        self.frames_seen += 1
+        if self.best_quality is None or quality['score'] > self.best_quality['score']:
+            self.best_frame = frame
+            self.best_quality = quality
+    
+    def take(self):
+        """
+        Return the best frame of the window and start a new window
+        
+        Returns:
+            tuple: (frame: numpy.ndarray or None, quality: dict or None)
+        """
+        frame, quality = self.best_frame, self.best_quality
+        self.best_frame = None
+        self.best_quality = None
+        self.frames_seen = 0
+        return frame, quality
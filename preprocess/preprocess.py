@@ -1,9 +1,12 @@
 """
 Preprocessing Module - Image enhancement for better OCR accuracy
 """
+import time
 import cv2
 import numpy as np
 
+from .binarization import METHODS as BINARIZATION_METHODS, binarize
+
 
 class ImagePreprocessor:
     """Handles image preprocessing pipeline for OCR optimization"""
@@ -11,43 +14,67 @@ class ImagePreprocessor:
     def __init__(self):
         """Initialize preprocessor with default parameters"""
         self.kernel_size = (5, 5)  # Gaussian blur kernel
-        self.block_size = 11       # Adaptive threshold block size
-        self.c_value = 2           # Adaptive threshold constant
+        self.block_size = 11       # Gaussian adaptive threshold block size
+        self.c_value = 2           # Gaussian adaptive threshold constant
+        self.clahe_clip_limit = 2.0  # CLAHE contrast limit
+        self.clahe_tile_grid = 8     # CLAHE tiles per side
+        
+        # Binarization stage: 'sauvola', 'wolf', 'otsu_tiles' or 'gaussian' (block_size/c_value above)
+        # Window sizes should span two to three text lines; see tests/benchmark_binarization.py
+        self.binarization = 'sauvola'
+        self.binarization_params = {'window': 31, 'k': 0.2}
         
         # Document detection parameters
         self.min_contour_area = 10000  # Minimum area for document detection (lowered for better detection)
         self.max_contour_area_ratio = 0.95  # Maximum ratio of frame area
         
-    def preprocess(self, frame):
+        # Skew estimation parameters (projection profile on a downsampled image)
+        self.skew_sample_size = 400      # Longest side of the image used for estimation
+        self.max_skew_angle = 15.0       # Search range in degrees (+/-)
+        self.min_skew_angle = 0.5        # Only rotate when the page is tilted at least this much
+        self.min_skew_confidence = 0.3   # Only rotate when the estimate is trustworthy
+        self.last_skew_angle = 0.0
+        self.last_skew_confidence = 0.0
+        
+        # Noise-adaptive denoising: noise sigma thresholds select the strategy,
+        # measured costs (EMA, ms per megapixel) keep it within the frame budget
+        self.denoise_budget_ms = 25.0
+        self.noise_thresholds = {'median': 3.0, 'bilateral': 6.0, 'nlm': 10.0}
+        self.denoise_cost = {'median': 1.5, 'bilateral': 6.0, 'nlm': 500.0}
+        self.denoise_cost_decay = 0.95  # Per frame a needed strategy is skipped for its cost
+        self._stale_costs = set()       # Strategies whose estimate decayed since they last ran
+        self.nlm_scale = 0.5  # NLM runs on the text ROI at this resolution
+        self.last_noise_sigma = 0.0
+        self.last_denoise_strategy = 'none'
+    
+    def preprocess(self, frame, roi=None):
         """
         Apply full preprocessing pipeline to the input frame
         
         Args:
-            frame (numpy.ndarray): Input BGR image from camera
+            frame (numpy.ndarray): Input BGR (or grayscale) image from camera
+            roi (tuple): Optional (x, y, w, h) text region, e.g. the detected page
             
         Returns:
             numpy.ndarray: Preprocessed binary image ready for OCR
         """
-        # Step 1: Convert to grayscale
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        # Step 1: Convert to grayscale (cameras with gray=True deliver the luma plane already)
+        gray = frame if frame.ndim == 2 else cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        
+        # Step 1b: Denoise only as much as the measured noise level requires
+        gray = self.adaptive_denoise(gray, roi)
         
         # Step 2: Apply Gaussian blur to reduce noise
         blurred = cv2.GaussianBlur(gray, self.kernel_size, 0)
         
         # Step 3: Enhance contrast using CLAHE (Contrast Limited Adaptive Histogram Equalization)
-        clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))
+        clahe = cv2.createCLAHE(clipLimit=self.clahe_clip_limit,
+                                tileGridSize=(self.clahe_tile_grid, self.clahe_tile_grid))
         enhanced = clahe.apply(blurred)
         
-        # Step 4: Apply adaptive thresholding for better text extraction
+        # Step 4: Local thresholding for better text extraction
         # This works well for varying lighting conditions
-        threshold = cv2.adaptiveThreshold(
-            enhanced,
-            255,
-            cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
-            cv2.THRESH_BINARY,
-            self.block_size,
-            self.c_value
-        )
+        threshold = self.binarize(enhanced)
         
         # Step 5: Morphological operations to reduce noise
         kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (2, 2))
@@ -55,6 +82,73 @@ class ImagePreprocessor:
         
         return morph
     
+    def configure(self, **settings):
+        """
+        Change preprocessing parameters (e.g. from a performance profile)
+        
+        Args:
+            **settings: Attribute values, e.g. clahe_clip_limit=2.5, min_contour_area=20000;
+                binarization and binarization_params select the binarization method
+        
+        Raises:
+            ValueError: Unknown parameter (nothing is changed)
+        """
+        self.check_settings(**settings)
+        if 'binarization' in settings or 'binarization_params' in settings:
+            self.set_binarization(settings.pop('binarization', self.binarization),
+                                  **settings.pop('binarization_params', self.binarization_params))
+        for name, value in settings.items():
+            if name == 'kernel_size':
+                value = tuple(value) if isinstance(value, (list, tuple)) else (value, value)
+            setattr(self, name, value)
+    
+    def check_settings(self, **settings):
+        """
+        Check parameters for configure() without applying them
+        
+        Args:
+            **settings: As for configure()
+        
+        Raises:
+            ValueError: Unknown parameter, invalid value (see performance_profiles.SETTINGS)
+                or unknown binarization method
+        """
+        # Imported here: the utils package imports ocr, which imports this module
+        from utils.performance_profiles import check_section
+        check_section('preprocess', settings)
+        method = settings.get('binarization', self.binarization)
+        if method not in BINARIZATION_METHODS:
+            raise ValueError(f"Unknown binarization method '{method}' "
+                             f"(choose from {', '.join(BINARIZATION_METHODS)})")
+    
+    def binarize(self, gray):
+        """
+        Apply the configured binarization method
+        
+        Args:
+            gray (numpy.ndarray): Grayscale image
+        
+        Returns:
+            numpy.ndarray: Binary image (text black on white)
+        """
+        if self.binarization == 'gaussian' and not self.binarization_params:
+            return binarize(gray, 'gaussian', window=self.block_size, c=self.c_value)
+        return binarize(gray, self.binarization, **self.binarization_params)
+    
+    def set_binarization(self, method, **params):
+        """
+        Select the binarization method
+        
+        Args:
+            method (str): 'gaussian', 'sauvola', 'wolf' or 'otsu_tiles'
+            **params: Method parameters, e.g. window=31, k=0.2 or tile=64
+        """
+        if method not in BINARIZATION_METHODS:
+            raise ValueError(f"Unknown binarization method '{method}' "
+                             f"(choose from {', '.join(BINARIZATION_METHODS)})")
+        self.binarization = method
+        self.binarization_params = params
+    
     def denoise(self, image):
         """
         Additional denoising step (optional)
@@ -67,35 +161,269 @@ class ImagePreprocessor:
         """
         return cv2.fastNlMeansDenoising(image, None, 10, 7, 21)
     
-    def deskew(self, image):
+    def estimate_noise(self, gray):
         """
-        Deskew the image if text is tilted
+        Estimate the noise standard deviation of a grayscale image
+        Uses Immerkaer's Laplacian-difference operator on a 2x decimated image
+        with a median (MAD) estimate, so text edges do not read as noise
         
         Args:
-            image (numpy.ndarray): Input binary image
-            
+            gray (numpy.ndarray): Grayscale image
+        
         Returns:
-            numpy.ndarray: Deskewed image
+            float: Estimated noise sigma in gray levels
+        """
+        sample = gray[::2, ::2].astype(np.float32)
+        h, w = sample.shape[:2]
+        if h < 3 or w < 3:
+            return 0.0
+        
+        kernel = np.array([[1, -2, 1], [-2, 4, -2], [1, -2, 1]], dtype=np.float32)
+        response = np.abs(cv2.filter2D(sample, -1, kernel)[1:-1, 1:-1]).ravel()
+        
+        # The kernel has an L2 norm of 6, and MAD / 0.6745 estimates the std of Gaussian noise
+        median = np.partition(response, response.size // 2)[response.size // 2]
+        return float(median / (0.6745 * 6.0))
+    
+    def _denoise_megapixels(self, strategy, frame_pixels, roi_pixels):
+        """Megapixels a denoising strategy actually processes"""
+        if strategy == 'nlm':
+            return roi_pixels * self.nlm_scale ** 2 / 1e6
+        return frame_pixels / 1e6
+    
+    def select_denoise_strategy(self, sigma, frame_pixels, roi_pixels=None):
+        """
+        Choose the strongest denoising strategy the noise level calls for
+        that still fits within the per-frame time budget
+        
+        Args:
+            sigma (float): Estimated noise level
+            frame_pixels (int): Number of pixels in the frame
+            roi_pixels (int): Number of pixels in the text region (defaults to the frame)
+        
+        Returns:
+            str: 'none', 'median', 'bilateral' or 'nlm'
+        """
+        if roi_pixels is None:
+            roi_pixels = frame_pixels
+        
+        for strategy in ('nlm', 'bilateral', 'median'):
+            if sigma < self.noise_thresholds[strategy]:
+                continue
+            megapixels = self._denoise_megapixels(strategy, frame_pixels, roi_pixels)
+            if self.denoise_cost[strategy] * megapixels <= self.denoise_budget_ms:
+                return strategy
+        return 'none'
+    
+    def adaptive_denoise(self, gray, roi=None):
         """
-        coords = np.column_stack(np.where(image > 0))
-        angle = cv2.minAreaRect(coords)[-1]
+        Measure frame noise and apply a matching denoising strategy
+        
+        Args:
+            gray (numpy.ndarray): Grayscale image
+            roi (tuple): Optional (x, y, w, h) region to restrict NLM denoising to
         
-        if angle < -45:
-            angle = -(90 + angle)
+        Returns:
+            numpy.ndarray: Denoised grayscale image (the input itself if no denoising was needed)
+        """
+        sigma = self.estimate_noise(gray)
+        self.last_noise_sigma = sigma
+        
+        if roi is not None:
+            x, y, w, h = roi
+            x, y = max(0, x), max(0, y)
+            w, h = min(w, gray.shape[1] - x), min(h, gray.shape[0] - y)
+            roi = (x, y, w, h) if w > 0 and h > 0 else None
+        
+        roi_pixels = roi[2] * roi[3] if roi is not None else gray.size
+        strategy = self.select_denoise_strategy(sigma, gray.size, roi_pixels)
+        self.last_denoise_strategy = strategy
+        
+        # A strategy skipped for its cost is never measured, so one slow frame
+        # would exclude it for good; let the estimate decay until it is tried again
+        for skipped in ('nlm', 'bilateral', 'median'):
+            if skipped == strategy:
+                break
+            if sigma >= self.noise_thresholds[skipped]:
+                self.denoise_cost[skipped] *= self.denoise_cost_decay
+                self._stale_costs.add(skipped)
+        
+        if strategy == 'none':
+            return gray
+        
+        started = time.perf_counter()
+        if strategy == 'median':
+            result = cv2.medianBlur(gray, 3)
+        elif strategy == 'bilateral':
+            result = cv2.bilateralFilter(gray, 5, sigma * 4, 5)
         else:
-            angle = -angle
+            result = self._denoise_region_nlm(gray, roi, sigma)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        
+        # Keep the cost model current for this machine (a decayed estimate is
+        # replaced outright, so a strategy that is still too slow drops out again)
+        megapixels = self._denoise_megapixels(strategy, gray.size, roi_pixels)
+        if megapixels > 0:
+            observed = elapsed_ms / megapixels
+            if strategy in self._stale_costs:
+                self._stale_costs.discard(strategy)
+                self.denoise_cost[strategy] = observed
+            else:
+                self.denoise_cost[strategy] = 0.8 * self.denoise_cost[strategy] + 0.2 * observed
         
-        # Rotate the image to deskew
+        return result
+    
+    def _denoise_region_nlm(self, gray, roi, sigma):
+        """
+        Run non-local means on the text region only, at reduced resolution
+        
+        Args:
+            gray (numpy.ndarray): Grayscale image
+            roi (tuple): (x, y, w, h) region or None for the whole image
+            sigma (float): Estimated noise level, used as filter strength
+        
+        Returns:
+            numpy.ndarray: Image with the region denoised
+        """
+        x, y, w, h = roi if roi is not None else (0, 0, gray.shape[1], gray.shape[0])
+        region = gray[y:y + h, x:x + w]
+        
+        small_size = (max(1, int(w * self.nlm_scale)), max(1, int(h * self.nlm_scale)))
+        small = cv2.resize(region, small_size, interpolation=cv2.INTER_AREA)
+        denoised = cv2.fastNlMeansDenoising(small, None, float(sigma), 5, 11)
+        
+        result = gray.copy()
+        result[y:y + h, x:x + w] = cv2.resize(denoised, (w, h), interpolation=cv2.INTER_LINEAR)
+        return result
+    
+    def estimate_skew(self, image):
+        """
+        Estimate the text skew angle using projection profiles on a downsampled image
+        
+        Foreground pixels are projected onto the vertical axis for a range of
+        candidate angles; the angle whose row histogram is sharpest aligns the
+        text lines. Only a few thousand points are used, so this stays cheap
+        even for full 720p frames.
+        
+        Args:
+            image (numpy.ndarray): Binary image (dark text on white background)
+            
+        Returns:
+            tuple: (angle: float, confidence: float) where angle is in degrees
+                   (pass to rotate() to deskew) and confidence is 0.0 to 1.0
+        """
+        h, w = image.shape[:2]
+        scale = min(1.0, self.skew_sample_size / float(max(h, w)))
+        small = cv2.resize(image, (max(1, int(w * scale)), max(1, int(h * scale))),
+                           interpolation=cv2.INTER_AREA)
+        
+        # Text pixels are dark; after area downsampling anything noticeably dark counts
+        ys, xs = np.nonzero(small < 160)
+        if len(xs) < 50:
+            return 0.0, 0.0
+        
+        # Cap the number of points to bound the cost on dense frames
+        if len(xs) > 20000:
+            step = len(xs) // 20000 + 1
+            ys, xs = ys[::step], xs[::step]
+        
+        # Sub-pixel jitter avoids favouring 0 degrees, where points fall exactly on pixel rows
+        rng = np.random.default_rng(0)
+        xs = xs + rng.random(len(xs), dtype=np.float32) - small.shape[1] / 2.0
+        ys = ys + rng.random(len(ys), dtype=np.float32) - small.shape[0] / 2.0
+        
+        coarse = np.arange(-self.max_skew_angle, self.max_skew_angle + 0.5, 1.0)
+        coarse_scores = self._projection_scores(xs, ys, coarse)
+        best = coarse[int(np.argmax(coarse_scores))]
+        
+        fine = np.arange(best - 1.0, best + 1.05, 0.1)
+        fine_scores = self._projection_scores(xs, ys, fine)
+        angle = round(float(fine[int(np.argmax(fine_scores))]), 1)
+        
+        # A sharp peak relative to the typical angle means well-defined text lines
+        peak = float(coarse_scores.max())
+        baseline = float(np.median(coarse_scores))
+        confidence = (peak - baseline) / peak if peak > 0 else 0.0
+        
+        return angle, confidence
+    
+    def _projection_scores(self, xs, ys, angles):
+        """
+        Score candidate angles by the sharpness of the horizontal projection profile
+        
+        Args:
+            xs (numpy.ndarray): Centered x coordinates of foreground pixels
+            ys (numpy.ndarray): Centered y coordinates of foreground pixels
+            angles (numpy.ndarray): Candidate angles in degrees
+        
+        Returns:
+            numpy.ndarray: Sum of squared row counts per angle
+        """
+        radians = np.deg2rad(angles).astype(np.float32)[:, None]
+        # Row coordinate after cv2.getRotationMatrix2D(center, angle, 1.0)
+        rows = np.rint(ys[None, :] * np.cos(radians) - xs[None, :] * np.sin(radians)).astype(np.int64)
+        rows -= rows.min()
+        n_bins = int(rows.max()) + 1
+        
+        # One bincount for all angles by giving each angle its own bin range
+        offsets = (np.arange(len(angles)) * n_bins)[:, None]
+        counts = np.bincount((rows + offsets).ravel(), minlength=len(angles) * n_bins)
+        counts = counts.reshape(len(angles), n_bins).astype(np.float64)
+        return (counts ** 2).sum(axis=1)
+    
+    def rotate(self, image, angle):
+        """
+        Rotate an image around its center, filling the border with white
+        
+        Args:
+            image (numpy.ndarray): Input image
+            angle (float): Rotation angle in degrees (counter-clockwise)
+        
+        Returns:
+            numpy.ndarray: Rotated image
+        """
         (h, w) = image.shape[:2]
         center = (w // 2, h // 2)
         M = cv2.getRotationMatrix2D(center, angle, 1.0)
-        rotated = cv2.warpAffine(
+        return cv2.warpAffine(
             image, M, (w, h),
-            flags=cv2.INTER_CUBIC,
-            borderMode=cv2.BORDER_REPLICATE
+            flags=cv2.INTER_NEAREST,
+            borderMode=cv2.BORDER_CONSTANT,
+            borderValue=255
         )
+    
+    def deskew(self, image):
+        """
+        Deskew the image if text is tilted
+        
+        Args:
+            image (numpy.ndarray): Input binary image
+        
+        Returns:
+            numpy.ndarray: Deskewed image
+        """
+        angle, _ = self.estimate_skew(image)
+        return self.rotate(image, angle)
+    
+    def auto_deskew(self, image):
+        """
+        Deskew only when the estimated tilt is significant and reliable
+        
+        Args:
+            image (numpy.ndarray): Input binary image
+        
+        Returns:
+            tuple: (image: numpy.ndarray, applied_angle: float) where applied_angle
+                   is 0.0 when no rotation was performed
+        """
+        angle, confidence = self.estimate_skew(image)
+        self.last_skew_angle = angle
+        self.last_skew_confidence = confidence
+        
+        if abs(angle) < self.min_skew_angle or confidence < self.min_skew_confidence:
+            return image, 0.0
         
-        return rotated
+        return self.rotate(image, angle), angle
     
     def get_preprocessed_for_display(self, frame):
         """
@@ -117,13 +445,13 @@ class ImagePreprocessor:
         Uses contour detection to find rectangular objects
         
         Args:
-            frame (numpy.ndarray): Input BGR image
+            frame (numpy.ndarray): Input BGR or grayscale image
             
         Returns:
             tuple: (has_document: bool, largest_contour: numpy.ndarray or None)
         """
         # Convert to grayscale
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        gray = frame if frame.ndim == 2 else cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
         
         # Apply Gaussian blur
         blurred = cv2.GaussianBlur(gray, (5, 5), 0)
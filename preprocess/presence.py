@@ -0,0 +1,76 @@
+"""
+Presence Detection Module - Minimal page-presence check on tiny thumbnails
+Used while the application idles, instead of the full document detection
+"""
+import cv2
+import numpy as np
+
+
+class PresenceDetector:
+    """Detects that something page-like entered the view using a 160px thumbnail"""
+    
+    def __init__(self, thumbnail_width=160):
+        """
+        Initialize presence detector
+        
+        Args:
+            thumbnail_width (int): Width of the thumbnail used for detection
+        """
+        self.thumbnail_width = thumbnail_width
+        self.background = None
+        
+        self.min_edge_density = 0.04   # Share of edge pixels that suggests printed content
+        self.change_threshold = 18.0   # Mean gray-level change against the idle background
+    
+    def thumbnail(self, frame):
+        """
+        Create a small, slightly blurred grayscale thumbnail
+        
+        Args:
+            frame (numpy.ndarray): BGR or grayscale frame of any resolution
+            
+        Returns:
+            numpy.ndarray: Grayscale thumbnail
+        """
+        h, w = frame.shape[:2]
+        size = (self.thumbnail_width, max(1, int(h * self.thumbnail_width / w)))
+        small = cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+        if small.ndim == 3:
+            small = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+        return cv2.GaussianBlur(small, (3, 3), 0)
+    
+    def reset_background(self, frame):
+        """
+        Remember the empty scene so changes against it can be detected
+        
+        Args:
+            frame (numpy.ndarray): Current (empty) frame
+        """
+        self.background = self.thumbnail(frame)
+    
+    def is_present(self, frame):
+        """
+        Check whether a page (or anything new) appears in the frame
+        
+        Args:
+            frame (numpy.ndarray): Current frame
+            
+        Returns:
+            bool: True if the full pipeline should resume
+        """
+        thumb = self.thumbnail(frame)
+        
+        # Printed text produces many edges even at thumbnail size
+        edges = cv2.Canny(thumb, 50, 150)
+        edge_density = np.count_nonzero(edges) / edges.size
+        if edge_density >= self.min_edge_density:
+            return True
+        
+        # A plain page held up still changes the scene noticeably. The background
+        # is re-taken from the first frame of a new resolution (e.g. the first idle
+        # frame after switching from 16:9 capture to 320x240)
+        if self.background is None or self.background.shape != thumb.shape:
+            self.background = thumb
+            return False
+        change = float(cv2.absdiff(thumb, self.background).mean())
+        return change >= self.change_threshold
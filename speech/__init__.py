@@ -1,4 +1,5 @@
 """Text-to-Speech module"""
 from .text_to_speech import TextToSpeech
+from .reading_tracker import ReadingTracker
 
-__all__ = ['TextToSpeech']
+__all__ = ['TextToSpeech', 'ReadingTracker']
@@ -0,0 +1,108 @@
+"""
+Reading Tracker Module - Works out which part of newly stable text has not been read yet
+
+The last spoken words are aligned against each new stable text with a
+word-level sequence matcher. When the page scrolled or a new paragraph came
+into view, only the words after the last aligned anchor are returned, so
+reading continues where it left off instead of restarting from the top.
+Text without a reliable anchor is treated as a new page and read in full.
+"""
+from difflib import SequenceMatcher
+
+
+def _normalize(word):
+    """Comparison key of a word (case and punctuation are ignored)"""
+    return ''.join(char for char in word.lower() if char.isalnum())
+
+
+class ReadingTracker:
+    """Tracks the reading position across changing OCR text"""
+    
+    def __init__(self, history_words=400, min_anchor_words=3, min_block_words=2):
+        """
+        Initialize the tracker
+        
+        Args:
+            history_words (int): How many recently read words are kept for alignment
+            min_anchor_words (int): Aligned words needed to treat text as a continuation
+            min_block_words (int): Shortest run of aligned words that counts as an anchor
+                                   (single common words like "the" are not anchors)
+        """
+        self.history_words = history_words
+        self.min_anchor_words = min_anchor_words
+        self.min_block_words = min_block_words
+        self.spoken = []        # Recently read words (original spelling)
+        self.spoken_keys = []   # Their comparison keys
+        self.words_read = 0     # Total words handed to speech since the last reset
+        self.words_skipped = 0  # Words not re-read thanks to alignment
+    
+    def reset(self):
+        """Forget the reading position (next text is read in full)"""
+        self.spoken = []
+        self.spoken_keys = []
+        self.words_read = 0
+    
+    def unread_part(self, text):
+        """
+        Get the part of text that has not been read yet and advance the reading position
+        
+        Args:
+            text (str): Newly stable text
+        
+        Returns:
+            str: Words to read next ('' if everything was already read)
+        """
+        words = text.split()
+        if not words:
+            return ""
+        keys = [_normalize(word) for word in words]
+        
+        anchor_end = self._anchor_end(keys)
+        if anchor_end is None:
+            # No overlap with what was read: a new page, read all of it
+            self.reset()
+            unread = words
+        else:
+            unread = words[anchor_end:]
+            self.words_skipped += anchor_end
+        
+        self._remember(unread)
+        return ' '.join(unread)
+    
+    def _anchor_end(self, keys):
+        """
+        Align the new words with the read history
+        
+        Args:
+            keys (list): Comparison keys of the new words
+        
+        Returns:
+            int: Index in keys just after the last aligned anchor, or None without an anchor
+        """
+        if not self.spoken_keys:
+            return None
+        
+        matcher = SequenceMatcher(None, self.spoken_keys, keys, autojunk=False)
+        min_block = min(self.min_block_words, len(keys))
+        blocks = [block for block in matcher.get_matching_blocks() if block.size >= min_block]
+        
+        aligned = sum(block.size for block in blocks)
+        if not blocks or aligned < min(self.min_anchor_words, len(keys)):
+            return None
+        
+        # Words after the anchor that line up with words read after it are OCR
+        # variants of already read text (e.g. "rnat" for "mat"), not new text
+        last = blocks[-1]
+        read_after = len(self.spoken_keys) - (last.a + last.size)
+        return min(len(keys), last.b + last.size + read_after)
+    
+    def _remember(self, words):
+        """Append read words to the bounded history"""
+        if not words:
+            return
+        self.spoken.extend(words)
+        self.spoken_keys.extend(_normalize(word) for word in words)
+        self.words_read += len(words)
+        if len(self.spoken) > self.history_words:
+            del self.spoken[:-self.history_words]
+            del self.spoken_keys[:-self.history_words]
@@ -1,28 +1,63 @@
 """
 Text-to-Speech Module - Converts text to speech using pyttsx3
 """
-import pyttsx3
+import queue
 import threading
 
 
 class TextToSpeech:
     """Handles text-to-speech conversion using pyttsx3 (offline)"""
     
-    def __init__(self, rate=150, volume=1.0):
+    def __init__(self, rate=150, volume=1.0, lazy=False):
         """
         Initialize TTS engine
         
         Args:
             rate (int): Speech rate (words per minute)
             volume (float): Volume level (0.0 to 1.0)
+            lazy (bool): Defer pyttsx3 start-up and voice enumeration until
+                warm_up() is called or the engine is first used
         """
-        self.engine = pyttsx3.init()
+        self._engine = None
+        self._engine_lock = threading.RLock()
         self.rate = rate
         self.volume = volume
         self.is_speaking = False
+        self._speech_lock = threading.Lock()  # Held while the engine speaks (speak() and the queue)
+        self._queue = queue.Queue()  # Chunks waiting for enqueue()'s speaker thread
+        self._queue_lock = threading.Lock()  # Guards starting and exiting the speaker thread
+        self._queue_running = False
         
         # Configure TTS properties
-        self.configure_engine()
+        if not lazy:
+            self.warm_up()
+    
+    @property
+    def engine(self):
+        """pyttsx3 engine, created on first access"""
+        if self._engine is None:
+            self.warm_up()
+        return self._engine
+    
+    def is_ready(self):
+        """Check whether the speech engine has been initialized"""
+        return self._engine is not None
+    
+    def warm_up(self):
+        """
+        Import pyttsx3, start the driver and select a voice
+        Safe to call from a background thread; only the first call does work
+        
+        Returns:
+            pyttsx3.Engine: The initialized engine
+        """
+        with self._engine_lock:
+            if self._engine is None:
+                import pyttsx3  # Heavy import (platform driver), deferred until needed
+                
+                self._engine = pyttsx3.init()
+                self.configure_engine()
+        return self._engine
         
     def configure_engine(self):
         """Configure TTS engine properties"""
@@ -52,22 +87,69 @@ class TextToSpeech:
             print("⚠ No text to speak")
             return
         
-        if self.is_speaking:
+        if not self._speech_lock.acquire(blocking=False):
             print("⚠ Already speaking, please wait...")
             return
         
         if blocking:
             # Blocking mode - wait for speech to complete
-            self._speak_blocking(text)
+            self._speak_and_release(text)
         else:
-            # Non-blocking mode - speak in background thread
-            thread = threading.Thread(target=self._speak_blocking, args=(text,))
+            # Non-blocking mode - speak in background thread (it releases the lock)
+            thread = threading.Thread(target=self._speak_and_release, args=(text,))
             thread.daemon = True
             thread.start()
     
+    def _speak_and_release(self, text):
+        """Speak text and release the speech lock acquired by speak()"""
+        try:
+            self._speak_blocking(text)
+        finally:
+            self._speech_lock.release()
+    
+    def enqueue(self, text):
+        """
+        Queue text to be spoken after everything queued before it
+        Unlike speak(), nothing is dropped while speech is in progress
+        
+        Args:
+            text (str): Text to speak
+        """
+        if not text or not text.strip():
+            return
+        
+        # Under the lock the speaker thread either sees this chunk or has cleared
+        # _queue_running, so a chunk is never left without a thread to speak it
+        with self._queue_lock:
+            self._queue.put(text)
+            if not self._queue_running:
+                self._queue_running = True
+                thread = threading.Thread(target=self._speak_queue, name='tts-queue')
+                thread.daemon = True
+                thread.start()
+    
+    def pending(self):
+        """Number of queued chunks not spoken yet"""
+        return self._queue.qsize()
+    
+    def _speak_queue(self):
+        """Speak queued chunks in order until the queue stays empty"""
+        while True:
+            try:
+                text = self._queue.get(timeout=1.0)
+            except queue.Empty:
+                with self._queue_lock:
+                    if self._queue.empty():
+                        self._queue_running = False
+                        return
+                continue
+            # Speech started with speak() shares the engine; wait for it to finish
+            with self._speech_lock:
+                self._speak_blocking(text)
+    
     def _speak_blocking(self, text):
         """
-        Internal method to speak text in blocking mode
+        Internal method to speak text in blocking mode (the caller holds _speech_lock)
         
         Args:
             text (str): Text to speak
@@ -83,12 +165,35 @@ class TextToSpeech:
             self.is_speaking = False
     
     def stop(self):
-        """Stop current speech"""
-        if self.is_speaking:
+        """Stop current speech and drop queued chunks"""
+        while not self._queue.empty():
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                break
+        if self.is_speaking and self._engine is not None:
             self.engine.stop()
             self.is_speaking = False
             print("✓ Speech stopped")
     
+    def configure(self, rate=None, volume=None):
+        """
+        Change rate and/or volume without starting the engine
+        (an engine that is not running yet picks them up in warm_up())
+        
+        Args:
+            rate (int): Speech rate in words per minute (unchanged if None)
+            volume (float): Volume level 0.0 to 1.0 (unchanged if None)
+        """
+        if rate is not None:
+            self.rate = rate
+        if volume is not None:
+            self.volume = max(0.0, min(1.0, volume))
+        if self._engine is not None:
+            with self._engine_lock:
+                self._engine.setProperty('rate', self.rate)
+                self._engine.setProperty('volume', self.volume)
+    
     def set_rate(self, rate):
         """
         Change speech rate
@@ -0,0 +1,147 @@
+# Binarization Benchmark for PageVision OCR
+# Compares the binarization methods on synthetic pages (small and large text,
+# even and uneven lighting) for speed, pixel accuracy and, when Tesseract is
+# installed, OCR accuracy. Accuracy is measured on the full preprocessing
+# pipeline output; timings cover the binarization stage alone.
+#
+# Run from the project root:
+#   python tests/benchmark_binarization.py
+
+import difflib
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from preprocess.binarization import METHODS, binarize
+from preprocess.preprocess import ImagePreprocessor
+
+LINES = [
+    "The quick brown fox jumps over the lazy dog",
+    "Reading printed pages aloud for everyone",
+    "Binarization turns gray pixels into ink",
+    "Shadows and glare should not hide words",
+]
+
+# Parameters per method; window sizes scale with the text height
+SETTINGS = {
+    'gaussian': {'window': 11, 'c': 2},
+    'sauvola': {'window': 31, 'k': 0.2},
+    'wolf': {'window': 31, 'k': 0.5},
+    'otsu_tiles': {'tile': 64},
+}
+
+
+def render_page(scale, width=1280, height=720):
+    """Black text on white paper, returns (gray, ground truth ink mask, text)"""
+    page = np.full((height, width), 255, dtype=np.uint8)
+    line_height = int(40 * scale)
+    y = line_height
+    text = []
+    for line in LINES:
+        if y + line_height > height:
+            break
+        cv2.putText(page, line, (30, y), cv2.FONT_HERSHEY_SIMPLEX, scale, 0, max(1, int(2 * scale)), cv2.LINE_AA)
+        text.append(line)
+        y += int(line_height * 1.6)
+    return page, page < 128, ' '.join(text)
+
+
+def apply_lighting(page, uneven, seed=0):
+    """Simulate camera capture: low contrast, optional gradient and shadow, sensor noise"""
+    height, width = page.shape
+    image = page.astype(np.float32) * 0.6 + 60  # Ink ~60, paper ~213
+    if uneven:
+        yy, xx = np.mgrid[0:height, 0:width].astype(np.float32)
+        gradient = 0.45 + 0.55 * (xx / width)                                  # Dark left edge
+        shadow = 1.0 - 0.35 * np.exp(-((xx - width * 0.6) ** 2 + (yy - height * 0.7) ** 2) / (2 * 180.0 ** 2))
+        image *= gradient * shadow
+    rng = np.random.default_rng(seed)
+    image += rng.normal(0, 4, image.shape)
+    return np.clip(image, 0, 255).astype(np.uint8)
+
+
+def f_measure(binary, truth):
+    """Pixel F-measure of detected ink against the ground truth"""
+    ink = binary == 0
+    true_positive = np.count_nonzero(ink & truth)
+    if true_positive == 0:
+        return 0.0
+    precision = true_positive / np.count_nonzero(ink)
+    recall = true_positive / np.count_nonzero(truth)
+    return 2 * precision * recall / (precision + recall)
+
+
+def ocr_accuracy(binary, expected):
+    """Character similarity of Tesseract output to the rendered text (None without Tesseract)"""
+    try:
+        import pytesseract
+        text = pytesseract.image_to_string(binary, config='--oem 3 --psm 6')
+    except Exception:
+        return None
+    return difflib.SequenceMatcher(None, ' '.join(text.split()), expected).ratio()
+
+
+def pipeline_input(preprocessor, gray):
+    """The image the binarization stage sees inside ImagePreprocessor.preprocess"""
+    blurred = cv2.GaussianBlur(gray, preprocessor.kernel_size, 0)
+    return cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8)).apply(blurred)
+
+
+def time_method(gray, method, repeats=10):
+    """Mean runtime in milliseconds"""
+    start = time.perf_counter()
+    for _ in range(repeats):
+        binarize(gray, method, **SETTINGS[method])
+    return (time.perf_counter() - start) / repeats * 1000
+
+
+def main():
+    print("=" * 72)
+    print("PageVision OCR - Binarization Benchmark (1280x720)")
+    print("=" * 72)
+    
+    scenarios = [
+        ('small text, even light', 0.8, False),
+        ('small text, uneven light', 0.8, True),
+        ('large text, even light', 2.5, False),
+        ('large text, uneven light', 2.5, True),
+    ]
+    
+    preprocessor = ImagePreprocessor()
+    for name, scale, uneven in scenarios:
+        page, truth, expected = render_page(scale)
+        gray = apply_lighting(page, uneven)
+        frame = cv2.cvtColor(gray, cv2.COLOR_GRAY2BGR)
+        stage_input = pipeline_input(preprocessor, gray)
+        print(f"\n{name}")
+        print(f"  {'method':12s} {'ms':>8s} {'F-measure':>10s} {'OCR':>8s}")
+        for method in METHODS:
+            preprocessor.set_binarization(method, **SETTINGS[method])
+            binary = preprocessor.preprocess(frame)
+            accuracy = ocr_accuracy(binary, expected)
+            ocr_column = f"{accuracy:8.3f}" if accuracy is not None else f"{'n/a':>8s}"
+            print(f"  {method:12s} {time_method(stage_input, method):8.1f} "
+                  f"{f_measure(binary, truth):10.3f} {ocr_column}")
+    
+    # Cost must not depend on the window size for the integral-image methods
+    print("\nRuntime (ms) vs window size")
+    page, _, _ = render_page(1.0)
+    gray = apply_lighting(page, True)
+    for method in ('gaussian', 'sauvola', 'wolf'):
+        timings = []
+        for window in (11, 31, 71, 151):
+            params = dict(SETTINGS[method], window=window)
+            start = time.perf_counter()
+            for _ in range(5):
+                binarize(gray, method, **params)
+            timings.append((time.perf_counter() - start) / 5 * 1000)
+        print(f"  {method:12s} " + ' '.join(f"{w:>4d}:{t:6.1f}" for w, t in zip((11, 31, 71, 151), timings)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+# Frame Transport Benchmark for PageVision OCR
+# Sends camera-sized frames to a worker process and back, once through a
+# SharedFramePool (only the FrameHandle is queued) and once pickled through a
+# multiprocessing.Queue, and reports the round trip per frame. The worker reads
+# every frame and returns a checksum, which must match on both paths.
+#
+# Run from the project root (no camera or Tesseract needed):
+#   python tests/benchmark_frame_transport.py [--frames 300] [--width 1280] [--height 720]
+
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.frame_transport import SharedFramePool
+
+
+def checksum(image):
+    """Cheap digest that reads the frame on the worker side"""
+    return int(image[::8, ::8].sum(dtype=np.int64))
+
+
+def shared_worker(pool, tasks, results):
+    """Map each handle, reply with the checksum and release the slot"""
+    for handle in iter(tasks.get, None):
+        with pool.frame(handle) as image:
+            results.put(checksum(image))
+    pool.close()
+
+
+def pickled_worker(tasks, results):
+    """Receive each frame pickled and reply with the checksum"""
+    while True:
+        image = tasks.get()
+        if image is None:
+            break
+        results.put(checksum(image))
+
+
+def round_trips(frames, send, results):
+    """Send frames one at a time, wait for each reply and return (ms per frame, checksums)"""
+    replies = []
+    start = time.perf_counter()
+    for frame in frames:
+        send(frame)
+        replies.append(results.get())
+    return 1000.0 * (time.perf_counter() - start) / len(frames), replies
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Shared-memory vs pickled frame transport benchmark")
+    parser.add_argument('--frames', type=int, default=300)
+    parser.add_argument('--width', type=int, default=1280)
+    parser.add_argument('--height', type=int, default=720)
+    args = parser.parse_args()
+    
+    print("=" * 60)
+    print("PageVision OCR - Frame Transport Benchmark")
+    print("=" * 60)
+    
+    rng = np.random.default_rng(0)
+    shape = (args.height, args.width, 3)
+    frames = [rng.integers(0, 256, shape, dtype=np.uint8) for _ in range(8)]
+    frames = [frames[i % len(frames)] for i in range(args.frames)]
+    expected = [checksum(frame) for frame in frames]
+    print(f"  {args.frames} frames of {args.width}x{args.height} ({frames[0].nbytes / 1e6:.1f} MB)")
+    
+    pool = SharedFramePool(slots=4, max_shape=shape)
+    tasks, results = multiprocessing.Queue(), multiprocessing.Queue()
+    worker = multiprocessing.Process(target=shared_worker, args=(pool, tasks, results))
+    worker.start()
+    shared_ms, shared_sums = round_trips(frames, lambda frame: tasks.put(pool.write(frame)), results)
+    tasks.put(None)
+    worker.join()
+    leaked = pool.in_use()
+    pool.close()
+    
+    tasks, results = multiprocessing.Queue(), multiprocessing.Queue()
+    worker = multiprocessing.Process(target=pickled_worker, args=(tasks, results))
+    worker.start()
+    pickled_ms, pickled_sums = round_trips(frames, tasks.put, results)
+    tasks.put(None)
+    worker.join()
+    
+    print(f"\n  {'transport':22s} {'ms/frame':>9s}")
+    print(f"  {'SharedFramePool':22s} {shared_ms:9.2f}")
+    print(f"  {'pickled Queue':22s} {pickled_ms:9.2f}")
+    print(f"  Speed-up: {pickled_ms / shared_ms:.1f}x")
+    
+    if shared_sums != expected or pickled_sums != expected:
+        print("\n✗ Worker read different pixels than were sent")
+        return 1
+    if leaked:
+        print(f"\n✗ {leaked} frame slot(s) still referenced after the run")
+        return 1
+    print("\n✓ All frames arrived intact and every slot was released")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,97 @@
+# Job Queue Scaling Benchmark for PageVision OCR
+# Drains a batch of simulated pages (a fixed sleep instead of OCR, so only the
+# queue overhead is measured) with 1, 2, 4 and 8 worker processes against a
+# local SQLite queue, and once through a JobBroker, and reports pages/s and the
+# speed-up over one worker. Every page must end up with exactly one result.
+#
+# Run from the project root (no Tesseract needed):
+#   python tests/benchmark_job_queue.py [--pages 400] [--page-ms 20] [--workers 1 2 4 8]
+
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from batch_ocr import run_worker
+from utils.job_queue import JobQueue, JobBroker, RemoteJobQueue
+
+
+class SimulatedPage:
+    """Stands in for PageProcessor: sleeps for the page time"""
+    
+    def __init__(self, seconds):
+        self.seconds = seconds
+    
+    def __call__(self, source):
+        time.sleep(self.seconds)
+        return {'text': os.path.basename(source), 'boxes': [], 'width': 1, 'height': 1}
+
+
+def _worker(queue_path, broker_port, name, seconds):
+    """Entry point of one worker process"""
+    queue = RemoteJobQueue('127.0.0.1', broker_port) if broker_port else JobQueue(queue_path)
+    run_worker(queue, name, SimulatedPage(seconds))
+
+
+def drain(directory, label, pages, workers, seconds, broker=False):
+    """Submit pages to a fresh queue, drain it with worker processes and return pages/s"""
+    queue_path = os.path.join(directory, f'{label}.db')
+    queue = JobQueue(queue_path)
+    queue.submit(label, [f'/pages/{label}/page_{i:05d}.png' for i in range(pages)])
+    server = None
+    if broker:
+        server = JobBroker(queue, port=0)
+        server.start()
+    
+    processes = [multiprocessing.Process(target=_worker,
+                                         args=(queue_path, server.port if server else None, f'w{i}', seconds))
+                 for i in range(workers)]
+    start = time.perf_counter()
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+    elapsed = time.perf_counter() - start
+    
+    if server is not None:
+        server.shutdown()
+        server.server_close()
+    results = queue.results(label)
+    if len(results) != pages or len({source for source, _ in results}) != pages:
+        raise RuntimeError(f"{label}: {len(results)} results for {pages} pages")
+    return pages / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Job queue worker scaling benchmark")
+    parser.add_argument('--pages', type=int, default=400)
+    parser.add_argument('--page-ms', type=float, default=20.0, help="Simulated OCR time per page")
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--broker-workers', type=int, default=4, help="Workers for the broker run (0: skip)")
+    args = parser.parse_args()
+    seconds = args.page_ms / 1000.0
+    
+    print("=" * 60)
+    print("PageVision OCR - Job Queue Scaling Benchmark")
+    print("=" * 60)
+    print(f"  {args.pages} pages of {args.page_ms:.0f} ms, ideal {1000.0 / args.page_ms:.0f} pages/s per worker")
+    
+    with tempfile.TemporaryDirectory() as directory:
+        print(f"\n  {'queue':8s} {'workers':>7s} {'pages/s':>9s} {'speed-up':>9s}")
+        base = None
+        for workers in args.workers:
+            rate = drain(directory, f'local{workers}', args.pages, workers, seconds)
+            base = base or rate
+            print(f"  {'local':8s} {workers:7d} {rate:9.1f} {rate / base:8.2f}x")
+        if args.broker_workers:
+            rate = drain(directory, 'broker', args.pages, args.broker_workers, seconds, broker=True)
+            print(f"  {'broker':8s} {args.broker_workers:7d} {rate:9.1f} {rate / base:8.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,110 @@
+# Lexicon Correction Benchmark for PageVision OCR
+# Builds a lexicon from a word list (or a synthetic Zipf-weighted one), misspells
+# random entries with one or two edits and measures uncached corrections per
+# second, one word at a time and in page-sized batches. Exits with 1 when the
+# batched rate is below --target.
+#
+# Run from the project root:
+#   python tests/benchmark_lexicon.py [--wordlist words_eng.txt] [--words 50000] [--target 20000]
+
+import argparse
+import os
+import random
+import string
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ocr.lexicon import Lexicon
+
+
+def synthetic_wordlist(path, count, seed=0):
+    """Write count random lowercase words with Zipf-like frequencies"""
+    rng = random.Random(seed)
+    words = set()
+    while len(words) < count:
+        words.add(''.join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(2, 12))))
+    with open(path, 'w', encoding='utf-8') as f:
+        for rank, word in enumerate(sorted(words, key=lambda w: rng.random()), start=1):
+            f.write(f"{word} {max(1, 1000000 // rank)}\n")
+
+
+def misspell(word, rng):
+    """Apply one or two random substitutions, deletions, insertions or transpositions"""
+    chars = list(word)
+    for _ in range(rng.randint(1, 2)):
+        i = rng.randrange(len(chars))
+        edit = rng.random()
+        if edit < 0.4:
+            chars[i] = rng.choice(string.ascii_lowercase)
+        elif edit < 0.6 and len(chars) > 2:
+            del chars[i]
+        elif edit < 0.8 and i + 1 < len(chars):
+            chars[i], chars[i + 1] = chars[i + 1], chars[i]
+        else:
+            chars.insert(i, rng.choice(string.ascii_lowercase))
+    return ''.join(chars)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Lexicon correction throughput benchmark")
+    parser.add_argument('--wordlist', help="Word-frequency list (default: synthetic)")
+    parser.add_argument('--words', type=int, default=50000, help="Synthetic lexicon size")
+    parser.add_argument('--queries', type=int, default=6000)
+    parser.add_argument('--page', type=int, default=300, help="Words per batch")
+    parser.add_argument('--target', type=float, default=20000, help="Required batched words/s")
+    args = parser.parse_args()
+    
+    print("=" * 60)
+    print("PageVision OCR - Lexicon Correction Benchmark")
+    print("=" * 60)
+    
+    with tempfile.TemporaryDirectory() as directory:
+        wordlist = args.wordlist
+        if not wordlist:
+            wordlist = os.path.join(directory, 'words.txt')
+            synthetic_wordlist(wordlist, args.words)
+        index_path = os.path.join(directory, 'bench.lex')
+        start = time.perf_counter()
+        Lexicon.build(wordlist, index_path)
+        print(f"  Build: {time.perf_counter() - start:.2f} s")
+        
+        with open(wordlist, 'r', encoding='utf-8') as f:
+            entries = [line.split()[0].lower() for line in f if line.split()]
+        rng = random.Random(1)
+        queries = list(dict.fromkeys(misspell(rng.choice(entries), rng) for _ in range(args.queries)))
+        
+        # cache_size=0 keeps every lookup uncached
+        lexicon = Lexicon(index_path, cache_size=0)
+        single_count = min(len(queries), 2000)
+        start = time.perf_counter()
+        single = [lexicon.correct(word) for word in queries[:single_count]]
+        single_rate = single_count / (time.perf_counter() - start)
+        
+        start = time.perf_counter()
+        batched = []
+        for i in range(0, len(queries), args.page):
+            batched.extend(lexicon.correct_many(queries[i:i + args.page]))
+        batch_rate = len(queries) / (time.perf_counter() - start)
+        lexicon.close()
+    
+    found = sum(1 for suggestion, _ in batched if suggestion)
+    print(f"  Lexicon: {len(entries)} words, {len(queries)} misspelled queries, {found} corrected")
+    print(f"\n  {'mode':12s} {'words/s':>10s}")
+    print(f"  {'single':12s} {single_rate:10.0f}")
+    print(f"  {'batch of ' + str(args.page):12s} {batch_rate:10.0f}")
+    
+    if batched[:single_count] != single:
+        print("\n✗ Batched and single-word corrections differ")
+        return 1
+    if batch_rate < args.target:
+        print(f"\n✗ Below the target of {args.target:.0f} words/s")
+        return 1
+    print(f"\n✓ Target of {args.target:.0f} words/s met")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,60 @@
+# Idle Wake Check for PageVision OCR
+# Drops an IdleController to idle from a full-resolution 16:9 frame, feeds it
+# empty 320x240 idle frames, then a plain (edge-free) page held up, and checks
+# that the change against the idle background wakes the pipeline.
+#
+# Run from the project root (no camera or Tesseract needed):
+#   python tests/check_idle_wake.py
+
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from preprocess.presence import PresenceDetector
+from utils.idle_mode import IdleController
+
+
+class FakeCamera:
+    """Records the capture settings IdleController switches between"""
+    
+    def __init__(self, width=1280, height=720, fps=30):
+        self.width, self.height, self.fps = width, height, fps
+    
+    def configure(self, width=None, height=None, fps=None):
+        self.width, self.height, self.fps = width, height, fps
+
+
+def scene(width, height, page=False):
+    """Dim empty desk; optionally a bright blank page covering the middle"""
+    frame = np.full((height, width, 3), 60, dtype=np.uint8)
+    if page:
+        frame[height // 6:height * 5 // 6, width // 5:width * 4 // 5] = 235
+    return frame
+
+
+def main():
+    camera = FakeCamera()
+    idle = IdleController(camera, PresenceDetector())
+    idle.enter_idle(scene(1280, 720))
+    
+    for _ in range(5):
+        if idle.update(scene(320, 240)):
+            print("✗ Woke up on an empty idle frame")
+            return 1
+    
+    woke = any(idle.update(scene(320, 240, page=True)) for _ in range(idle.wake_frames))
+    if not woke or idle.is_idle():
+        print("✗ A page held up in front of the camera did not wake the pipeline")
+        return 1
+    if (camera.width, camera.height, camera.fps) != (1280, 720, 30):
+        print(f"✗ Capture settings not restored: {camera.width}x{camera.height} @ {camera.fps}")
+        return 1
+    print("✓ Changed idle frame woke the pipeline and restored 1280x720 @ 30 FPS")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
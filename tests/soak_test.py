@@ -0,0 +1,118 @@
+# Soak Test for PageVision OCR
+# Drives the full pipeline (tracking, preprocessing, OCR, speech, idle mode)
+# from a scripted synthetic camera as fast as it can run, for hours, while a
+# ResourceMonitor records RSS, tracemalloc, thread count, open file
+# descriptors and temp-dir usage. Fails (exit code 1) when any of them keeps
+# growing after the warm-up.
+#
+# Run from the project root:
+#   python tests/soak_test.py --hours 4 --report soak.csv
+#   python tests/soak_test.py --minutes 10 --sample-interval 5     # quick check
+
+import argparse
+import contextlib
+import os
+import sys
+import time
+
+import cv2
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from camera.synthetic import SyntheticCamera
+from main import PageVisionOCR
+from utils.resource_monitor import ResourceMonitor
+
+
+def format_sample(sample):
+    """One-line summary of a resource sample"""
+    def value(key, fmt):
+        return format(sample[key], fmt) if sample[key] is not None else 'n/a'
+    return (f"RSS {value('rss_mb', '.1f')} MB | traced {value('traced_mb', '.1f')} MB | "
+            f"threads {sample['threads']} | fds {value('fds', 'd')} | "
+            f"temp {sample['temp_files']} files / {sample['temp_mb']:.1f} MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Long-running leak test of the full pipeline")
+    parser.add_argument('--hours', type=float, default=0.0)
+    parser.add_argument('--minutes', type=float, default=0.0)
+    parser.add_argument('--sample-interval', type=float, default=30.0, help="Seconds between resource samples")
+    parser.add_argument('--report-interval', type=float, default=60.0, help="Seconds between progress lines")
+    parser.add_argument('--report', default='soak_report.csv', help="CSV file with all samples")
+    parser.add_argument('--no-speech', action='store_true', help="Disable auto-speak")
+    parser.add_argument('--no-tracemalloc', action='store_true', help="Skip allocation tracing (less overhead)")
+    parser.add_argument('--verbose', action='store_true', help="Keep the pipeline's own console output")
+    args = parser.parse_args()
+    duration = args.hours * 3600 + args.minutes * 60 or 3600
+    
+    print("=" * 60)
+    print(f"PageVision OCR - Soak Test ({duration / 3600:.2f} h)")
+    print("=" * 60)
+    
+    quiet = contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(open(os.devnull, 'w'))
+    monitor = ResourceMonitor(interval=args.sample_interval, trace_frames=0 if args.no_tracemalloc else 8)
+    
+    with quiet:
+        app = PageVisionOCR(camera=SyntheticCamera(realtime=False))
+        app.auto_speak = not args.no_speech
+        app.camera.start()
+        app.start_background_warmup()
+    monitor.start()
+    
+    start = last_report = time.monotonic()
+    frames = 0
+    try:
+        while time.monotonic() - start < duration:
+            with quiet:
+                ret, frame = app.camera.read_frame()
+                if not ret:
+                    break
+                app.frame_count += 1
+                app.process_frame(frame)
+            frames += 1
+            
+            now = time.monotonic()
+            if now - last_report >= args.report_interval:
+                last_report = now
+                elapsed = now - start
+                print(f"[{elapsed / 60:7.1f} min] {frames} frames ({frames / elapsed:.1f} FPS, "
+                      f"scene {app.camera.frame_index / 30 / 3600:.2f} h, {app.camera.phase}) | "
+                      f"{format_sample(monitor.samples[-1])}")
+    except KeyboardInterrupt:
+        print("\n⚠ Interrupted - evaluating what was recorded")
+    finally:
+        monitor.stop()
+        with quiet:
+            app.tts.stop()
+            app.camera.release()
+            try:
+                cv2.destroyAllWindows()
+            except cv2.error:
+                pass  # Headless OpenCV build
+    
+    monitor.write_csv(args.report)
+    elapsed = time.monotonic() - start
+    print(f"\n✓ {frames} frames in {elapsed / 60:.1f} min ({frames / max(elapsed, 1e-6):.1f} FPS), "
+          f"samples written to {args.report}")
+    print(f"  first: {format_sample(monitor.samples[0])}")
+    print(f"  last:  {format_sample(monitor.samples[-1])}")
+    
+    allocators = monitor.top_allocators(10)
+    if allocators:
+        print("\nLargest allocation growth since start:")
+        for line in allocators:
+            print(f"  {line}")
+    
+    leaks = monitor.growth()
+    if leaks:
+        print()
+        for metric, first, last in leaks:
+            print(f"✗ Sustained growth of {metric}: {first:.1f} → {last:.1f}")
+        return 1
+    print("\n✓ No sustained growth detected")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,151 @@
+# Engine Pool Stress Test for PageVision OCR
+# Many threads, each with its own OCREngine stream state, share one EnginePool.
+# Checks that concurrent recognition returns exactly the single-threaded
+# results, that per-stream state never leaks between threads, that no more
+# than pool.size Tesseract calls run at once, and reports throughput for
+# growing pool sizes.
+#
+# Run from the project root (requires Tesseract):
+#   python tests/stress_engine_pool.py [--threads 16] [--rounds 5]
+
+import argparse
+import os
+import sys
+import threading
+import time
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ocr.ocr_engine import OCREngine
+from ocr.recognizer import EnginePool
+
+LINES = [
+    "The quick brown fox jumps over the lazy dog",
+    "Reading printed pages aloud for everyone",
+    "Binarization turns gray pixels into ink",
+    "Shadows and glare should not hide words",
+    "Every stream keeps its own reading state",
+    "Pools bound the number of busy engines",
+]
+
+
+def render_line(text, width=900, height=80):
+    """Black text on white paper"""
+    page = np.full((height, width), 255, dtype=np.uint8)
+    cv2.putText(page, text, (10, 55), cv2.FONT_HERSHEY_SIMPLEX, 1.0, 0, 2, cv2.LINE_AA)
+    return page
+
+
+class ConcurrencyProbe:
+    """Wraps the pool's engines to record the peak number of simultaneous calls"""
+    
+    def __init__(self, pool):
+        self.lock = threading.Lock()
+        self.active = 0
+        self.peak = 0
+        for engine in pool.engines:
+            original = engine.image_to_string
+            engine.image_to_string = self._wrap(original)
+    
+    def _wrap(self, func):
+        def probed(*args, **kwargs):
+            with self.lock:
+                self.active += 1
+                self.peak = max(self.peak, self.active)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                with self.lock:
+                    self.active -= 1
+        return probed
+
+
+def run_streams(pool, images, expected, threads, rounds):
+    """
+    Drive one OCREngine per thread over all images
+    
+    Returns:
+        tuple: (pages per second, list of error messages, peak concurrent calls)
+    """
+    probe = ConcurrencyProbe(pool)
+    errors = []
+    errors_lock = threading.Lock()
+    
+    def stream(index):
+        engine = OCREngine(pool=pool, lazy=True)
+        # Each stream reads the images in its own order
+        order = [(index + i) % len(images) for i in range(len(images))]
+        for _ in range(rounds):
+            for i in order:
+                text = engine.extract_text(images[i])
+                engine.is_stable_text(text)
+                problems = []
+                if text != expected[i]:
+                    problems.append(f"got {text!r}, expected {expected[i]!r}")
+                if any(buffered not in expected for buffered in engine.text_buffer):
+                    problems.append(f"foreign text in buffer: {engine.text_buffer}")
+                if problems:
+                    with errors_lock:
+                        errors.extend(f"stream {index}: {problem}" for problem in problems)
+    
+    workers = [threading.Thread(target=stream, args=(i,)) for i in range(threads)]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - start
+    return threads * rounds * len(images) / elapsed, errors, probe.peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description="EnginePool concurrency stress test")
+    parser.add_argument('--threads', type=int, default=16, help="Concurrent streams")
+    parser.add_argument('--rounds', type=int, default=3, help="Passes over the images per stream")
+    args = parser.parse_args()
+    
+    print("=" * 60)
+    print("PageVision OCR - Engine Pool Stress Test")
+    print("=" * 60)
+    
+    images = [render_line(line) for line in LINES]
+    reference = OCREngine(lazy=True)
+    try:
+        reference.warm_up()
+    except Exception as e:
+        print(f"✗ Tesseract unavailable: {e}")
+        return 1
+    expected = [reference.extract_text(image) for image in images]
+    
+    cores = os.cpu_count() or 1
+    sizes = sorted({1, max(1, cores // 2), cores})
+    failed = False
+    baseline = None
+    for size in sizes:
+        pool = EnginePool(size=size)
+        pool.warm_up(reference.config)
+        throughput, errors, peak = run_streams(pool, images, expected, args.threads, args.rounds)
+        baseline = baseline or throughput
+        stats = pool.stats()
+        print(f"\npool size {size:3d}: {throughput:7.1f} pages/s ({throughput / baseline:.2f}x) | "
+              f"peak concurrent calls {peak} | waits {stats['waits']}/{stats['checkouts']} "
+              f"(mean {stats['mean_wait_ms']} ms)")
+        if peak > size:
+            errors.append(f"{peak} concurrent calls exceed pool size {size}")
+        if stats['available'] != size:
+            errors.append(f"{size - stats['available']} engines never checked in")
+        for error in errors[:10]:
+            print(f"  ✗ {error}")
+        if errors:
+            failed = True
+        else:
+            print("  ✓ results identical to single-threaded run, stream state isolated")
+    
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
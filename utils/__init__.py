@@ -1,4 +1,16 @@
 """Utility modules"""
 from .file_handler import FileHandler
+from .startup import StartupProfiler
+from .frame_transport import SharedFramePool, FrameHandle
+from .profiler import SamplingProfiler
+from .idle_mode import IdleController
+from .exporters import SessionExporter, HOCRExporter, ALTOExporter, SearchablePDFExporter
+from .job_queue import JobQueue, JobBroker, RemoteJobQueue
+from .resource_monitor import ResourceMonitor
+from .near_duplicates import NearDuplicateIndex
+from .performance_profiles import PerformanceProfiles
 
-__all__ = ['FileHandler']
+__all__ = ['FileHandler', 'StartupProfiler', 'SharedFramePool', 'FrameHandle', 'SamplingProfiler',
+           'IdleController', 'SessionExporter', 'HOCRExporter', 'ALTOExporter', 'SearchablePDFExporter',
+           'JobQueue', 'JobBroker', 'RemoteJobQueue', 'ResourceMonitor', 'NearDuplicateIndex',
+           'PerformanceProfiles']
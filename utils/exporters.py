@@ -0,0 +1,458 @@
+"""
+Exporters Module - Streaming hOCR, ALTO XML and searchable PDF output
+
+Each exporter writes its header when opened and appends one page at a time
+as pages are captured. Every page leaves a complete file behind: the hOCR and
+ALTO closing tags are rewritten after the new page, and the PDF gets an
+incremental-update cross-reference section and trailer. If the application
+crashes, the file holds every page finished before the crash; a crash while
+a page is being written can cut off that page. Nothing but a few offsets is
+kept per page, so multi-hour sessions run in constant memory.
+
+Usage:
+    session = SessionExporter('ocr_output', formats=('hocr', 'alto', 'pdf'))
+    session.add_page(frame, boxes)         # boxes from OCREngine.extract_text_with_boxes
+    session.close()
+"""
+import os
+from datetime import datetime
+from xml.sax.saxutils import escape, quoteattr
+
+import cv2
+import numpy as np
+
+from ocr.layout import group_lines
+
+
+def _line_bbox(line):
+    """Union (x0, y0, x1, y1) of the word boxes of a line"""
+    return (min(b[2] for b in line), min(b[3] for b in line),
+            max(b[2] + b[4] for b in line), max(b[3] + b[5] for b in line))
+
+
+class _StreamingDocument:
+    """Text document that is closed again after every page"""
+    
+    TRAILER = ''  # Closing tags, rewritten behind each new page
+    
+    def __init__(self, path, header):
+        """
+        Open the output file and write the header and trailer
+        
+        Args:
+            path (str): Output path
+            header (str): Document text before the first page
+        """
+        self.path = path
+        self.page_count = 0
+        self._file = open(path, 'w', encoding='utf-8')
+        self._file.write(header)
+        self._end = self._file.tell()  # Where the next page overwrites the trailer
+        self._file.write(self.TRAILER)
+        self._file.flush()
+    
+    def _append(self, text):
+        """Write a page in place of the trailer and close the document again"""
+        self._file.seek(self._end)
+        self._file.write(text)
+        self._end = self._file.tell()
+        self._file.write(self.TRAILER)
+        self._file.truncate()
+        self._file.flush()
+    
+    def close(self):
+        """Close the file (the trailer is already written)"""
+        if self._file is None:
+            return
+        self._file.close()
+        self._file = None
+
+
+class HOCRExporter(_StreamingDocument):
+    """Streams pages into one hOCR (HTML) file"""
+    
+    TRAILER = '</body>\n</html>\n'
+    
+    def __init__(self, path):
+        """
+        Open the output file and write the document header
+        
+        Args:
+            path (str): Output .hocr path
+        """
+        super().__init__(path,
+            '<?xml version="1.0" encoding="UTF-8"?>\n'
+            '<!DOCTYPE html PUBLIC "-//W3C//DTD XHTML 1.0 Transitional//EN"\n'
+            '    "http://www.w3.org/TR/xhtml1/DTD/xhtml1-transitional.dtd">\n'
+            '<html xmlns="http://www.w3.org/1999/xhtml" xml:lang="en" lang="en">\n'
+            '<head>\n'
+            '  <title>PageVision OCR session</title>\n'
+            '  <meta http-equiv="Content-Type" content="text/html; charset=utf-8"/>\n'
+            '  <meta name="ocr-system" content="pagevision-ocr (tesseract)"/>\n'
+            '  <meta name="ocr-capabilities" content="ocr_page ocr_line ocrx_word"/>\n'
+            '</head>\n'
+            '<body>\n'
+        )
+    
+    def add_page(self, image_size, boxes):
+        """
+        Append one page
+        
+        Args:
+            image_size (tuple): (width, height) of the page image
+            boxes (list): (text, confidence, x, y, w, h) word boxes
+        """
+        self.page_count += 1
+        page = self.page_count
+        width, height = image_size
+        out = [f'  <div class="ocr_page" id="page_{page}" title="bbox 0 0 {width} {height}; ppageno {page - 1}">\n']
+        for line_number, line in enumerate(group_lines(boxes), 1):
+            x0, y0, x1, y1 = _line_bbox(line)
+            out.append(f'    <span class="ocr_line" id="line_{page}_{line_number}" '
+                       f'title="bbox {x0} {y0} {x1} {y1}">')
+            words = []
+            for word_number, (text, confidence, x, y, w, h) in enumerate(line, 1):
+                words.append(f'<span class="ocrx_word" id="word_{page}_{line_number}_{word_number}" '
+                             f'title="bbox {x} {y} {x + w} {y + h}; x_wconf {int(confidence)}">'
+                             f'{escape(text)}</span>')
+            out.append(' '.join(words) + '</span>\n')
+        out.append('  </div>\n')
+        
+        self._append(''.join(out))
+
+
+class ALTOExporter(_StreamingDocument):
+    """Streams pages into one ALTO v4 XML file"""
+    
+    TRAILER = '  </Layout>\n</alto>\n'
+    
+    def __init__(self, path):
+        """
+        Open the output file and write the document header
+        
+        Args:
+            path (str): Output .xml path
+        """
+        super().__init__(path,
+            '<?xml version="1.0" encoding="UTF-8"?>\n'
+            '<alto xmlns="http://www.loc.gov/standards/alto/ns-v4#"\n'
+            '      xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance"\n'
+            '      xsi:schemaLocation="http://www.loc.gov/standards/alto/ns-v4# '
+            'http://www.loc.gov/alto/v4/alto-4-2.xsd">\n'
+            '  <Description>\n'
+            '    <MeasurementUnit>pixel</MeasurementUnit>\n'
+            '    <OCRProcessing ID="ocr_1">\n'
+            '      <ocrProcessingStep>\n'
+            f'        <processingDateTime>{datetime.now().isoformat(timespec="seconds")}</processingDateTime>\n'
+            '        <processingSoftware><softwareName>PageVision OCR (Tesseract)</softwareName></processingSoftware>\n'
+            '      </ocrProcessingStep>\n'
+            '    </OCRProcessing>\n'
+            '  </Description>\n'
+            '  <Layout>\n'
+        )
+    
+    def add_page(self, image_size, boxes):
+        """
+        Append one page
+        
+        Args:
+            image_size (tuple): (width, height) of the page image
+            boxes (list): (text, confidence, x, y, w, h) word boxes
+        """
+        self.page_count += 1
+        page = self.page_count
+        width, height = image_size
+        
+        out = [f'    <Page ID="page_{page}" PHYSICAL_IMG_NR="{page}" WIDTH="{width}" HEIGHT="{height}">\n',
+               f'      <PrintSpace HPOS="0" VPOS="0" WIDTH="{width}" HEIGHT="{height}">\n']
+        lines = group_lines(boxes)
+        if lines:
+            bx0 = min(_line_bbox(line)[0] for line in lines)
+            by0 = min(_line_bbox(line)[1] for line in lines)
+            bx1 = max(_line_bbox(line)[2] for line in lines)
+            by1 = max(_line_bbox(line)[3] for line in lines)
+            out.append(f'        <TextBlock ID="block_{page}" HPOS="{bx0}" VPOS="{by0}" '
+                       f'WIDTH="{bx1 - bx0}" HEIGHT="{by1 - by0}">\n')
+            for line_number, line in enumerate(lines, 1):
+                x0, y0, x1, y1 = _line_bbox(line)
+                out.append(f'          <TextLine ID="line_{page}_{line_number}" HPOS="{x0}" VPOS="{y0}" '
+                           f'WIDTH="{x1 - x0}" HEIGHT="{y1 - y0}">\n')
+                for word_number, (text, confidence, x, y, w, h) in enumerate(line, 1):
+                    if word_number > 1:
+                        out.append('            <SP/>\n')
+                    out.append(f'            <String ID="string_{page}_{line_number}_{word_number}" '
+                               f'CONTENT={quoteattr(text)} WC="{max(0, min(100, confidence)) / 100:.2f}" '
+                               f'HPOS="{x}" VPOS="{y}" WIDTH="{w}" HEIGHT="{h}"/>\n')
+                out.append('          </TextLine>\n')
+            out.append('        </TextBlock>\n')
+        out.append('      </PrintSpace>\n    </Page>\n')
+        
+        self._append(''.join(out))
+
+
+class SearchablePDFExporter:
+    """
+    Streams pages into a PDF with the page image and an invisible text layer
+    
+    Objects are written as soon as a page arrives. Each page is followed by
+    an incremental update: the page tree nodes that changed, a cross-reference
+    section for the objects written since the previous one (linked with
+    /Prev) and a trailer, so the file is a valid PDF after every page.
+    
+    The page tree has at most FANOUT kids per node, so an update rewrites only
+    the leaf that got the page and its ancestors (a few hundred bytes) instead
+    of one /Kids array listing every page.
+    """
+    
+    CATALOG, PAGES, FONT = 1, 2, 3  # Reserved object numbers
+    FANOUT = 32  # Kids per page tree node
+    
+    def __init__(self, path, dpi=150, jpeg_quality=80):
+        """
+        Open the output file and write the shared objects
+        
+        Args:
+            path (str): Output .pdf path
+            dpi (int): Resolution used to size pages from image pixels
+            jpeg_quality (int): JPEG quality of the page images
+        """
+        self.path = path
+        self.dpi = dpi
+        self.jpeg_quality = jpeg_quality
+        self.page_count = 0
+        self._offsets = {}  # Objects written since the last cross-reference section
+        self._next_id = 4
+        self._root = _PageTreeNode(self.PAGES, None, level=1)
+        self._last_leaf = None
+        self._dirty = {self._root}  # Page tree nodes to write with the next update
+        self._previous_xref = None
+        self._file = open(path, 'wb')
+        self._file.write(b'%PDF-1.4\n%\xe2\xe3\xcf\xd3\n')
+        self._write_object(self.FONT, b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica '
+                                      b'/Encoding /WinAnsiEncoding >>')
+        self._write_object(self.CATALOG, f'<< /Type /Catalog /Pages {self.PAGES} 0 R >>'.encode('ascii'))
+        self._write_update()
+    
+    def _allocate(self):
+        object_id = self._next_id
+        self._next_id += 1
+        return object_id
+    
+    def _write_object(self, object_id, body, stream=None):
+        """Write one indirect object (optionally with a stream) and record its offset"""
+        self._offsets[object_id] = self._file.tell()
+        self._file.write(f'{object_id} 0 obj\n'.encode('ascii'))
+        self._file.write(body)
+        if stream is not None:
+            self._file.write(b'\nstream\n')
+            self._file.write(stream)
+            self._file.write(b'\nendstream')
+        self._file.write(b'\nendobj\n')
+    
+    @staticmethod
+    def _pdf_string(text):
+        """Encode text as a PDF literal string in WinAnsi (unmappable characters become '?')"""
+        data = text.encode('cp1252', errors='replace')
+        data = data.replace(b'\\', b'\\\\').replace(b'(', b'\\(').replace(b')', b'\\)')
+        return b'(' + data + b')'
+    
+    def add_page(self, image, boxes):
+        """
+        Append one page
+        
+        Args:
+            image (numpy.ndarray): BGR or grayscale page image the boxes refer to
+            boxes (list): (text, confidence, x, y, w, h) word boxes
+        """
+        height, width = image.shape[:2]
+        ok, jpeg = cv2.imencode('.jpg', image, [cv2.IMWRITE_JPEG_QUALITY, self.jpeg_quality])
+        if not ok:
+            raise ValueError("Could not encode page image")
+        color_space = b'/DeviceGray' if image.ndim == 2 else b'/DeviceRGB'
+        
+        scale = 72.0 / self.dpi  # Pixels to points
+        page_w, page_h = width * scale, height * scale
+        
+        # Invisible text (render mode 3), each word stretched over its box
+        content = [f'q {page_w:.2f} 0 0 {page_h:.2f} 0 0 cm /Im0 Do Q\nBT 3 Tr\n'.encode('ascii')]
+        for text, _, x, y, w, h in boxes:
+            font_size = max(1.0, h * scale)
+            # Helvetica averages about half an em per character
+            natural_width = 0.5 * font_size * max(1, len(text))
+            stretch = 100.0 * (w * scale) / natural_width
+            baseline = page_h - (y + h) * scale
+            content.append(f'/F0 {font_size:.2f} Tf {stretch:.1f} Tz 1 0 0 1 {x * scale:.2f} {baseline:.2f} Tm '
+                           .encode('ascii') + self._pdf_string(text) + b' Tj\n')
+        content.append(b'ET\n')
+        content = b''.join(content)
+        
+        leaf = self._leaf_with_room()
+        image_id, content_id, page_id = self._allocate(), self._allocate(), self._allocate()
+        self._write_object(image_id, (f'<< /Type /XObject /Subtype /Image /Width {width} /Height {height} '
+                                      f'/BitsPerComponent 8 /Filter /DCTDecode /Length {len(jpeg)} /ColorSpace '
+                                      ).encode('ascii') + color_space + b' >>', jpeg.tobytes())
+        self._write_object(content_id, f'<< /Length {len(content)} >>'.encode('ascii'), content)
+        self._write_object(page_id, (f'<< /Type /Page /Parent {leaf.id} 0 R '
+                                     f'/MediaBox [0 0 {page_w:.2f} {page_h:.2f}] '
+                                     f'/Resources << /Font << /F0 {self.FONT} 0 R >> '
+                                     f'/XObject << /Im0 {image_id} 0 R >> >> '
+                                     f'/Contents {content_id} 0 R >>').encode('ascii'))
+        leaf.kids.append(page_id)
+        node = leaf
+        while node is not None:
+            node.count += 1
+            self._dirty.add(node)
+            node = node.parent
+        self.page_count += 1
+        self._write_update()
+    
+    def _leaf_with_room(self):
+        """
+        Get the page tree leaf for the next page, adding nodes when the last leaf is full
+        
+        Returns:
+            _PageTreeNode: Leaf with fewer than FANOUT pages
+        """
+        if self._last_leaf is not None and len(self._last_leaf.kids) < self.FANOUT:
+            return self._last_leaf
+        # Lowest ancestor of the last leaf that can take one more kid
+        node = self._root if self._last_leaf is None else self._last_leaf.parent
+        while node is not None and len(node.kids) >= self.FANOUT:
+            node = node.parent
+        if node is None:
+            # The whole tree is full: move the root's kids one level down
+            root = self._root
+            child = _PageTreeNode(self._allocate(), root, root.level)
+            child.kids, child.count = root.kids, root.count
+            for kid in child.kids:
+                kid.parent = child
+                self._dirty.add(kid)
+            root.kids = [child]
+            root.level += 1
+            self._dirty.update((root, child))
+            node = root
+        # New chain of nodes from below that ancestor down to an empty leaf
+        while node.level > 0:
+            child = _PageTreeNode(self._allocate(), node, node.level - 1)
+            node.kids.append(child)
+            self._dirty.update((node, child))
+            node = child
+        self._last_leaf = node
+        return node
+    
+    def _write_update(self):
+        """Write the changed page tree nodes, the cross-reference section of the new objects and a trailer"""
+        for node in sorted(self._dirty, key=lambda node: node.id):
+            kids = ' '.join(f'{kid if node.level == 0 else kid.id} 0 R' for kid in node.kids)
+            parent = '' if node.parent is None else f' /Parent {node.parent.id} 0 R'
+            self._write_object(node.id, f'<< /Type /Pages{parent} /Kids [{kids}] /Count {node.count} >>'
+                               .encode('ascii'))
+        self._dirty = set()
+        
+        xref_offset = self._file.tell()
+        entries = sorted(self._offsets.items())
+        if self._previous_xref is None:
+            entries.insert(0, (0, None))  # Head of the free list
+        xref = ['xref\n']
+        start = 0
+        while start < len(entries):
+            # One subsection per run of consecutive object numbers
+            end = start + 1
+            while end < len(entries) and entries[end][0] == entries[end - 1][0] + 1:
+                end += 1
+            xref.append(f'{entries[start][0]} {end - start}\n')
+            for _, offset in entries[start:end]:
+                xref.append('0000000000 65535 f \n' if offset is None else f'{offset:010d} 00000 n \n')
+            start = end
+        previous = '' if self._previous_xref is None else f' /Prev {self._previous_xref}'
+        xref.append(f'trailer\n<< /Size {self._next_id} /Root {self.CATALOG} 0 R{previous} >>\n'
+                    f'startxref\n{xref_offset}\n%%EOF\n')
+        self._file.write(''.join(xref).encode('ascii'))
+        self._file.flush()
+        self._offsets = {}
+        self._previous_xref = xref_offset
+    
+    def close(self):
+        """Close the file (the last update already completed it)"""
+        if self._file is None:
+            return
+        self._file.close()
+        self._file = None
+
+
+class _PageTreeNode:
+    """/Pages node of SearchablePDFExporter; level 0 nodes hold page object ids, others hold nodes"""
+    
+    def __init__(self, object_id, parent, level):
+        self.id = object_id
+        self.parent = parent
+        self.level = level
+        self.kids = []
+        self.count = 0
+
+
+class SessionExporter:
+    """Writes every captured page to all selected formats"""
+    
+    EXTENSIONS = {'hocr': 'hocr', 'alto': 'alto.xml', 'pdf': 'pdf'}
+    
+    def __init__(self, output_dir, formats=('hocr', 'alto', 'pdf'), name=None):
+        """
+        Open one streaming exporter per format
+        
+        Args:
+            output_dir (str): Directory for the session files
+            formats (tuple): Any of 'hocr', 'alto' and 'pdf'
+            name (str): Base file name (default: session_<timestamp>)
+        """
+        unknown = set(formats) - set(self.EXTENSIONS)
+        if unknown:
+            raise ValueError(f"Unknown export format(s): {', '.join(sorted(unknown))}")
+        if not os.path.exists(output_dir):
+            os.makedirs(output_dir)
+        
+        name = name or f"session_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        self.paths = {fmt: os.path.join(output_dir, f"{name}.{self.EXTENSIONS[fmt]}") for fmt in formats}
+        self.page_count = 0
+        self.exporters = {}
+        for fmt, path in self.paths.items():
+            if fmt == 'hocr':
+                self.exporters[fmt] = HOCRExporter(path)
+            elif fmt == 'alto':
+                self.exporters[fmt] = ALTOExporter(path)
+            else:
+                self.exporters[fmt] = SearchablePDFExporter(path)
+    
+    def add_page(self, image, boxes):
+        """
+        Append a page to every format
+        
+        Args:
+            image (numpy.ndarray): Page image the box coordinates refer to
+            boxes (list): (text, confidence, x, y, w, h) word boxes
+        """
+        image = np.ascontiguousarray(image)
+        size = (image.shape[1], image.shape[0])
+        self.page_count += 1
+        for fmt, exporter in self.exporters.items():
+            try:
+                if fmt == 'pdf':
+                    exporter.add_page(image, boxes)
+                else:
+                    exporter.add_page(size, boxes)
+            except Exception as e:
+                print(f"✗ Error exporting page {self.page_count} to {fmt}: {e}")
+    
+    def close(self):
+        """
+        Finish all files
+        
+        Returns:
+            list: Paths of the written files
+        """
+        for exporter in self.exporters.values():
+            try:
+                exporter.close()
+            except Exception as e:
+                print(f"✗ Error finishing {exporter.path}: {e}")
+        return list(self.paths.values())
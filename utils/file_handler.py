@@ -4,19 +4,25 @@ File Handler Module - Handles file operations for saving OCR results
 import os
 from datetime import datetime
 
+from .near_duplicates import NearDuplicateIndex
+
 
 class FileHandler:
     """Manages file operations for saving OCR text"""
     
-    def __init__(self, output_dir='ocr_output'):
+    def __init__(self, output_dir='ocr_output', lazy=False, skip_duplicates=True):
         """
         Initialize file handler
         
         Args:
             output_dir (str): Directory to save output files
+            lazy (bool): Create the output directory on first write instead of now
+            skip_duplicates (bool): Do not write text that was already written this session
         """
         self.output_dir = output_dir
-        self.create_output_directory()
+        self.written_texts = NearDuplicateIndex() if skip_duplicates else None
+        if not lazy:
+            self.create_output_directory()
         
     def create_output_directory(self):
         """Create output directory if it doesn't exist"""
@@ -24,6 +30,26 @@ class FileHandler:
             os.makedirs(self.output_dir)
             print(f"✓ Created output directory: {self.output_dir}")
     
+    def is_duplicate(self, text):
+        """
+        Check whether (nearly) the same text was already written this session
+        
+        Args:
+            text (str): Text about to be written
+        
+        Returns:
+            bool: True if the write should be skipped
+        """
+        if self.written_texts is None or not self.written_texts.contains(text):
+            return False
+        print("⚠ Same text was already saved in this session, not saving it again")
+        return True
+    
+    def remember_written(self, text):
+        """Record text as written (see is_duplicate)"""
+        if self.written_texts is not None:
+            self.written_texts.add(text)
+    
     def save_text(self, text, filename=None):
         """
         Save extracted text to a file
@@ -33,17 +59,20 @@ class FileHandler:
             filename (str): Custom filename (optional)
             
         Returns:
-            str: Path to the saved file
+            str: Path to the saved file (None if nothing was written)
         """
         if not text or not text.strip():
             print("⚠ No text to save")
             return None
+        if self.is_duplicate(text):
+            return None
         
         # Generate filename with timestamp if not provided
         if filename is None:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             filename = f"ocr_text_{timestamp}.txt"
         
+        self.create_output_directory()
         filepath = os.path.join(self.output_dir, filename)
         
         try:
@@ -54,6 +83,7 @@ class FileHandler:
                 f.write(text)
                 f.write("\n\n" + "=" * 60 + "\n")
             
+            self.remember_written(text)
             print(f"✓ Text saved to: {filepath}")
             return filepath
         except Exception as e:
@@ -69,11 +99,12 @@ class FileHandler:
             filename (str): Filename to append to
             
         Returns:
-            str: Path to the file
+            str: Path to the file (None if nothing was written)
         """
-        if not text or not text.strip():
+        if not text or not text.strip() or self.is_duplicate(text):
             return None
         
+        self.create_output_directory()
         filepath = os.path.join(self.output_dir, filename)
         
         try:
@@ -83,6 +114,7 @@ class FileHandler:
                 f.write(text)
                 f.write("\n" + "-" * 40 + "\n")
             
+            self.remember_written(text)
             print(f"✓ Text appended to: {filepath}")
             return filepath
         except Exception as e:
@@ -106,6 +138,7 @@ class FileHandler:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             filename = f"ocr_image_{timestamp}.png"
         
+        self.create_output_directory()
         filepath = os.path.join(self.output_dir, filename)
         
         try:
@@ -116,6 +149,26 @@ class FileHandler:
             print(f"✗ Error saving image: {e}")
             return None
     
+    def start_session_export(self, formats=('hocr', 'alto', 'pdf')):
+        """
+        Start streaming captured pages to hOCR / ALTO / searchable PDF files
+        
+        Args:
+            formats (tuple): Any of 'hocr', 'alto' and 'pdf'
+        
+        Returns:
+            SessionExporter: Exporter to add pages to, or None if error
+        """
+        from .exporters import SessionExporter
+        
+        try:
+            session = SessionExporter(self.output_dir, formats)
+            print(f"✓ Session export started: {', '.join(session.paths.values())}")
+            return session
+        except Exception as e:
+            print(f"✗ Error starting session export: {e}")
+            return None
+    
     def read_text(self, filename):
         """
         Read text from a saved file
@@ -142,6 +195,9 @@ class FileHandler:
         Returns:
             list: List of filenames
         """
+        if not os.path.exists(self.output_dir):
+            return []
+        
         try:
             files = os.listdir(self.output_dir)
             return sorted(files, reverse=True)  # Most recent first
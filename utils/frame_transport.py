@@ -0,0 +1,199 @@
+"""
+Frame Transport Module - Zero-copy frame hand-off to worker processes
+
+Frames are written once into a fixed pool of slots in shared memory. Only a
+small FrameHandle (slot, sequence number, shape, dtype) is sent through
+queues; workers map the slot as a NumPy view without copying or pickling the
+pixels. Slots are reference counted and recycled when the last reader
+releases them.
+
+Usage:
+    pool = SharedFramePool(slots=8, max_shape=(720, 1280, 3))
+    handle = pool.write(frame)             # capture side, one copy
+    task_queue.put(handle)                 # a few dozen bytes
+    ...
+    with pool.frame(handle) as image:      # worker side (pool passed at process start)
+        text = ocr_engine.extract_text(preprocessor.preprocess(image))
+"""
+import multiprocessing
+import os
+import time
+from collections import namedtuple
+from contextlib import contextmanager
+from multiprocessing import shared_memory
+
+import numpy as np
+
+
+FrameHandle = namedtuple('FrameHandle', ['slot', 'seq', 'shape', 'dtype'])
+
+# Columns of the control table, one row per slot
+_REFCOUNT, _SEQ = 0, 1
+
+
+class SharedFramePool:
+    """Fixed pool of reference-counted frame slots in shared memory"""
+    
+    def __init__(self, slots=8, max_shape=(720, 1280, 3), dtype=np.uint8):
+        """
+        Create the shared memory blocks (owner side)
+        
+        Args:
+            slots (int): Number of frames that can be in flight at once
+            max_shape (tuple): Largest frame shape a slot must hold
+            dtype: Pixel data type
+        """
+        self.slots = slots
+        self.slot_bytes = int(np.prod(max_shape)) * np.dtype(dtype).itemsize
+        self.owner_pid = os.getpid()  # Only the creating process frees the memory
+        
+        self._data = shared_memory.SharedMemory(create=True, size=self.slots * self.slot_bytes)
+        self._control = shared_memory.SharedMemory(create=True, size=self.slots * 2 * 8)
+        self._lock = multiprocessing.Lock()
+        self._next_slot = 0
+        self._attach_views()
+        self._table[:] = 0
+    
+    def _attach_views(self):
+        """Create the NumPy view of the control table"""
+        self._table = np.ndarray((self.slots, 2), dtype=np.int64, buffer=self._control.buf)
+    
+    def __getstate__(self):
+        # Only names and the lock travel to the worker; it re-attaches by name.
+        # The lock can only be shared at process creation (Process args / Pool initializer).
+        return {
+            'slots': self.slots,
+            'slot_bytes': self.slot_bytes,
+            'owner_pid': self.owner_pid,
+            'data_name': self._data.name,
+            'control_name': self._control.name,
+            'lock': self._lock,
+        }
+    
+    def __setstate__(self, state):
+        self.slots = state['slots']
+        self.slot_bytes = state['slot_bytes']
+        self.owner_pid = state['owner_pid']
+        self._data = shared_memory.SharedMemory(name=state['data_name'])
+        self._control = shared_memory.SharedMemory(name=state['control_name'])
+        self._lock = state['lock']
+        self._next_slot = 0
+        self._attach_views()
+    
+    def write(self, frame, timeout=1.0):
+        """
+        Copy a frame into a free slot
+        
+        Args:
+            frame (numpy.ndarray): Frame to publish
+            timeout (float): Seconds to wait for a slot to be recycled
+        
+        Returns:
+            FrameHandle: Handle holding one reference to the slot
+        """
+        nbytes = frame.nbytes
+        if nbytes > self.slot_bytes:
+            raise ValueError(f"Frame of {nbytes} bytes exceeds slot size {self.slot_bytes}")
+        
+        deadline = time.monotonic() + timeout
+        while True:
+            with self._lock:
+                for offset in range(self.slots):
+                    slot = (self._next_slot + offset) % self.slots
+                    if self._table[slot, _REFCOUNT] == 0:
+                        self._table[slot, _REFCOUNT] = 1
+                        self._table[slot, _SEQ] += 1
+                        seq = int(self._table[slot, _SEQ])
+                        self._next_slot = (slot + 1) % self.slots
+                        break
+                else:
+                    slot = None
+            if slot is not None:
+                break
+            if time.monotonic() > deadline:
+                raise RuntimeError("No free frame slot (workers are not releasing frames)")
+            time.sleep(0.001)
+        
+        # The copy happens outside the lock; the slot is already owned by this handle
+        handle = FrameHandle(slot, seq, tuple(frame.shape), frame.dtype.str)
+        np.copyto(self._slot_array(handle), frame)
+        return handle
+    
+    def _slot_array(self, handle):
+        """NumPy view over the bytes of a slot"""
+        return np.ndarray(handle.shape, dtype=np.dtype(handle.dtype),
+                          buffer=self._data.buf, offset=handle.slot * self.slot_bytes)
+    
+    def view(self, handle):
+        """
+        Map a frame without copying
+        
+        Args:
+            handle (FrameHandle): Handle received from the producer
+        
+        Returns:
+            numpy.ndarray: Read-only view of the frame
+        
+        Raises:
+            ValueError: The slot was recycled or no reference to it is held
+        """
+        with self._lock:
+            if int(self._table[handle.slot, _SEQ]) != handle.seq:
+                raise ValueError(f"Frame slot {handle.slot} was recycled (stale handle)")
+            if self._table[handle.slot, _REFCOUNT] <= 0:
+                raise ValueError(f"Frame slot {handle.slot} has no references (handle already released)")
+        array = self._slot_array(handle)
+        array.flags.writeable = False
+        return array
+    
+    def retain(self, handle):
+        """
+        Add a reference, e.g. before handing the same frame to a second worker
+        
+        Args:
+            handle (FrameHandle): Handle of the frame
+        """
+        with self._lock:
+            if int(self._table[handle.slot, _SEQ]) != handle.seq:
+                raise ValueError(f"Frame slot {handle.slot} was recycled (stale handle)")
+            self._table[handle.slot, _REFCOUNT] += 1
+    
+    def release(self, handle):
+        """
+        Drop a reference; the slot is recycled when the count reaches zero
+        
+        Args:
+            handle (FrameHandle): Handle of the frame
+        """
+        with self._lock:
+            if int(self._table[handle.slot, _SEQ]) != handle.seq:
+                return
+            if self._table[handle.slot, _REFCOUNT] > 0:
+                self._table[handle.slot, _REFCOUNT] -= 1
+    
+    @contextmanager
+    def frame(self, handle):
+        """
+        Map a frame and release the handle's reference when done
+        
+        Args:
+            handle (FrameHandle): Handle of the frame
+        """
+        try:
+            yield self.view(handle)
+        finally:
+            self.release(handle)
+    
+    def in_use(self):
+        """Number of slots currently holding referenced frames"""
+        with self._lock:
+            return int(np.count_nonzero(self._table[:, _REFCOUNT]))
+    
+    def close(self):
+        """Detach from the shared memory; the owner also frees it"""
+        self._table = None
+        self._data.close()
+        self._control.close()
+        if os.getpid() == self.owner_pid:
+            self._data.unlink()
+            self._control.unlink()
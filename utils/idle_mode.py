@@ -0,0 +1,98 @@
+"""
+Idle Mode Module - Low-power state machine driven by document absence
+"""
+import time
+
+
+class IdleController:
+    """Switches capture between the full pipeline and a low-power idle state"""
+    
+    ACTIVE = 'active'
+    IDLE = 'idle'
+    
+    def __init__(self, camera, presence_detector, idle_width=320, idle_height=240, idle_fps=5):
+        """
+        Initialize idle controller
+        
+        Args:
+            camera (Camera): Camera whose capture settings are switched
+            presence_detector (PresenceDetector): Cheap detector used while idle
+            idle_width (int): Capture width while idle
+            idle_height (int): Capture height while idle
+            idle_fps (int): Capture (and processing) rate while idle
+        """
+        self.camera = camera
+        self.presence_detector = presence_detector
+        self.idle_width = idle_width
+        self.idle_height = idle_height
+        self.idle_fps = idle_fps
+        self.wake_frames = 2  # Consecutive positive presence checks needed to wake up
+        
+        self.state = self.ACTIVE
+        self.active_settings = None
+        self.present_count = 0
+        self.last_idle_tick = 0.0
+    
+    def is_idle(self):
+        """Check whether the controller is in the idle state"""
+        return self.state == self.IDLE
+    
+    def enter_idle(self, frame):
+        """
+        Drop to low resolution and frame rate and start watching for a page
+        
+        Args:
+            frame (numpy.ndarray): Current (empty) frame, used as the idle background
+        """
+        if self.state == self.IDLE:
+            return
+        
+        self.active_settings = (self.camera.width, self.camera.height, self.camera.fps)
+        self.camera.configure(self.idle_width, self.idle_height, self.idle_fps)
+        self.presence_detector.reset_background(frame)
+        self.present_count = 0
+        self.last_idle_tick = time.monotonic()
+        self.state = self.IDLE
+        print(f"\n💤 No document for a while - idling at {self.idle_width}x{self.idle_height} @ {self.idle_fps} FPS")
+    
+    def update(self, frame):
+        """
+        Run the presence check on an idle frame
+        
+        Args:
+            frame (numpy.ndarray): Current low-resolution frame
+            
+        Returns:
+            bool: True if a page appeared and the full pipeline was restored
+        """
+        if self.state != self.IDLE:
+            return False
+        
+        if self.presence_detector.is_present(frame):
+            self.present_count += 1
+        else:
+            self.present_count = 0
+        
+        if self.present_count >= self.wake_frames:
+            self.wake()
+            return True
+        return False
+    
+    def wake(self):
+        """Restore the full capture settings"""
+        if self.state != self.IDLE:
+            return
+        
+        if self.active_settings is not None:
+            width, height, fps = self.active_settings
+            self.camera.configure(width, height, fps)
+        self.state = self.ACTIVE
+        print("\n⚡ Page detected - resuming full pipeline")
+    
+    def throttle(self):
+        """Sleep out the rest of the idle frame period (for drivers that ignore the FPS setting)"""
+        period = 1.0 / self.idle_fps
+        elapsed = time.monotonic() - self.last_idle_tick
+        if elapsed < period:
+            time.sleep(period - elapsed)
+        self.last_idle_tick = time.monotonic()
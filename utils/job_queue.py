@@ -0,0 +1,378 @@
+"""
+Job Queue Module - Durable OCR work queue for batch backfills across machines
+
+Jobs live in a SQLite database (WAL mode). Workers lease one job at a time;
+a lease that is not completed before it expires (crashed or stalled worker)
+makes the job available again, so every job is delivered at least once.
+Results are keyed by job id and written with INSERT OR IGNORE, so a job
+that is processed twice still produces exactly one result.
+
+Workers on the same machine open the database directly. Workers on other
+machines talk to a JobBroker, a small line-delimited JSON server in front of
+the same database, through RemoteJobQueue, which has the same methods.
+
+Usage:
+    queue = JobQueue('jobs.db')
+    queue.submit('archive-2024', ['scans/p001.png', 'scans/p002.png'])
+    job = queue.lease('worker-1')
+    queue.complete(job['id'], 'worker-1', {'text': '...'})
+"""
+import hashlib
+import json
+import socket
+import socketserver
+import sqlite3
+import threading
+import time
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    batch TEXT NOT NULL,
+    source TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    available_at REAL NOT NULL DEFAULT 0,
+    worker TEXT,
+    error TEXT,
+    created REAL NOT NULL,
+    updated REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_ready ON jobs (status, available_at);
+CREATE TABLE IF NOT EXISTS results (
+    job_id TEXT PRIMARY KEY,
+    worker TEXT NOT NULL,
+    result TEXT NOT NULL,
+    finished REAL NOT NULL
+);
+"""
+
+
+def job_id(batch, source):
+    """Deterministic job id, so re-submitting the same page is a no-op"""
+    return hashlib.sha1(f"{batch}\0{source}".encode('utf-8')).hexdigest()
+
+
+class JobQueue:
+    """SQLite-backed job queue with leases, retries and idempotent results"""
+    
+    def __init__(self, path, lease_seconds=120, max_attempts=3, retry_delay=5.0):
+        """
+        Open (and create if needed) a queue database
+        
+        Args:
+            path (str): SQLite database file
+            lease_seconds (float): How long a worker may hold a job before it is handed out again
+            max_attempts (int): Deliveries before a job is marked failed
+            retry_delay (float): Seconds before a failed job is retried (multiplied by the attempt)
+        """
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self._local = threading.local()  # One connection per thread
+        self._db().executescript(SCHEMA)
+    
+    def _db(self):
+        """This thread's connection (autocommit; transactions are explicit)"""
+        db = getattr(self._local, 'db', None)
+        if db is None:
+            db = sqlite3.connect(self.path, timeout=30.0, isolation_level=None)
+            db.row_factory = sqlite3.Row
+            db.execute('PRAGMA journal_mode=WAL')
+            db.execute('PRAGMA synchronous=NORMAL')
+            self._local.db = db
+        return db
+    
+    def _connection(self):
+        """Write transaction on this thread's connection"""
+        return _Transaction(self._db())
+    
+    def submit(self, batch, sources):
+        """
+        Shard a batch into one job per page
+        
+        Args:
+            batch (str): Batch name
+            sources (list): Page image paths (or URLs) as seen by the workers
+        
+        Returns:
+            int: Number of newly added jobs (already queued pages are skipped)
+        """
+        now = time.time()
+        rows = [(job_id(batch, source), batch, source, now, now) for source in sources]
+        with self._connection() as db:
+            before = db.total_changes
+            db.executemany('INSERT OR IGNORE INTO jobs (id, batch, source, created, updated) '
+                           'VALUES (?, ?, ?, ?, ?)', rows)
+            return db.total_changes - before
+    
+    def lease(self, worker):
+        """
+        Take the next available job
+        
+        Args:
+            worker (str): Worker name (recorded for diagnostics)
+        
+        Returns:
+            dict: Job with id, batch, source and attempts, or None if nothing is available
+        """
+        now = time.time()
+        with self._connection() as db:
+            while True:
+                # Pending jobs whose retry delay has passed, or leases that expired
+                row = db.execute(
+                    "SELECT id, batch, source, attempts FROM jobs "
+                    "WHERE status IN ('pending', 'leased') AND available_at <= ? "
+                    "ORDER BY available_at LIMIT 1", (now,)).fetchone()
+                if row is None:
+                    return None
+                if row['attempts'] < self.max_attempts:
+                    break
+                # Expired lease on the last attempt (the worker kept crashing on it)
+                db.execute("UPDATE jobs SET status = 'failed', updated = ?, "
+                           "error = COALESCE(error, 'lease expired') WHERE id = ?", (now, row['id']))
+            db.execute("UPDATE jobs SET status = 'leased', worker = ?, attempts = attempts + 1, "
+                       "available_at = ?, updated = ? WHERE id = ?",
+                       (worker, now + self.lease_seconds, now, row['id']))
+        return {'id': row['id'], 'batch': row['batch'], 'source': row['source'], 'attempts': row['attempts'] + 1}
+    
+    def heartbeat(self, job_id, worker):
+        """
+        Extend the lease of a long-running job
+        
+        Returns:
+            bool: False if the job is no longer leased to this worker
+        """
+        now = time.time()
+        with self._connection() as db:
+            cursor = db.execute("UPDATE jobs SET available_at = ?, updated = ? "
+                                "WHERE id = ? AND worker = ? AND status = 'leased'",
+                                (now + self.lease_seconds, now, job_id, worker))
+            return cursor.rowcount == 1
+    
+    def complete(self, job_id, worker, result):
+        """
+        Store the result of a job (the first result for a job wins)
+        
+        Args:
+            job_id (str): Job id from lease()
+            worker (str): Worker name
+            result (dict): JSON-serializable result
+        
+        Returns:
+            bool: True if this call stored the result, False if it was a duplicate
+        """
+        now = time.time()
+        with self._connection() as db:
+            cursor = db.execute('INSERT OR IGNORE INTO results (job_id, worker, result, finished) '
+                                'VALUES (?, ?, ?, ?)', (job_id, worker, json.dumps(result), now))
+            db.execute("UPDATE jobs SET status = 'done', error = NULL, updated = ? WHERE id = ?", (now, job_id))
+            return cursor.rowcount == 1
+    
+    def fail(self, job_id, worker, error):
+        """
+        Report a failed attempt; the job is retried after a delay until max_attempts
+        
+        Args:
+            job_id (str): Job id from lease()
+            worker (str): Worker name
+            error (str): Error message
+        """
+        now = time.time()
+        with self._connection() as db:
+            row = db.execute('SELECT attempts, status, worker FROM jobs WHERE id = ?', (job_id,)).fetchone()
+            if row is None or row['status'] == 'done' or row['worker'] != worker:
+                return  # Already finished, or re-leased to another worker after this lease expired
+            if row['attempts'] >= self.max_attempts:
+                db.execute("UPDATE jobs SET status = 'failed', error = ?, updated = ? WHERE id = ?",
+                           (str(error), now, job_id))
+            else:
+                db.execute("UPDATE jobs SET status = 'pending', error = ?, available_at = ?, updated = ? "
+                           "WHERE id = ?", (str(error), now + self.retry_delay * row['attempts'], now, job_id))
+    
+    def stats(self, batch=None):
+        """
+        Count jobs by status
+        
+        Args:
+            batch (str): Only count this batch
+        
+        Returns:
+            dict: status -> count (pending, leased, done, failed)
+        """
+        query = 'SELECT status, COUNT(*) AS n FROM jobs'
+        args = ()
+        if batch is not None:
+            query += ' WHERE batch = ?'
+            args = (batch,)
+        counts = {'pending': 0, 'leased': 0, 'done': 0, 'failed': 0}
+        for row in self._db().execute(query + ' GROUP BY status', args):
+            counts[row['status']] = row['n']
+        return counts
+    
+    def results(self, batch=None):
+        """
+        Iterate over stored results
+        
+        Args:
+            batch (str): Only return results of this batch
+        
+        Returns:
+            list: (source, result dict) pairs
+        """
+        query = 'SELECT jobs.source, results.result FROM results JOIN jobs ON jobs.id = results.job_id'
+        args = ()
+        if batch is not None:
+            query += ' WHERE jobs.batch = ?'
+            args = (batch,)
+        rows = self._db().execute(query + ' ORDER BY jobs.source', args).fetchall()
+        return [(row['source'], json.loads(row['result'])) for row in rows]
+    
+    def close(self):
+        """Close this thread's connection"""
+        db = getattr(self._local, 'db', None)
+        if db is not None:
+            db.close()
+            self._local.db = None
+
+
+class _Transaction:
+    """BEGIN IMMEDIATE ... COMMIT around a block (serializes writers across processes)"""
+    
+    def __init__(self, db):
+        self.db = db
+    
+    def __enter__(self):
+        self.db.execute('BEGIN IMMEDIATE')
+        return self.db
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.db.execute('ROLLBACK' if exc_type else 'COMMIT')
+        return False
+
+
+# Methods a RemoteJobQueue may call on the broker
+BROKER_METHODS = ('submit', 'lease', 'heartbeat', 'complete', 'fail', 'stats', 'results')
+
+
+class _BrokerHandler(socketserver.StreamRequestHandler):
+    """One JSON request per line: {"method": ..., "args": [...]} -> {"ok": ..., "value"|"error": ...}"""
+    
+    def handle(self):
+        for line in self.rfile:
+            try:
+                request = json.loads(line)
+                method = request['method']
+                if method not in BROKER_METHODS:
+                    raise ValueError(f"Unknown method '{method}'")
+                value = getattr(self.server.queue, method)(*request.get('args', []))
+                response = {'ok': True, 'value': value}
+            except Exception as e:
+                response = {'ok': False, 'error': str(e)}
+            self.wfile.write((json.dumps(response) + '\n').encode('utf-8'))
+            self.wfile.flush()
+
+
+class JobBroker(socketserver.ThreadingTCPServer):
+    """TCP front end that lets workers on other machines use a JobQueue"""
+    
+    daemon_threads = True
+    allow_reuse_address = True
+    
+    def __init__(self, queue, host='127.0.0.1', port=8765):
+        """
+        Bind the broker (call serve_forever() or start() to run it)
+        
+        Args:
+            queue (JobQueue): Queue to serve
+            host (str): Interface to listen on. The broker has no authentication;
+                        only listen beyond localhost on a trusted network.
+            port (int): TCP port (0 picks a free port)
+        """
+        self.queue = queue
+        super().__init__((host, port), _BrokerHandler)
+    
+    @property
+    def port(self):
+        return self.server_address[1]
+    
+    def start(self):
+        """Serve in a daemon thread"""
+        thread = threading.Thread(target=self.serve_forever, name='job-broker')
+        thread.daemon = True
+        thread.start()
+        return thread
+
+
+class RemoteJobQueue:
+    """Client for a JobBroker with the same methods as JobQueue"""
+    
+    def __init__(self, host, port=8765, timeout=30.0, retries=5):
+        """
+        Args:
+            host (str): Broker host
+            port (int): Broker port
+            timeout (float): Socket timeout in seconds
+            retries (int): Reconnect attempts when the broker is unreachable
+        """
+        self.address = (host, port)
+        self.timeout = timeout
+        self.retries = retries
+        self._socket = None
+        self._reader = None
+    
+    def _call(self, method, *args):
+        payload = (json.dumps({'method': method, 'args': list(args)}) + '\n').encode('utf-8')
+        for attempt in range(self.retries + 1):
+            try:
+                if self._socket is None:
+                    self._socket = socket.create_connection(self.address, timeout=self.timeout)
+                    self._reader = self._socket.makefile('rb')
+                self._socket.sendall(payload)
+                line = self._reader.readline()
+                if not line:
+                    raise ConnectionError("Broker closed the connection")
+                break
+            except OSError:
+                self.close()
+                if attempt == self.retries:
+                    raise
+                time.sleep(min(2 ** attempt * 0.2, 5.0))
+        response = json.loads(line)
+        if not response['ok']:
+            raise RuntimeError(f"Broker error: {response['error']}")
+        return response['value']
+    
+    def submit(self, batch, sources):
+        return self._call('submit', batch, list(sources))
+    
+    def lease(self, worker):
+        return self._call('lease', worker)
+    
+    def heartbeat(self, job_id, worker):
+        return self._call('heartbeat', job_id, worker)
+    
+    def complete(self, job_id, worker, result):
+        return self._call('complete', job_id, worker, result)
+    
+    def fail(self, job_id, worker, error):
+        return self._call('fail', job_id, worker, error)
+    
+    def stats(self, batch=None):
+        return self._call('stats', batch)
+    
+    def results(self, batch=None):
+        return [tuple(item) for item in self._call('results', batch)]
+    
+    def close(self):
+        """Close the connection (reopened on the next call)"""
+        if self._socket is not None:
+            try:
+                self._reader.close()
+                self._socket.close()
+            except OSError:
+                pass
+        self._socket = None
+        self._reader = None
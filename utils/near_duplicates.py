@@ -0,0 +1,171 @@
+"""
+Near-Duplicate Index Module - Session-wide lookup of texts seen before
+
+Every text is reduced to a MinHash signature of its character shingles
+(case, punctuation and spacing are ignored, so OCR variants of the same page
+stay close). Signatures are split into bands for locality-sensitive hashing:
+two texts become candidates when any band matches, and candidates are
+confirmed with the estimated Jaccard similarity.
+
+The band table is a NumPy array scanned with one vectorized comparison
+instead of per-band Python dicts, which would cost kilobytes per entry. With
+the defaults an entry takes 320 bytes (64 x 4-byte signature + 16 x 4-byte
+band hashes) and a lookup against thousands of pages takes well under a
+millisecond.
+"""
+import re
+
+import numpy as np
+
+
+class NearDuplicateIndex:
+    """MinHash/LSH index of accepted texts"""
+    
+    def __init__(self, num_perm=64, bands=16, threshold=0.6, shingle_size=5, seed=1):
+        """
+        Initialize an empty index
+        
+        Args:
+            num_perm (int): MinHash signature length
+            bands (int): LSH bands (num_perm must be divisible by bands)
+            threshold (float): Estimated Jaccard similarity that counts as a duplicate
+            shingle_size (int): Characters per shingle (1-8)
+            seed (int): Seed of the hash functions
+        """
+        if num_perm % bands:
+            raise ValueError(f"num_perm ({num_perm}) must be divisible by bands ({bands})")
+        if not 1 <= shingle_size <= 8:
+            raise ValueError("shingle_size must be between 1 and 8")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.threshold = threshold
+        self.shingle_size = shingle_size
+        
+        # Multiply-shift hashing: high 32 bits of (a * x + b) mod 2^64 with odd a
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, 2 ** 63, size=(num_perm, 1), dtype=np.uint64) | np.uint64(1)
+        self._b = rng.integers(0, 2 ** 63, size=(num_perm, 1), dtype=np.uint64)
+        self._band_mult = rng.integers(1, 2 ** 63, size=self.rows, dtype=np.uint64) | np.uint64(1)
+        
+        self.count = 0
+        self._signatures = np.empty((16, num_perm), dtype=np.uint32)
+        self._band_hashes = np.empty((16, bands), dtype=np.uint32)
+    
+    def __len__(self):
+        return self.count
+    
+    @property
+    def nbytes(self):
+        """Bytes used per stored entry"""
+        return self._signatures.itemsize * self.num_perm + self._band_hashes.itemsize * self.bands
+    
+    def signature(self, text):
+        """
+        MinHash signature of a text
+        
+        Args:
+            text (str): Text to hash
+        
+        Returns:
+            numpy.ndarray: uint32 signature, or None if the text is too short
+        """
+        normalized = re.sub(r'[\W_]+', ' ', text.lower()).strip()
+        data = np.frombuffer(normalized.encode('utf-8'), dtype=np.uint8).astype(np.uint64)
+        n = len(data) - self.shingle_size + 1
+        if n < 1:
+            return None
+        
+        # Pack each run of shingle_size bytes into one integer
+        shingles = np.zeros(n, dtype=np.uint64)
+        for offset in range(self.shingle_size):
+            shingles = (shingles << np.uint64(8)) | data[offset:offset + n]
+        shingles = np.unique(shingles)
+        
+        hashes = (self._a * shingles[None, :] + self._b) >> np.uint64(32)
+        return hashes.min(axis=1).astype(np.uint32)
+    
+    def _bands_of(self, signature):
+        """One 32-bit hash per band of a signature"""
+        rows = signature.reshape(self.bands, self.rows).astype(np.uint64)
+        return ((rows * self._band_mult).sum(axis=1) >> np.uint64(32)).astype(np.uint32)
+    
+    def _lookup(self, signature, bands):
+        """(entry index, similarity) of the most similar stored text above the threshold"""
+        if not self.count:
+            return None
+        candidates = np.flatnonzero((self._band_hashes[:self.count] == bands).any(axis=1))
+        if not len(candidates):
+            return None
+        similarities = (self._signatures[candidates] == signature).mean(axis=1)
+        best = int(np.argmax(similarities))
+        if similarities[best] < self.threshold:
+            return None
+        return int(candidates[best]), float(similarities[best])
+    
+    def find(self, text):
+        """
+        Look up a near-duplicate of text
+        
+        Args:
+            text (str): Text to look up
+        
+        Returns:
+            tuple: (entry index, estimated similarity), or None if text is new
+        """
+        signature = self.signature(text)
+        if signature is None:
+            return None
+        return self._lookup(signature, self._bands_of(signature))
+    
+    def contains(self, text):
+        """Check whether a near-duplicate of text was added before"""
+        return self.find(text) is not None
+    
+    def add(self, text):
+        """
+        Store a text (without checking for duplicates)
+        
+        Args:
+            text (str): Text to store
+        
+        Returns:
+            int: Entry index, or None if the text is too short to index
+        """
+        signature = self.signature(text)
+        if signature is None:
+            return None
+        return self._store(signature, self._bands_of(signature))
+    
+    def add_if_new(self, text):
+        """
+        Store a text unless a near-duplicate is already indexed
+        
+        Args:
+            text (str): Accepted text
+        
+        Returns:
+            bool: True if the text was new (and is now stored)
+        """
+        signature = self.signature(text)
+        if signature is None:
+            return True  # Too short to compare, never suppressed
+        bands = self._bands_of(signature)
+        if self._lookup(signature, bands) is not None:
+            return False
+        self._store(signature, bands)
+        return True
+    
+    def _store(self, signature, bands):
+        """Append an entry, doubling the storage when full"""
+        if self.count == len(self._signatures):
+            self._signatures = np.concatenate([self._signatures, np.empty_like(self._signatures)])
+            self._band_hashes = np.concatenate([self._band_hashes, np.empty_like(self._band_hashes)])
+        self._signatures[self.count] = signature
+        self._band_hashes[self.count] = bands
+        self.count += 1
+        return self.count - 1
+    
+    def clear(self):
+        """Forget all entries"""
+        self.count = 0
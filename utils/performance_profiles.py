@@ -0,0 +1,200 @@
+"""
+Performance Profiles Module - Named settings for the whole pipeline
+
+A profiles file (JSON, default performance_profiles.json in the project root)
+defines named profiles such as low-power, balanced, max-throughput and
+max-accuracy. Every profile has one section per component:
+
+    camera      Camera.configure()            width, height, fps
+    pipeline    PageVisionOCR attributes      ocr_interval, ocr_deadline, ...
+    preprocess  ImagePreprocessor.configure() clahe_clip_limit, min_contour_area, ...
+    ocr         OCREngine.configure()         confidence_threshold, buffer_size, ...
+    speech      TextToSpeech.configure()      rate, volume
+
+Only the keys listed in SETTINGS can be set, with values of the listed type
+and range; internal state such as ocr.text_buffer is rejected. Overrides
+('section.key=value', e.g. from the command line) apply on top of every
+profile. Tuning files written by autotune.py are separate: they are
+specific to a document type and applied after the profile.
+"""
+import copy
+import json
+import os
+
+PROFILES_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                             'performance_profiles.json')
+SECTIONS = ('camera', 'pipeline', 'preprocess', 'ocr', 'speech')
+
+# Tunable keys per section: key -> (type, minimum, maximum); None means unbounded.
+# float also accepts integers, bool is never accepted as a number.
+SETTINGS = {
+    'camera': {
+        'width': (int, 1, None),
+        'height': (int, 1, None),
+        'fps': (float, 1, None),
+    },
+    'pipeline': {
+        'ocr_interval': (int, 1, None),
+        'ocr_deadline': (float, 0.1, None),
+        'max_frames_without_document': (int, 1, None),
+        'wake_ocr_delay': (int, 0, None),
+        'auto_speak': (bool, None, None),
+    },
+    'preprocess': {
+        'block_size': (int, 3, None),
+        'c_value': (float, None, None),
+        'clahe_clip_limit': (float, 0, None),
+        'clahe_tile_grid': (int, 1, 64),
+        'binarization': (str, None, None),
+        'binarization_params': (dict, None, None),
+        'min_contour_area': (float, 0, None),
+        'max_contour_area_ratio': (float, 0, 1),
+        'skew_sample_size': (int, 50, None),
+        'max_skew_angle': (float, 0, 45),
+        'min_skew_angle': (float, 0, 45),
+        'min_skew_confidence': (float, 0, 1),
+        'denoise_budget_ms': (float, 0, None),
+        'denoise_cost_decay': (float, 0, 1),
+        'noise_thresholds': (dict, None, None),
+        'nlm_scale': (float, 0.05, 1),
+    },
+    'ocr': {
+        'confidence_threshold': (float, 0, 100),
+        'buffer_size': (int, 1, None),
+        'stability_threshold': (int, 1, None),
+        'min_text_length': (int, 0, None),
+        'min_word_length': (int, 0, None),
+        'min_words': (int, 0, None),
+        'correction_confidence': (float, 0, 100),
+        'min_lexicon_ratio': (float, 0, 1),
+        'ocr_timeout': (float, 0.1, None),
+        'oem': (int, 0, 3),
+        'psm': (int, 0, 13),
+        'input_scale': (float, 0.1, 4),
+        'variables': (dict, None, None),
+    },
+    'speech': {
+        'rate': (int, 1, None),
+        'volume': (float, 0, 1),
+    },
+}
+
+
+def parse_override(text):
+    """
+    Parse a 'section.key=value' override
+    
+    Args:
+        text (str): e.g. 'ocr.confidence_threshold=40' or 'camera.width=1920'
+    
+    Returns:
+        tuple: (section, key, value); value is parsed as JSON when possible
+    
+    Raises:
+        ValueError: Malformed override or unknown section
+    """
+    name, sep, raw = text.partition('=')
+    section, dot, key = name.strip().partition('.')
+    if not sep or not dot or not key:
+        raise ValueError(f"Override '{text}' must look like section.key=value")
+    if section not in SECTIONS:
+        raise ValueError(f"Unknown section '{section}' in '{text}' (choose from {', '.join(SECTIONS)})")
+    try:
+        value = json.loads(raw)
+    except ValueError:
+        value = raw.strip()
+    return section, key.strip(), value
+
+
+def check_section(section, settings):
+    """
+    Check the keys and values of one profile section
+    
+    Args:
+        section (str): One of SECTIONS
+        settings (dict): key -> value
+    
+    Raises:
+        ValueError: Unknown key, or a value of the wrong type or out of range
+    """
+    table = SETTINGS[section]
+    for key, value in settings.items():
+        if key not in table:
+            raise ValueError(f"Unknown {section} parameter '{key}' (choose from {', '.join(table)})")
+        kind, minimum, maximum = table[key]
+        if kind is float:
+            valid = isinstance(value, (int, float)) and not isinstance(value, bool)
+        elif kind is int:
+            valid = isinstance(value, int) and not isinstance(value, bool)
+        else:
+            valid = isinstance(value, kind)
+        if not valid:
+            raise ValueError(f"{section}.{key} must be {kind.__name__}, got {value!r}")
+        if (minimum is not None and value < minimum) or (maximum is not None and value > maximum):
+            bounds = f"{minimum if minimum is not None else '-inf'} to {maximum if maximum is not None else 'inf'}"
+            raise ValueError(f"{section}.{key} must be in {bounds}, got {value!r}")
+
+
+class PerformanceProfiles:
+    """Loads named profiles and resolves them with overrides"""
+    
+    def __init__(self, path=None, overrides=()):
+        """
+        Load a profiles file
+        
+        Args:
+            path (str): Profiles JSON file (default: PROFILES_FILE)
+            overrides (iterable): 'section.key=value' strings applied to every profile
+        
+        Raises:
+            OSError: The file cannot be read
+            ValueError: Invalid file or override
+        """
+        self.path = path or PROFILES_FILE
+        with open(self.path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        self.profiles = data.get('profiles', {})
+        if not self.profiles:
+            raise ValueError(f"No profiles defined in {self.path}")
+        for name, profile in self.profiles.items():
+            unknown = set(profile) - set(SECTIONS)
+            if unknown:
+                raise ValueError(f"Profile '{name}' has unknown sections: {', '.join(sorted(unknown))}")
+        self.default = data.get('default', next(iter(self.profiles)))
+        self.overrides = [parse_override(override) for override in overrides]
+        self.current = None
+    
+    @property
+    def names(self):
+        """Profile names in file order"""
+        return list(self.profiles)
+    
+    def settings(self, name=None):
+        """
+        Resolve a profile
+        
+        Args:
+            name (str): Profile name (default: the file's default profile)
+        
+        Returns:
+            dict: section -> {key: value} with the overrides applied
+        
+        Raises:
+            ValueError: Unknown profile
+        """
+        name = name or self.default
+        if name not in self.profiles:
+            raise ValueError(f"Unknown profile '{name}' (choose from {', '.join(self.names)})")
+        settings = {section: {} for section in SECTIONS}
+        for section, values in copy.deepcopy(self.profiles[name]).items():
+            settings[section].update(values)
+        for section, key, value in self.overrides:
+            settings[section][key] = value
+        return settings
+    
+    def next_name(self):
+        """Name of the profile after the current one (cycles)"""
+        names = self.names
+        if self.current not in names:
+            return self.default
+        return names[(names.index(self.current) + 1) % len(names)]
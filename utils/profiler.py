@@ -0,0 +1,209 @@
+"""
+Sampling Profiler Module - Low-rate stack sampling of all threads with on-demand dumps
+
+The profiler keeps the last N seconds of samples in a ring buffer, so a dump
+taken right after a stutter shows what every thread was doing at the time.
+Output is written as collapsed stacks (flamegraph.pl / speedscope compatible)
+or speedscope JSON.
+"""
+import json
+import os
+import signal
+import sys
+import threading
+import time
+from collections import Counter, deque
+from datetime import datetime
+
+
+class SamplingProfiler:
+    """Background sampler of all thread stacks"""
+    
+    def __init__(self, interval=0.02, history_seconds=30, output_dir='profiles'):
+        """
+        Initialize the profiler (sampling starts with start())
+        
+        Args:
+            interval (float): Seconds between samples (0.02 = 50 Hz)
+            history_seconds (float): How much history the ring buffer keeps
+            output_dir (str): Directory for dump files
+        """
+        self.interval = interval
+        self.history_seconds = history_seconds
+        self.output_dir = output_dir
+        # One entry per tick: (timestamp, [(thread name, stack), ...]), so the
+        # history covers history_seconds however many threads are running
+        self.samples = deque(maxlen=max(1, int(history_seconds / interval)))
+        self.running = False
+        self._thread = None
+        self._labels = {}  # (code, line) -> frame label cache
+    
+    def start(self):
+        """Start sampling in a daemon thread"""
+        if self.running:
+            return
+        self.running = True
+        self._thread = threading.Thread(target=self._sample_loop, name='sampling-profiler')
+        self._thread.daemon = True
+        self._thread.start()
+        print(f"✓ Sampling profiler started ({1 / self.interval:.0f} Hz, last {self.history_seconds}s kept)")
+    
+    def stop(self):
+        """Stop sampling"""
+        self.running = False
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+    
+    def _label(self, frame):
+        """Readable label for a stack frame"""
+        code = frame.f_code
+        key = (code, frame.f_lineno)
+        label = self._labels.get(key)
+        if label is None:
+            label = f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})"
+            self._labels[key] = label
+        return label
+    
+    def _sample_loop(self):
+        """Collect one stack per thread every interval"""
+        own_ident = threading.get_ident()
+        while self.running:
+            timestamp = time.monotonic()
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            
+            stacks = []
+            for ident, frame in sys._current_frames().items():
+                if ident == own_ident:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(self._label(frame))
+                    frame = frame.f_back
+                stack.reverse()  # Root first
+                stacks.append((names.get(ident, str(ident)), tuple(stack)))
+            self.samples.append((timestamp, stacks))
+            
+            time.sleep(self.interval)
+    
+    def _recent_samples(self, seconds=None):
+        """(timestamp, thread, stack) samples from the last `seconds` seconds (all kept if None)"""
+        cutoff = time.monotonic() - seconds if seconds is not None else None
+        return [(timestamp, thread, stack)
+                for timestamp, stacks in list(self.samples) if cutoff is None or timestamp >= cutoff
+                for thread, stack in stacks]
+    
+    def collapsed_stacks(self, seconds=None):
+        """
+        Aggregate samples into collapsed-stack lines
+        
+        Args:
+            seconds (float): Only include the last N seconds
+        
+        Returns:
+            list: Lines of the form "thread;root;...;leaf count"
+        """
+        counts = Counter(';'.join((thread,) + stack) for _, thread, stack in self._recent_samples(seconds))
+        return [f"{stack} {count}" for stack, count in counts.most_common()]
+    
+    def speedscope(self, seconds=None):
+        """
+        Build a speedscope document with one sampled profile per thread
+        
+        Args:
+            seconds (float): Only include the last N seconds
+        
+        Returns:
+            dict: speedscope JSON document
+        """
+        frames = []
+        frame_index = {}
+        profiles = {}
+        
+        for timestamp, thread, stack in self._recent_samples(seconds):
+            indexes = []
+            for label in stack:
+                if label not in frame_index:
+                    frame_index[label] = len(frames)
+                    frames.append({'name': label})
+                indexes.append(frame_index[label])
+            
+            profile = profiles.setdefault(thread, {
+                'type': 'sampled',
+                'name': thread,
+                'unit': 'seconds',
+                'startValue': timestamp,
+                'endValue': timestamp,
+                'samples': [],
+                'weights': [],
+            })
+            profile['endValue'] = timestamp + self.interval
+            profile['samples'].append(indexes)
+            profile['weights'].append(self.interval)
+        
+        return {
+            '$schema': 'https://www.speedscope.app/file-format-schema.json',
+            'shared': {'frames': frames},
+            'profiles': list(profiles.values()),
+            'name': 'PageVision OCR',
+            'exporter': 'pagevision-sampling-profiler',
+        }
+    
+    def dump(self, seconds=None, formats=('collapsed', 'speedscope')):
+        """
+        Write the recent samples to disk
+        
+        Args:
+            seconds (float): Only include the last N seconds (default: whole history)
+            formats (tuple): Any of 'collapsed' and 'speedscope'
+        
+        Returns:
+            list: Paths of the written files
+        """
+        if not self.samples:
+            print("⚠ Profiler has no samples yet")
+            return []
+        
+        if not os.path.exists(self.output_dir):
+            os.makedirs(self.output_dir)
+        
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        paths = []
+        try:
+            if 'collapsed' in formats:
+                path = os.path.join(self.output_dir, f"profile_{timestamp}.collapsed.txt")
+                with open(path, 'w', encoding='utf-8') as f:
+                    f.write('\n'.join(self.collapsed_stacks(seconds)) + '\n')
+                paths.append(path)
+            
+            if 'speedscope' in formats:
+                path = os.path.join(self.output_dir, f"profile_{timestamp}.speedscope.json")
+                with open(path, 'w', encoding='utf-8') as f:
+                    json.dump(self.speedscope(seconds), f)
+                paths.append(path)
+        except Exception as e:
+            print(f"✗ Error writing profile: {e}")
+        
+        for path in paths:
+            print(f"✓ Profile saved to: {path}")
+        return paths
+    
+    def install_signal_handler(self):
+        """
+        Dump a profile when the process receives SIGUSR1 (POSIX only)
+        Sampling is started if it was not running yet
+        
+        Returns:
+            bool: True if the handler was installed
+        """
+        if not hasattr(signal, 'SIGUSR1'):
+            return False
+        
+        def handler(signum, frame):
+            if self.running:
+                self.dump()
+            else:
+                self.start()
+        
+        signal.signal(signal.SIGUSR1, handler)
+        return True
@@ -0,0 +1,201 @@
+"""
+Resource Monitor Module - Tracks memory, threads, file descriptors and temp files over time
+
+Samples are taken by a background thread at a fixed interval. After a
+warm-up period, the first and last quarter of the samples are compared
+per metric; a metric whose median grew by more than its tolerance (and keeps
+growing) is reported as a leak. tracemalloc snapshots show which source lines
+allocated the memory that was gained since the baseline.
+
+psutil is used when it is installed; otherwise /proc is read (Linux).
+"""
+import csv
+import os
+import tempfile
+import threading
+import time
+import tracemalloc
+
+# Growth of the median from the first to the last quarter that counts as a leak
+DEFAULT_TOLERANCES = {
+    'rss_mb': 32.0,
+    'traced_mb': 16.0,
+    'threads': 2,
+    'fds': 4,
+    'temp_files': 4,
+    'temp_mb': 16.0,
+}
+
+
+def _process():
+    """psutil.Process of this process, or None without psutil"""
+    try:
+        import psutil
+    except ImportError:
+        return None
+    return psutil.Process()
+
+
+class ResourceMonitor:
+    """Periodically samples process resources and detects sustained growth"""
+    
+    def __init__(self, interval=30.0, trace_frames=8):
+        """
+        Initialize the monitor
+        
+        Args:
+            interval (float): Seconds between samples
+            trace_frames (int): Stack depth recorded by tracemalloc (0 disables tracemalloc)
+        """
+        self.interval = interval
+        self.trace_frames = trace_frames
+        self.samples = []
+        self.start_time = None
+        self.baseline_snapshot = None
+        self.temp_dir = tempfile.gettempdir()
+        self._psutil = _process()
+        self._stop = threading.Event()
+        self._thread = None
+    
+    def start(self):
+        """Take the baseline and start sampling in the background"""
+        if self.trace_frames and not tracemalloc.is_tracing():
+            tracemalloc.start(self.trace_frames)
+        self.start_time = time.monotonic()
+        self.sample()
+        if tracemalloc.is_tracing():
+            self.baseline_snapshot = tracemalloc.take_snapshot()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='resource-monitor', daemon=True)
+        self._thread.start()
+    
+    def stop(self):
+        """Stop sampling (takes one final sample)"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.sample()
+    
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.sample()
+    
+    def _rss_mb(self):
+        """Resident set size in MB (None if unavailable)"""
+        if self._psutil is not None:
+            return self._psutil.memory_info().rss / 2 ** 20
+        try:
+            with open('/proc/self/statm') as f:
+                return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 2 ** 20
+        except (OSError, ValueError):
+            return None
+    
+    def _open_fds(self):
+        """Open file descriptors (handles on Windows), None if unavailable"""
+        if self._psutil is not None:
+            if hasattr(self._psutil, 'num_fds'):
+                return self._psutil.num_fds()
+            return self._psutil.num_handles()
+        try:
+            return len(os.listdir('/proc/self/fd'))
+        except OSError:
+            return None
+    
+    def _temp_usage(self):
+        """(file count, MB) directly inside the temp directory"""
+        count = size = 0
+        try:
+            with os.scandir(self.temp_dir) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_file(follow_symlinks=False):
+                            count += 1
+                            size += entry.stat(follow_symlinks=False).st_size
+                    except OSError:
+                        continue  # Removed while scanning
+        except OSError:
+            pass
+        return count, size / 2 ** 20
+    
+    def sample(self):
+        """
+        Record one sample
+        
+        Returns:
+            dict: elapsed seconds, rss_mb, traced_mb, threads, fds, temp_files, temp_mb
+        """
+        temp_files, temp_mb = self._temp_usage()
+        traced = tracemalloc.get_traced_memory()[0] / 2 ** 20 if tracemalloc.is_tracing() else None
+        sample = {
+            'elapsed': round(time.monotonic() - (self.start_time or time.monotonic()), 1),
+            'rss_mb': self._rss_mb(),
+            'traced_mb': traced,
+            'threads': threading.active_count(),
+            'fds': self._open_fds(),
+            'temp_files': temp_files,
+            'temp_mb': temp_mb,
+        }
+        self.samples.append(sample)
+        return sample
+    
+    def top_allocators(self, limit=10):
+        """
+        Source lines with the largest memory growth since start()
+        
+        Args:
+            limit (int): Number of entries
+        
+        Returns:
+            list: Formatted 'file:line +size (+count blocks)' strings
+        """
+        if self.baseline_snapshot is None or not tracemalloc.is_tracing():
+            return []
+        snapshot = tracemalloc.take_snapshot().filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+        ])
+        stats = snapshot.compare_to(self.baseline_snapshot, 'lineno')
+        return [f"{stat.traceback[0].filename}:{stat.traceback[0].lineno} "
+                f"{stat.size_diff / 1024:+.1f} KiB ({stat.count_diff:+d} blocks)"
+                for stat in stats[:limit]]
+    
+    def growth(self, warmup_fraction=0.2, tolerances=None):
+        """
+        Detect metrics that grew steadily after the warm-up
+        
+        Args:
+            warmup_fraction (float): Share of the samples ignored at the start
+            tolerances (dict): Allowed growth per metric (default: DEFAULT_TOLERANCES)
+        
+        Returns:
+            list: (metric, first quarter median, last quarter median) for every leaking metric
+        """
+        tolerances = dict(DEFAULT_TOLERANCES, **(tolerances or {}))
+        samples = self.samples[int(len(self.samples) * warmup_fraction):]
+        
+        leaks = []
+        for metric, tolerance in tolerances.items():
+            values = [sample[metric] for sample in samples if sample.get(metric) is not None]
+            if len(values) < 8:
+                continue
+            quarter = len(values) // 4
+            first = sorted(values[:quarter])[quarter // 2]
+            middle = sorted(values[quarter:-quarter])[(len(values) - 2 * quarter) // 2]
+            last = sorted(values[-quarter:])[quarter // 2]
+            # Sustained: beyond the tolerance and still rising in the second half
+            if last - first > tolerance and last > middle:
+                leaks.append((metric, first, last))
+        return leaks
+    
+    def write_csv(self, path):
+        """
+        Write all samples to a CSV file
+        
+        Args:
+            path (str): Output file
+        """
+        with open(path, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=['elapsed'] + list(DEFAULT_TOLERANCES))
+            writer.writeheader()
+            writer.writerows(self.samples)
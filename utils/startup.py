@@ -0,0 +1,110 @@
+"""
+Startup Profiler Module - Measures component initialization and deferred warm-up
+"""
+import threading
+import time
+from contextlib import contextmanager
+
+
+class StartupProfiler:
+    """Records per-component startup timings and runs background warm-up tasks"""
+    
+    def __init__(self):
+        """Initialize the profiler and start the startup clock"""
+        self.start_time = time.perf_counter()
+        self.first_frame_time = None
+        self.timings = []  # List of (component, seconds, mode)
+        self.lock = threading.Lock()
+        self.background_threads = []
+    
+    @contextmanager
+    def measure(self, component):
+        """
+        Time a synchronous startup step
+        
+        Args:
+            component (str): Name of the component being initialized
+        """
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(component, time.perf_counter() - started)
+    
+    def record(self, component, seconds, mode='sync'):
+        """
+        Store a timing measurement
+        
+        Args:
+            component (str): Name of the component
+            seconds (float): Time taken in seconds
+            mode (str): 'sync' for blocking steps, 'background' for deferred warm-up
+        """
+        with self.lock:
+            self.timings.append((component, seconds, mode))
+    
+    def run_in_background(self, component, func):
+        """
+        Warm up a component in a daemon thread while the preview is running
+        
+        Args:
+            component (str): Name of the component
+            func (callable): Warm-up function to run
+        
+        Returns:
+            threading.Thread: The started worker thread
+        """
+        def worker():
+            started = time.perf_counter()
+            try:
+                func()
+            except Exception as e:
+                print(f"✗ Background warm-up of {component} failed: {e}")
+            finally:
+                self.record(component, time.perf_counter() - started, mode='background')
+        
+        thread = threading.Thread(target=worker, name=f"warmup-{component}")
+        thread.daemon = True
+        thread.start()
+        self.background_threads.append(thread)
+        return thread
+    
+    def background_done(self):
+        """Check whether all background warm-up tasks have finished"""
+        return all(not thread.is_alive() for thread in self.background_threads)
+    
+    def mark_first_frame(self):
+        """Record the moment the first frame was shown"""
+        if self.first_frame_time is None:
+            self.first_frame_time = time.perf_counter()
+    
+    def time_to_first_frame(self):
+        """
+        Get elapsed time between startup and the first displayed frame
+        
+        Returns:
+            float: Seconds to first frame, or None if no frame was shown yet
+        """
+        if self.first_frame_time is None:
+            return None
+        return self.first_frame_time - self.start_time
+    
+    def report(self):
+        """Print the startup time breakdown per component"""
+        print("=" * 60)
+        print("⏱  STARTUP TIME REPORT")
+        print("=" * 60)
+        
+        with self.lock:
+            timings = list(self.timings)
+        
+        for component, seconds, mode in timings:
+            label = " (background warm-up)" if mode == 'background' else ""
+            print(f"  {component:20s} {seconds * 1000:8.1f} ms{label}")
+        
+        first_frame = self.time_to_first_frame()
+        if first_frame is not None:
+            print("-" * 60)
+            print(f"  {'time to first frame':20s} {first_frame * 1000:8.1f} ms")
+        print("=" * 60)
+        print()